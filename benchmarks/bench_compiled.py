@@ -0,0 +1,93 @@
+"""
+Benchmark: compiled forest inference
+
+Trains the random forest configured in main.py (500 trees, depth 14) on a
+synthetic feature matrix, compiles it with compile_forest, checks that the
+probabilities match predict_proba, and compares scoring latency per batch
+size and model memory.
+
+Usage:
+    python benchmarks/bench_compiled.py --rows 20000
+    python benchmarks/bench_compiled.py --batch-sizes 1 8 64 512 --repeat 50
+"""
+
+import argparse
+import pickle
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.fake_review_detection.compiled_forest import compile_forest  # noqa: E402
+
+
+def make_features(rows: int, seed: int = 42):
+    """Generate MNR/RL/RD/similarity-like features with noisy labels."""
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.random(rows),
+        rng.integers(1, 400, size=rows),
+        rng.integers(0, 5, size=rows) / 4,
+        rng.beta(2, 5, size=rows),
+        rng.integers(0, 100, size=rows),
+    ]).astype(float)
+    score = X[:, 0] + X[:, 3] - X[:, 1] / 800 + rng.normal(scale=0.3, size=rows)
+    return X, np.where(score > 0.5, 'Y', 'N')
+
+
+def median_seconds(func, repeat: int) -> float:
+    """Median wall time of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--trees', type=int, default=500)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 64, 256, 4096])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    X, y = make_features(args.rows, args.seed)
+    model = RandomForestClassifier(
+        random_state=42,
+        criterion='entropy',
+        max_depth=14,
+        max_features='sqrt',
+        n_estimators=args.trees
+    ).fit(X, y)
+
+    start = perf_counter()
+    compiled = compile_forest(model)
+    compile_time = perf_counter() - start
+
+    X_new, _ = make_features(max(args.batch_sizes), args.seed + 1)
+    error = np.abs(compiled.predict_proba(X_new) - model.predict_proba(X_new)).max()
+
+    print(f"Trees: {compiled.n_trees}, nodes: {len(compiled.nodes):,}, "
+          f"max depth: {compiled.max_depth}")
+    print(f"Compile time: {compile_time:.2f}s, max probability difference: {error:.2e}")
+    print(f"Model memory: {len(pickle.dumps(model)) / 1024 ** 2:.1f} MB pickled estimator, "
+          f"{compiled.nbytes / 1024 ** 2:.1f} MB compiled arrays")
+    print(f"{'batch':>6} {'sklearn ms':>11} {'compiled ms':>12} {'speedup':>8}")
+    for size in args.batch_sizes:
+        batch = X_new[:size]
+        reference = median_seconds(lambda: model.predict_proba(batch), args.repeat)
+        fast = median_seconds(lambda: compiled.predict_proba(batch), args.repeat)
+        print(f"{size:>6} {reference * 1000:>11.2f} {fast * 1000:>12.2f} "
+              f"{reference / fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: cold import time
+
+Imports the package and the modules a scoring worker loads, each in fresh
+interpreters, reports the median wall time and the slowest modules from
+``python -X importtime``, and fails when the package import exceeds its
+budget or pulls in a heavy dependency.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 20 --budget 0.05
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PACKAGE = 'src.fake_review_detection'
+TARGETS = [PACKAGE, f'{PACKAGE}.scoring', f'{PACKAGE}.server']
+
+# Modules that importing the package alone must not load
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'sklearn', 'nltk', 'matplotlib', 'tqdm')
+
+# Seconds allowed for `import src.fake_review_detection` in a fresh process
+DEFAULT_BUDGET = 0.1
+
+
+def time_import(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter; return its time and heavy imports."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """Return the ``top`` (cumulative microseconds, module) pairs from -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help="Seconds allowed for the package import")
+    parser.add_argument('--top', type=int, default=8)
+    args = parser.parse_args()
+
+    failed = False
+    for target in TARGETS:
+        runs = [time_import(target) for _ in range(args.repeat)]
+        median = statistics.median(run['seconds'] for run in runs)
+        heavy = runs[-1]['heavy']
+        print(f"{target}: {median * 1000:.1f} ms median of {args.repeat}, "
+              f"heavy modules: {', '.join(heavy) or 'none'}")
+        if target == PACKAGE:
+            if median > args.budget:
+                print(f"  over budget ({args.budget * 1000:.0f} ms)")
+                failed = True
+            if heavy:
+                print("  the package import must not load heavy dependencies")
+                failed = True
+        for cumulative, name in slowest_imports(target, args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Benchmark: pipeline stages at scaled data sizes
+
+Times every pipeline stage (load_data, DataProcessor.clean, each feature of
+FeatureEngineer.create_features, under_sample and SemiSupervisedLearner.train)
+on databases from create_sample_database, recording wall time, peak RSS and rows/sec as JSON
+and comparing against a stored baseline.
+
+Each data size runs in a fresh process so peak RSS is not inflated by the
+previous size. Peak RSS is sampled from /proc/self/status while a stage runs
+(ru_maxrss, the process-lifetime peak, where /proc is unavailable).
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 1000000
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from create_sample_database import create_database  # noqa: E402
+from src.fake_review_detection.data_loader import load_data  # noqa: E402
+from src.fake_review_detection.data_processor import DataProcessor  # noqa: E402
+from src.fake_review_detection.feature_engineer import FeatureEngineer, MinHashLSH  # noqa: E402
+from src.fake_review_detection.instrumentation import current_rss  # noqa: E402
+from src.fake_review_detection.models import SemiSupervisedLearner  # noqa: E402
+from src.fake_review_detection.utils import under_sample  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+class PeakRSSSampler:
+    """Samples the process RSS in a background thread and keeps the maximum."""
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        """Record the RSS every ``interval`` seconds until stopped."""
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> 'PeakRSSSampler':
+        """Take a first sample and start the sampling thread."""
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Stop sampling and take a last sample."""
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def measure(stage: str, rows: int, func: Callable[[], Any]) -> tuple:
+    """
+    Run one stage and measure it.
+
+    Args:
+        stage: Stage name.
+        rows: Number of input rows, for rows/sec.
+        func: Stage to run.
+
+    Returns:
+        Tuple of (stage output, result record).
+    """
+    with PeakRSSSampler() as sampler:
+        start = perf_counter()
+        output = func()
+        seconds = perf_counter() - start
+    record = {
+        'stage': stage,
+        'rows': rows,
+        'seconds': seconds,
+        'peak_rss_mb': sampler.peak / 1024 ** 2,
+        'rows_per_sec': rows / seconds if seconds > 0 else float('inf'),
+    }
+    print(f"  {stage:<28} {seconds:9.3f}s {record['peak_rss_mb']:9.1f} MB "
+          f"{record['rows_per_sec']:14,.0f} rows/s")
+    return output, record
+
+
+def run_size(
+    rows: int,
+    data_dir: str,
+    seed: int,
+    iterations: int,
+    trees: int
+) -> List[Dict[str, Any]]:
+    """Run every stage on a database of the given size and return the records."""
+    db_path = Path(data_dir) / f'reviews_{rows}_{seed}.db'
+    if not db_path.exists():
+        create_database(str(db_path), num_reviews=rows, seed=seed)
+    print(f"\n{rows:,} reviews")
+    results = []
+
+    def run(stage: str, n: int, func: Callable[[], Any]) -> Any:
+        output, record = measure(stage, n, func)
+        results.append({'size': rows, **record})
+        return output
+
+    df = run('load_data', rows, lambda: load_data(str(db_path)))
+    df = run('clean', len(df), lambda: DataProcessor().clean(df))
+
+    # Each feature on its own: create_features only computes the features
+    # whose input columns are present (content similarity also adds the
+    # cheap review length)
+    engineer = FeatureEngineer()
+    run('features.mnr', len(df),
+        lambda: engineer.create_features(df[['reviewerID', 'date']]))
+    run('features.rl', len(df),
+        lambda: engineer.create_features(df[['reviewContent']]))
+    run('features.rd', len(df),
+        lambda: engineer.create_features(df[['rating', 'restaurantRating']]))
+    run('features.content_similarity', len(df),
+        lambda: engineer.create_features(df[['reviewerID', 'reviewContent']]))
+    run('features.near_duplicates', len(df),
+        lambda: MinHashLSH().fit_transform(df['reviewContent']))
+    df = run('features.all', len(df), lambda: FeatureEngineer().create_features(df))
+
+    df = run('under_sample', len(df), lambda: under_sample(df))
+    run('train.naive_bayes', len(df), lambda: SemiSupervisedLearner(
+        GaussianNB(), algorithm_name='Naive Bayes'
+    ).train(df, iterations=iterations))
+    run('train.random_forest', len(df), lambda: SemiSupervisedLearner(
+        RandomForestClassifier(
+            random_state=42, criterion='entropy', max_depth=14,
+            max_features='sqrt', n_estimators=trees, n_jobs=-1
+        ),
+        algorithm_name='Random Forest'
+    ).train(df, iterations=iterations, warm_start=True))
+    return results
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float,
+    min_seconds: float = 0.05
+) -> pd.DataFrame:
+    """
+    Compare results with a baseline run.
+
+    Args:
+        results: Records of this run.
+        baseline: Records of the baseline run.
+        tolerance: Allowed relative slowdown (or RSS growth) before a stage
+                   counts as a regression.
+        min_seconds: Stages faster than this in the baseline are too noisy
+                     to flag as slower.
+
+    Returns:
+        Dataframe with time and memory ratios per size and stage.
+    """
+    keys = ['size', 'stage']
+    current = pd.DataFrame(results).set_index(keys)
+    previous = pd.DataFrame(baseline).set_index(keys)
+    joined = current[['seconds', 'peak_rss_mb']].join(
+        previous[['seconds', 'peak_rss_mb']], rsuffix='_baseline', how='inner'
+    )
+    joined['time_ratio'] = joined['seconds'] / joined['seconds_baseline']
+    joined['rss_ratio'] = joined['peak_rss_mb'] / joined['peak_rss_mb_baseline']
+    slower = (joined['time_ratio'] > 1 + tolerance) & (joined['seconds_baseline'] >= min_seconds)
+    joined['regression'] = slower | (joined['rss_ratio'] > 1 + tolerance)
+    return joined.reset_index()
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the interpreter, libraries and machine of this run."""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite; returns 1 if a regression was found."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--data-dir', default='data/benchmarks',
+                        help='Where generated databases are kept for reuse')
+    parser.add_argument('--output', default='benchmarks/results/latest.json')
+    parser.add_argument('--baseline', help='Results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative slowdown before failing')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='Ignore slowdowns of stages faster than this')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for rows in args.sizes:
+        # Executor workers are not daemonic, so forests can still use joblib
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.extend(executor.submit(
+                run_size, rows, args.data_dir, args.seed, args.iterations, args.trees
+            ).result())
+
+    report = {
+        'environment': environment(),
+        'config': {'iterations': args.iterations, 'trees': args.trees, 'seed': args.seed},
+        'results': results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline['results'], args.tolerance, args.min_seconds)
+        columns = ['size', 'stage', 'seconds', 'seconds_baseline', 'time_ratio',
+                   'rss_ratio', 'regression']
+        print(f"\nComparison with {args.baseline}")
+        if comparison.empty:
+            print("No stages in common with the baseline")
+        else:
+            print(comparison[columns].to_string(index=False, float_format='{:.3f}'.format))
+        regressions = comparison[comparison['regression']]
+        if not regressions.empty:
+            print(f"\n{len(regressions)} stage(s) regressed by more than "
+                  f"{args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -26,9 +26,25 @@ NB_PARAMS = {}
 # Semi-Supervised Learning Parameters
 SEMI_SUPERVISED_PARAMS = {
     'threshold': 0.7,
-    'iterations': 15
+    'iterations': 15,
+    'warm_start': False,
+    # Early stopping: minimum fraction of unlabeled rows labeled per iteration,
+    # and an optional validation F1 plateau check
+    'min_new_fraction': 0.0,
+    'validation_fraction': None,
+    'patience': 3
 }
 
+# Hyperparameter Sweep (see sweep.run_sweep); "model__" entries are
+# estimator parameters, the rest are semi-supervised training options
+SWEEP_PARAMS = {
+    'threshold': [0.6, 0.7, 0.8, 0.9],
+    'iterations': [15, 40],
+    'model__max_depth': [10, 14, 18],
+    'model__n_estimators': [200, 500]
+}
+SWEEP_CACHE_DIR = "data/processed/sweeps"
+
 # Feature Engineering
 FEATURE_COLUMNS_TO_DROP = [
     'reviewID',
@@ -1,16 +1,38 @@
 """
 Create Sample Database Script
 
-This script creates a sample SQLite database with the required structure
-for testing the fake review detection project.
+This script creates a synthetic SQLite database with the required structure
+for testing and load-testing the fake review detection project.
+
+Reviews are generated with NumPy in fixed-size batches and written with
+``executemany`` into a WAL-mode database, so memory stays flat; 1M reviews
+take about a minute and 10M about ten minutes. The data mimics the
+properties the features depend on:
+
+- Zipfian reviewer and restaurant activity (a few very active accounts and
+  popular restaurants, a long tail of occasional ones).
+- Posting bursts: runs of reviews by one reviewer on the same day, which
+  are more likely to be fake (the MNR feature).
+- Text drawn from a Zipfian vocabulary, with fake reviews leaning on
+  extreme words and a controlled fraction of near-duplicate texts (lightly
+  edited copies of earlier reviews).
+
+Usage:
+    python create_sample_database.py
+    python create_sample_database.py --reviews 10000000 --output data/raw/load_test.db
 """
 
+import argparse
 import sqlite3
-import random
-from datetime import datetime, timedelta
+from datetime import date
+from itertools import product
 from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
 
-# Sample review texts
+# Sample review texts; their words seed the generated vocabulary
 AUTHENTIC_REVIEWS = [
     "Great food and excellent service. The staff was very friendly and attentive.",
     "I had a wonderful experience here. The ambiance is nice and the food was delicious.",
@@ -54,30 +76,205 @@ LOCATIONS = [
     "Phoenix, AZ", "Philadelphia, PA", "San Antonio, TX", "San Diego, CA"
 ]
 
+# Rows generated and inserted per batch; small enough that the batch's
+# token arrays are reused from the heap instead of freshly mapped each time
+BATCH_SIZE = 20_000
+
+# Rows between progress messages
+PROGRESS_ROWS = 1_000_000
+
+# Number of generated words in the vocabulary's long tail
+VOCABULARY_SIZE = 20_000
+
+# Share of the words in a fake review drawn from the fake reviews' wording
+FAKE_WORD_SHARE = 0.3
+
+# Share of words replaced in a near-duplicate copy
+DUPLICATE_EDIT_RATE = 0.1
+
+# Resolution of the Zipf lookup tables
+ZIPF_TABLE_SIZE = 1 << 22
+
+# Default cap on the expected number of reviews by one reviewer; without it,
+# the busiest account of a Zipf law writes a fixed share of every database
+# (about 14% of 300k reviews at exponent 1.1), which is unrealistic and
+# makes its per-reviewer similarity work grow quadratically
+MAX_REVIEWER_REVIEWS = 500
+
+FIRST_REVIEW_DATE = date(2004, 10, 1)
+LAST_REVIEW_DATE = date(2012, 10, 1)
+
+_SYLLABLES = ['ba', 'ko', 'ri', 'tu', 'me', 'sa', 'lo', 'ni', 'de', 'ga', 'pu', 'ze', 'ra', 'vi']
+
+
+def _vocabulary(rng: np.random.Generator) -> tuple:
+    """Build the shared vocabulary and the fake reviews' wording."""
+    words = list(dict.fromkeys(' '.join(AUTHENTIC_REVIEWS).split()))
+    tail = [
+        ''.join(parts) for length in (2, 3, 4) for parts in product(_SYLLABLES, repeat=length)
+    ]
+    tail = np.array(tail, dtype=object)[rng.permutation(len(tail))[:VOCABULARY_SIZE]]
+    vocabulary = np.concatenate([np.array(words, dtype=object), tail])
+    fake_words = np.array(list(dict.fromkeys(' '.join(FAKE_REVIEWS).split())), dtype=object)
+    return vocabulary, fake_words
+
+
+def _zipf_table(n: int, exponent: float, max_share: float = 1.0) -> np.ndarray:
+    """
+    Lookup table for drawing Zipf-distributed ranks 0..n-1.
+
+    Indexing the table with uniform integers samples the distribution
+    (quantized to ``ZIPF_TABLE_SIZE`` steps) much faster than searching
+    its CDF for every draw. Ranks above ``max_share`` are capped at it and
+    the excess is spread over the others in proportion to their weights.
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    weights /= weights.sum()
+    if max_share * n <= 1:
+        weights[:] = 1.0 / n
+    else:
+        while weights.max() > max_share * (1 + 1e-9):
+            capped = weights >= max_share
+            rest = weights[~capped].sum()
+            weights[~capped] *= (1 - max_share * capped.sum()) / rest
+            weights[capped] = max_share
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    steps = (np.arange(ZIPF_TABLE_SIZE) + 0.5) / ZIPF_TABLE_SIZE
+    return np.minimum(np.searchsorted(cdf, steps), n - 1)
+
+
+def _draw(rng: np.random.Generator, table: np.ndarray, size: int) -> np.ndarray:
+    """Draw ranks from a :func:`_zipf_table`."""
+    return table[rng.integers(0, len(table), size=size)]
+
+
+def _review_texts(
+    rng: np.random.Generator,
+    count: int,
+    is_fake: np.ndarray,
+    vocabulary: np.ndarray,
+    word_table: np.ndarray,
+    fake_words: np.ndarray,
+    duplicate_rate: float
+) -> tuple:
+    """
+    Generate one batch of review texts.
+
+    Near-duplicates copy an earlier original of the same batch and replace
+    ``DUPLICATE_EDIT_RATE`` of its words.
+
+    Returns:
+        Tuple of (texts, boolean near-duplicate mask).
+    """
+    lengths = np.maximum(rng.gamma(2.0, 35.0, size=count).astype(np.int64), 5)
+
+    positions = np.arange(count)
+    is_duplicate = (rng.random(count) < duplicate_rate) & (positions > 0)
+    originals = np.flatnonzero(~is_duplicate)
+    earlier = np.searchsorted(originals, positions)  # originals before each row
+    picks = (rng.random(count) * earlier).astype(np.int64)
+    sources = originals[np.minimum(picks, len(originals) - 1)]
+    is_duplicate &= earlier > 0
+    lengths[is_duplicate] = lengths[sources[is_duplicate]]
+
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    owners = np.repeat(positions, lengths)
+    tokens = vocabulary[_draw(rng, word_table, len(owners))]
+    fake_tokens = is_fake[owners] & (rng.random(len(owners)) < FAKE_WORD_SHARE)
+    tokens[fake_tokens] = fake_words[rng.integers(0, len(fake_words), size=int(fake_tokens.sum()))]
+
+    copied = np.flatnonzero(is_duplicate[owners])
+    offsets = copied - bounds[owners[copied]]
+    tokens[copied] = tokens[bounds[sources[owners[copied]]] + offsets]
+    edited = copied[rng.random(len(copied)) < DUPLICATE_EDIT_RATE]
+    tokens[edited] = vocabulary[_draw(rng, word_table, len(edited))]
+
+    texts = [' '.join(tokens[bounds[i]:bounds[i + 1]]) for i in range(count)]
+    return texts, is_duplicate
+
 
-def create_database(db_path: str, num_reviews: int = 200):
+def create_database(
+    db_path: str,
+    num_reviews: int = 200,
+    num_reviewers: Optional[int] = None,
+    num_restaurants: Optional[int] = None,
+    fake_rate: float = 0.3,
+    burst_rate: float = 0.1,
+    duplicate_rate: float = 0.05,
+    zipf_exponent: float = 1.1,
+    max_reviewer_reviews: Optional[int] = MAX_REVIEWER_REVIEWS,
+    seed: int = 42
+):
     """
     Create a sample database with review data.
-    
+
+    The output depends only on the arguments, so the same seed always
+    produces the same database.
+
     Args:
-        db_path: Path to the database file
-        num_reviews: Number of reviews to generate
+        db_path: Path to the database file; an existing file is replaced.
+        num_reviews: Number of reviews to generate.
+        num_reviewers: Number of reviewers; defaults to one per 10 reviews
+                       (at least 20).
+        num_restaurants: Number of restaurants; defaults to one per 100
+                         reviews (at least 12).
+        fake_rate: Fraction of reviews flagged as fake.
+        burst_rate: Fraction of reviews posted in a burst, i.e. by the
+                    previous review's reviewer on the same day.
+        duplicate_rate: Fraction of reviews whose text is a near-duplicate
+                        of an earlier review.
+        zipf_exponent: Skew of reviewer activity, restaurant popularity and
+                       word frequencies.
+        max_reviewer_reviews: Expected number of reviews of the busiest
+                              reviewers; None leaves activity uncapped.
+        seed: Random seed.
     """
+    start = perf_counter()
+    if num_reviewers is None:
+        num_reviewers = max(20, num_reviews // 10)
+    if num_restaurants is None:
+        num_restaurants = max(12, num_reviews // 100)
+
+    # Bursts are twice as likely to be fake; other reviews make up the rest
+    # of fake_rate
+    burst_fake_rate = min(1.0, 2 * fake_rate)
+    other_fake_rate = max(
+        0.0, (fake_rate - burst_rate * burst_fake_rate) / max(1 - burst_rate, 1e-9)
+    )
+
+    rng = np.random.default_rng(seed)
+    vocabulary, fake_words = _vocabulary(rng)
+    word_table = _zipf_table(len(vocabulary), zipf_exponent)
+    reviewer_table = _zipf_table(
+        num_reviewers, zipf_exponent,
+        max_share=max_reviewer_reviews / num_reviews if max_reviewer_reviews else 1.0
+    )
+    restaurant_table = _zipf_table(num_restaurants, zipf_exponent)
+    # Activity ranks map to shuffled IDs so busy accounts are spread out
+    reviewer_ids = rng.permutation(num_reviewers)
+    restaurant_ids = rng.permutation(num_restaurants)
+    review_days = (LAST_REVIEW_DATE - FIRST_REVIEW_DATE).days
+
+    review_width = max(5, len(str(num_reviews)))
+    reviewer_width = max(4, len(str(num_reviewers)))
+    restaurant_width = max(4, len(str(num_restaurants)))
+
     # Ensure directory exists
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    
+
     # Remove existing database if it exists
-    if Path(db_path).exists():
-        Path(db_path).unlink()
-    
+    for suffix in ('', '-wal', '-shm'):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
     conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
     cursor = conn.cursor()
-    
+
     # Create tables
     print("Creating database tables...")
-    
-    # Review table
-    cursor.execute("""
+    cursor.executescript("""
         CREATE TABLE review (
             reviewID TEXT PRIMARY KEY,
             reviewerID TEXT,
@@ -87,119 +284,150 @@ def create_database(db_path: str, num_reviews: int = 200):
             usefulCount INTEGER,
             reviewContent TEXT,
             flagged TEXT CHECK(flagged IN ('Y', 'N'))
-        )
-    """)
-    
-    # Reviewer table
-    cursor.execute("""
+        );
         CREATE TABLE reviewer (
             reviewerID TEXT PRIMARY KEY,
             name TEXT,
             location TEXT,
             yelpJoinDate TEXT
-        )
-    """)
-    
-    # Restaurant table
-    cursor.execute("""
+        );
         CREATE TABLE restaurant (
             restaurantID TEXT PRIMARY KEY,
             rating REAL
-        )
+        );
     """)
-    
-    # Generate data
-    print(f"Generating {num_reviews} reviews...")
-    
+
     # Create reviewers
-    reviewers = []
-    for i in range(1, 21):  # 20 reviewers
-        reviewer_id = f"R{i:04d}"
-        name = random.choice(REVIEWER_NAMES)
-        location = random.choice(LOCATIONS)
-        join_date = datetime(2015, 1, 1) + timedelta(days=random.randint(0, 2000))
-        yelp_join = join_date.strftime("%B %Y")
-        
-        reviewers.append((reviewer_id, name, location, yelp_join))
-        cursor.execute(
-            "INSERT INTO reviewer (reviewerID, name, location, yelpJoinDate) VALUES (?, ?, ?, ?)",
-            (reviewer_id, name, location, yelp_join)
+    join_months = rng.integers(0, 12 * 8, size=num_reviewers)
+    cursor.executemany(
+        "INSERT INTO reviewer (reviewerID, name, location, yelpJoinDate) VALUES (?, ?, ?, ?)",
+        zip(
+            (f"R{i:0{reviewer_width}d}" for i in range(1, num_reviewers + 1)),
+            (REVIEWER_NAMES[i] for i in rng.integers(0, len(REVIEWER_NAMES), size=num_reviewers)),
+            (LOCATIONS[i] for i in rng.integers(0, len(LOCATIONS), size=num_reviewers)),
+            (date(2004 + int(m) // 12, int(m) % 12 + 1, 1).strftime("%B %Y") for m in join_months),
         )
-    
-    # Create restaurants
-    restaurants = []
-    for i in range(1, 13):  # 12 restaurants
-        restaurant_id = f"RES{i:04d}"
-        # Restaurant rating between 3.0 and 4.5
-        rating = round(random.uniform(3.0, 4.5), 1)
-        restaurants.append((restaurant_id, rating))
-        cursor.execute(
-            "INSERT INTO restaurant (restaurantID, rating) VALUES (?, ?)",
-            (restaurant_id, rating)
+    )
+
+    # Create restaurants with ratings between 3.0 and 4.5
+    restaurant_ratings = np.round(rng.uniform(3.0, 4.5, size=num_restaurants), 1)
+    cursor.executemany(
+        "INSERT INTO restaurant (restaurantID, rating) VALUES (?, ?)",
+        zip(
+            (f"RES{i:0{restaurant_width}d}" for i in range(1, num_restaurants + 1)),
+            restaurant_ratings.tolist(),
         )
-    
+    )
+
     # Generate reviews
+    print(f"Generating {num_reviews:,} reviews...")
     fake_count = 0
-    authentic_count = 0
-    
-    for i in range(1, num_reviews + 1):
-        review_id = f"REV{i:05d}"
-        reviewer_id = random.choice(reviewers)[0]
-        restaurant_id, restaurant_rating = random.choice(restaurants)
-        
-        # Determine if review is fake (30% chance)
-        is_fake = random.random() < 0.3
-        flagged = 'Y' if is_fake else 'N'
-        
-        if is_fake:
-            fake_count += 1
-            # Fake reviews tend to be extreme (1 or 5 stars)
-            rating = random.choice([1, 5])
-            review_text = random.choice(FAKE_REVIEWS)
-            # Fake reviews often have lower useful counts
-            useful_count = random.randint(0, 5)
-        else:
-            authentic_count += 1
-            # Authentic reviews have more varied ratings
-            rating = random.randint(1, 5)
-            review_text = random.choice(AUTHENTIC_REVIEWS)
-            useful_count = random.randint(0, 20)
-        
-        # Generate date (within last 2 years)
-        review_date = datetime.now() - timedelta(days=random.randint(0, 730))
-        date_str = review_date.strftime("%Y-%m-%d")
-        
-        cursor.execute("""
-            INSERT INTO review 
+    duplicate_count = 0
+    for batch_start in range(0, num_reviews, BATCH_SIZE):
+        count = min(BATCH_SIZE, num_reviews - batch_start)
+
+        # A burst row repeats the reviewer and day of the row that started it
+        is_burst = rng.random(count) < burst_rate
+        is_burst[0] = False
+        leaders = np.maximum.accumulate(np.where(is_burst, 0, np.arange(count)))
+        reviewers = reviewer_ids[_draw(rng, reviewer_table, count)][leaders]
+        days = rng.integers(0, review_days, size=count)[leaders]
+        restaurants = restaurant_ids[_draw(rng, restaurant_table, count)]
+
+        is_fake = rng.random(count) < np.where(is_burst, burst_fake_rate, other_fake_rate)
+        # Fake reviews tend to be extreme (1 or 5 stars); authentic ones
+        # scatter around the restaurant's rating
+        authentic_ratings = np.clip(
+            np.rint(rng.normal(restaurant_ratings[restaurants], 1.0)), 1, 5
+        ).astype(np.int64)
+        ratings = np.where(is_fake, rng.choice([1, 5], size=count), authentic_ratings)
+        # Fake reviews often have lower useful counts
+        useful_counts = np.where(
+            is_fake, rng.integers(0, 6, size=count), rng.integers(0, 21, size=count)
+        )
+        texts, is_duplicate = _review_texts(
+            rng, count, is_fake, vocabulary, word_table, fake_words, duplicate_rate
+        )
+
+        first_day = FIRST_REVIEW_DATE.toordinal()
+        cursor.executemany(
+            """
+            INSERT INTO review
             (reviewID, reviewerID, restaurantID, date, rating, usefulCount, reviewContent, flagged)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (review_id, reviewer_id, restaurant_id, date_str, rating, useful_count, review_text, flagged))
-    
-    conn.commit()
+            """,
+            zip(
+                (f"REV{i:0{review_width}d}"
+                 for i in range(batch_start + 1, batch_start + count + 1)),
+                (f"R{i + 1:0{reviewer_width}d}" for i in reviewers.tolist()),
+                (f"RES{i + 1:0{restaurant_width}d}" for i in restaurants.tolist()),
+                (date.fromordinal(first_day + d).isoformat() for d in days.tolist()),
+                ratings.tolist(),
+                useful_counts.tolist(),
+                texts,
+                np.where(is_fake, 'Y', 'N').tolist(),
+            )
+        )
+        conn.commit()
+        fake_count += int(is_fake.sum())
+        duplicate_count += int(is_duplicate.sum())
+        done = batch_start + count
+        if num_reviews > PROGRESS_ROWS and (done % PROGRESS_ROWS == 0 or done == num_reviews):
+            print(f"  {done:,} / {num_reviews:,} reviews")
+
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     conn.close()
-    
-    print(f"\nDatabase created successfully!")
+
+    print(f"\nDatabase created successfully in {perf_counter() - start:.1f}s!")
     print(f"Location: {db_path}")
-    print(f"Total reviews: {num_reviews}")
-    print(f"  - Authentic (N): {authentic_count}")
-    print(f"  - Fake (Y): {fake_count}")
-    print(f"Reviewers: 20")
-    print(f"Restaurants: 12")
+    print(f"Total reviews: {num_reviews:,}")
+    print(f"  - Authentic (N): {num_reviews - fake_count:,}")
+    print(f"  - Fake (Y): {fake_count:,}")
+    print(f"  - Near-duplicate texts: {duplicate_count:,}")
+    print(f"Reviewers: {num_reviewers:,}")
+    print(f"Restaurants: {num_restaurants:,}")
 
 
-if __name__ == "__main__":
-    # Create database in data/raw directory
+def main():
+    """Create the database from command-line options."""
     project_root = Path(__file__).parent
-    db_path = project_root / "data" / "raw" / "yelpResData.db"
-    
+    parser = argparse.ArgumentParser(description="Create a synthetic review database.")
+    parser.add_argument('--output', default=str(project_root / "data" / "raw" / "yelpResData.db"))
+    parser.add_argument('--reviews', type=int, default=200)
+    parser.add_argument('--reviewers', type=int, default=None)
+    parser.add_argument('--restaurants', type=int, default=None)
+    parser.add_argument('--fake-rate', type=float, default=0.3)
+    parser.add_argument('--burst-rate', type=float, default=0.1)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--max-reviewer-reviews', type=int, default=MAX_REVIEWER_REVIEWS,
+                        help="Cap on a reviewer's expected review count; 0 disables it")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Creating Sample Database for Fake Review Detection")
     print("=" * 60)
     print()
-    
-    create_database(str(db_path), num_reviews=200)
-    
+
+    create_database(
+        args.output,
+        num_reviews=args.reviews,
+        num_reviewers=args.reviewers,
+        num_restaurants=args.restaurants,
+        fake_rate=args.fake_rate,
+        burst_rate=args.burst_rate,
+        duplicate_rate=args.duplicate_rate,
+        zipf_exponent=args.zipf_exponent,
+        max_reviewer_reviews=args.max_reviewer_reviews or None,
+        seed=args.seed
+    )
+
     print()
     print("=" * 60)
     print("You can now run the project with: python main.py")
     print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
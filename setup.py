@@ -42,6 +42,9 @@ setup(
         "tqdm>=4.66.0",
     ],
     extras_require={
+        "arrow": [
+            "pyarrow>=14.0.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
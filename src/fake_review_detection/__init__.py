@@ -3,21 +3,85 @@ Fake Review Detection Package
 
 A machine learning project for detecting fake online reviews using
 semi-supervised and supervised learning approaches.
+
+Public names are imported from their modules on first access, so importing
+the package does not load pandas, scikit-learn, NLTK or matplotlib.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "1.0.0"
 __author__ = "Your Name"
 
-from .data_loader import load_data
-from .data_processor import DataProcessor
-from .feature_engineer import FeatureEngineer
-from .models import SemiSupervisedLearner
-from .utils import plot_confusion_matrix
-
-__all__ = [
-    "load_data",
-    "DataProcessor",
-    "FeatureEngineer",
-    "SemiSupervisedLearner",
-    "plot_confusion_matrix",
-]
+# Public name -> module that defines it
+_EXPORTS = {
+    "load_data": "data_loader",
+    "load_reviews": "data_loader",
+    "stream_data": "data_loader",
+    "ReviewQuery": "data_loader",
+    "DataProcessor": "data_processor",
+    "FeatureEngineer": "feature_engineer",
+    "MinHashLSH": "feature_engineer",
+    "FeatureStore": "feature_store",
+    "export_features": "feature_matrix",
+    "load_features": "feature_matrix",
+    "SemiSupervisedLearner": "models",
+    "CompiledForest": "compiled_forest",
+    "compile_forest": "compiled_forest",
+    "train_many": "orchestration",
+    "FeatureChunks": "out_of_core",
+    "export_feature_chunks": "out_of_core",
+    "train_out_of_core": "out_of_core",
+    "comparison_report": "orchestration",
+    "ScoringModel": "scoring",
+    "save_model": "scoring",
+    "MicroBatcher": "server",
+    "ScoringServer": "server",
+    "run_sweep": "sweep",
+    "Stage": "cache",
+    "StageCache": "cache",
+    "resample": "resampling",
+    "compact_frame": "schema",
+    "MemoryReport": "schema",
+    "METRICS": "instrumentation",
+    "Metrics": "instrumentation",
+    "configure_logging": "instrumentation",
+    "write_snapshot": "instrumentation",
+    "plot_confusion_matrix": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .cache import Stage, StageCache  # noqa: F401
+    from .compiled_forest import CompiledForest, compile_forest  # noqa: F401
+    from .data_loader import ReviewQuery, load_data, load_reviews, stream_data  # noqa: F401
+    from .data_processor import DataProcessor  # noqa: F401
+    from .feature_engineer import FeatureEngineer, MinHashLSH  # noqa: F401
+    from .feature_matrix import export_features, load_features  # noqa: F401
+    from .feature_store import FeatureStore  # noqa: F401
+    from .instrumentation import METRICS, Metrics, configure_logging, write_snapshot  # noqa: F401
+    from .models import SemiSupervisedLearner  # noqa: F401
+    from .orchestration import comparison_report, train_many  # noqa: F401
+    from .out_of_core import FeatureChunks, export_feature_chunks, train_out_of_core  # noqa: F401
+    from .resampling import resample  # noqa: F401
+    from .schema import MemoryReport, compact_frame  # noqa: F401
+    from .scoring import ScoringModel, save_model  # noqa: F401
+    from .server import MicroBatcher, ScoringServer  # noqa: F401
+    from .sweep import run_sweep  # noqa: F401
+    from .utils import plot_confusion_matrix  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its module on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes, including names not imported yet."""
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,266 @@
+"""
+Cache Module
+
+Content-addressed cache for intermediate pipeline frames, so unchanged
+stages (load, clean, features) are skipped on later runs.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import shutil
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Union
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Column holding a frame's index in Feather files, which only store columns
+_INDEX_COLUMN = '__cache_index__'
+
+
+class Stage(NamedTuple):
+    """One step of a cached pipeline.
+
+    Attributes:
+        name: Stage name, part of the cache key.
+        func: Maps the previous stage's frame (None for the first stage) to
+              this stage's frame.
+        code: Modules, classes or functions whose source is hashed into the
+              key, so editing them invalidates the cached output.
+        config: JSON-serializable settings that affect the output.
+        state: Object fitted by ``func`` (e.g. a ``FeatureEngineer``); it is
+               cached with the frame and restored on a cache hit.
+    """
+    name: str
+    func: Callable[[Optional[pd.DataFrame]], pd.DataFrame]
+    code: Sequence[Any] = ()
+    config: Any = None
+    state: Any = None
+
+
+def file_fingerprint(path: Union[str, Path]) -> dict:
+    """Identify a file by its path, size and modification time."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return {'path': str(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def code_fingerprint(code: Sequence[Any]) -> str:
+    """Hash the source code of modules, classes or functions."""
+    digest = hashlib.sha256()
+    for obj in code:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Size-bounded, least-recently-used on-disk cache of pipeline frames."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = 'data/processed/cache',
+        max_bytes: int = 2 * 1024 ** 3
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding one subdirectory per cached entry.
+            max_bytes: Total size above which least recently used entries
+                       are evicted.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(
+        self,
+        stage: str,
+        inputs: Any,
+        code: Sequence[Any] = (),
+        config: Any = None
+    ) -> str:
+        """
+        Compute the cache key of a stage.
+
+        Args:
+            stage: Stage name.
+            inputs: Description of the stage input: a file fingerprint for a
+                    first stage, or the upstream stage's key.
+            code: Modules, classes or functions the output depends on.
+            config: JSON-serializable settings the output depends on.
+
+        Returns:
+            Hex digest identifying the stage output.
+        """
+        payload = json.dumps(
+            [CACHE_FORMAT_VERSION, stage, inputs, code_fingerprint(code), config],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Read a cached entry and mark it as recently used.
+
+        Args:
+            key: Entry key.
+
+        Returns:
+            Tuple of (frame, state), or None if the entry is not cached.
+        """
+        entry = self.directory / key
+        meta_path = entry / 'meta.json'
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        if meta['format'] == 'feather':
+            df = pd.read_feather(entry / 'frame.feather').set_index(_INDEX_COLUMN)
+            df.index.name = meta['index_name']
+        else:
+            df = pd.read_pickle(entry / 'frame.pkl')
+        os.utime(meta_path)
+        return df, self._get_state(key)
+
+    def _get_state(self, key: str) -> Any:
+        """Read only the state object of an entry, or None."""
+        path = self.directory / key / 'state.pkl'
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def put(self, key: str, df: pd.DataFrame, state: Any = None, stage: str = '') -> None:
+        """
+        Store a frame (Feather if pyarrow is installed, else pickle) and evict
+        old entries if the cache is over its size limit.
+
+        Args:
+            key: Entry key.
+            df: Frame to cache.
+            state: Optional picklable object stored with the frame.
+            stage: Stage name, recorded for inspection.
+        """
+        entry = self.directory / key
+        tmp = self.directory / f'{key}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+
+        meta = {'stage': stage, 'format': 'pickle', 'index_name': df.index.name}
+        if HAS_PYARROW and df.index.nlevels == 1:
+            try:
+                df.reset_index(names=_INDEX_COLUMN).to_feather(tmp / 'frame.feather')
+                meta['format'] = 'feather'
+            except Exception:
+                # Columns Arrow cannot represent (e.g. mixed object types)
+                (tmp / 'frame.feather').unlink(missing_ok=True)
+        if meta['format'] == 'pickle':
+            df.to_pickle(tmp / 'frame.pkl')
+        if state is not None:
+            with open(tmp / 'state.pkl', 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(tmp / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        Remove least recently used entries until the cache fits ``max_bytes``.
+
+        Args:
+            keep: Key of an entry that must not be evicted.
+        """
+        entries = []
+        for entry in self.directory.iterdir():
+            meta_path = entry / 'meta.json'
+            if not meta_path.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((meta_path.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if entry.name != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self.directory.iterdir():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def run(
+        self,
+        inputs: Any,
+        stages: Sequence[Stage],
+        on_output: Optional[Callable[[str, pd.DataFrame], Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Run a pipeline, resuming after the last stage whose output is cached.
+
+        Each stage's key chains the previous stage's key, so a change to the
+        input, code or config of a stage invalidates it and every stage after
+        it, while stages before it are still reused.
+
+        Args:
+            inputs: Description of the pipeline input, such as
+                    :func:`file_fingerprint` of the database.
+            stages: Stages in execution order.
+            on_output: Called with the name and frame of each stage whose
+                       output is loaded or computed, e.g. ``MemoryReport.record``.
+
+        Returns:
+            Output frame of the last stage.
+        """
+        keys = []
+        upstream = inputs
+        for stage in stages:
+            upstream = self.key(stage.name, upstream, stage.code, stage.config)
+            keys.append(upstream)
+
+        df = None
+        start = 0
+        for i in reversed(range(len(stages))):
+            cached = self.get(keys[i])
+            if cached is not None:
+                logger.info("Using cached '%s' stage", stages[i].name)
+                df, state = cached
+                if stages[i].state is not None and state is not None:
+                    stages[i].state.__dict__.update(state.__dict__)
+                if on_output is not None:
+                    on_output(stages[i].name, df)
+                start = i + 1
+                break
+
+        # Earlier stages are skipped too, but their fitted state is restored
+        for stage, key in zip(stages[:max(start - 1, 0)], keys):
+            state = self._get_state(key) if stage.state is not None else None
+            if state is not None:
+                stage.state.__dict__.update(state.__dict__)
+
+        for stage, key in zip(stages[start:], keys[start:]):
+            df = stage.func(df)
+            self.put(key, df, stage.state, stage.name)
+            if on_output is not None:
+                on_output(stage.name, df)
+        return df
@@ -0,0 +1,275 @@
+"""
+Compiled Forest Module
+
+Flattens fitted scikit-learn decision-tree ensembles into packed NumPy
+arrays and scores them with a vectorized traversal, avoiding the per-tree
+Python dispatch of ``RandomForestClassifier.predict_proba``.
+"""
+
+import warnings
+import numpy as np
+from typing import Any, List
+
+# Upper bound on rows x trees traversed at once, which keeps the scratch
+# arrays of a traversal step small enough to stay in cache
+MAX_TRAVERSAL_CELLS = 1 << 18
+
+
+def _float32_at_most(threshold: np.ndarray) -> np.ndarray:
+    """Largest float32 values not above ``threshold``.
+
+    scikit-learn compares float32 inputs against float64 thresholds, and for
+    a float32 ``x``, ``x <= t`` holds exactly when ``x <= _float32_at_most(t)``,
+    so the narrowed thresholds route every input the same way.
+    """
+    narrow = threshold.astype(np.float32)
+    above = narrow.astype(np.float64) > threshold
+    narrow[above] = np.nextafter(narrow[above], np.float32(-np.inf))
+    return narrow
+
+
+class CompiledForest:
+    """A fitted tree ensemble packed into flat arrays for batch inference.
+
+    The nodes of all trees are concatenated. Each node holds a feature and
+    a float32 threshold, packed into one record so a traversal step reads
+    both with one gather, and its two children sit next to each other in
+    ``children``. Leaves point to themselves, so every row can take the same
+    number of steps (the depth of the deepest tree) through every tree at
+    once. Leaves hold float32 class probabilities, averaged over trees as in
+    ``predict_proba``.
+
+    Attributes:
+        nodes: Record array of ``threshold`` (float32) and ``feature``
+               (int32); rows go left when ``x <= threshold``.
+        children: Left and right child of node ``i`` at ``2 * i`` and
+                  ``2 * i + 1`` (int32); leaves point to themselves.
+        missing_left: Whether NaN goes to the left child, for trees that
+                      record it; None otherwise.
+        value: Class probabilities of each node, shape (n_nodes, n_classes).
+        roots: Index of each tree's root (int32).
+        max_depth: Depth of the deepest tree.
+        classes_: Class labels, as in the compiled estimator.
+        n_features_in_: Number of features the estimator was fitted on.
+    """
+
+    def __init__(self, trees: List[Any], classes: np.ndarray, n_features: int):
+        """
+        Pack fitted trees.
+
+        Args:
+            trees: ``tree_`` objects of fitted ``DecisionTreeClassifier``s
+                   with one output and ``len(classes)`` classes.
+            classes: Class labels of the ensemble.
+            n_features: Number of input features.
+        """
+        if not trees:
+            raise ValueError("The estimator has no fitted trees")
+        n_nodes = sum(tree.node_count for tree in trees)
+        if 2 * n_nodes >= np.iinfo(np.int32).max:
+            raise ValueError(f"Too many nodes to compile: {n_nodes}")
+
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = n_features
+        self.nodes = np.empty(n_nodes, dtype=[('threshold', np.float32), ('feature', np.int32)])
+        self.children = np.empty(2 * n_nodes, dtype=np.int32)
+        self.value = np.empty((n_nodes, len(self.classes_)), dtype=np.float32)
+        self.roots = np.empty(len(trees), dtype=np.int32)
+        self.max_depth = max(tree.max_depth for tree in trees)
+        missing = [getattr(tree, 'missing_go_to_left', None) for tree in trees]
+        self.missing_left = (
+            np.empty(n_nodes, dtype=bool) if all(m is not None for m in missing) else None
+        )
+
+        offset = 0
+        for i, tree in enumerate(trees):
+            if tree.n_outputs != 1 or tree.value.shape[2] != len(self.classes_):
+                raise ValueError("Only single-output trees over the ensemble's classes compile")
+            end = offset + tree.node_count
+            ids = np.arange(offset, end, dtype=np.int64)
+            leaf = tree.children_left == -1
+            self.roots[i] = offset
+            self.nodes['feature'][offset:end] = np.where(leaf, 0, tree.feature)
+            self.nodes['threshold'][offset:end] = np.where(
+                leaf, 0.0, _float32_at_most(tree.threshold)
+            )
+            self.children[2 * offset:2 * end:2] = np.where(leaf, ids, tree.children_left + offset)
+            self.children[2 * offset + 1:2 * end:2] = np.where(
+                leaf, ids, tree.children_right + offset
+            )
+            if self.missing_left is not None:
+                self.missing_left[offset:end] = missing[i].astype(bool)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            self.value[offset:end] = value / normalizer
+            offset = end
+
+    @property
+    def n_trees(self) -> int:
+        """Number of compiled trees."""
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the packed arrays, in bytes."""
+        arrays = [self.nodes, self.children, self.value, self.roots]
+        if self.missing_left is not None:
+            arrays.append(self.missing_left)
+        return sum(array.nbytes for array in arrays)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Find the leaf each row reaches in each tree.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features); converted to
+               float32, as scikit-learn does before traversing trees.
+
+        Returns:
+            Global leaf indices of shape (n_rows, n_trees).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected an array of shape (n_rows, {self.n_features_in_}), got {X.shape}"
+            )
+        has_nan = bool(np.isnan(X).any())
+        if has_nan and self.missing_left is None:
+            raise ValueError("Input contains NaN")
+
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int32)
+        step = max(1, MAX_TRAVERSAL_CELLS // self.n_trees)
+        for start in range(0, len(X), step):
+            chunk = np.ascontiguousarray(X[start:start + step])
+            flat = chunk.ravel()
+            # Position of each row's first feature in ``flat``
+            row_offsets = (np.arange(len(chunk), dtype=np.int32) * self.n_features_in_)[:, None]
+            nodes = np.repeat(self.roots[None, :], len(chunk), axis=0)
+            for _ in range(self.max_depth):
+                node = self.nodes[nodes]
+                x = flat[row_offsets + node['feature']]
+                if has_nan:
+                    go_right = ~((x <= node['threshold'])
+                                 | (np.isnan(x) & self.missing_left[nodes]))
+                else:
+                    go_right = x > node['threshold']
+                nodes = self.children[2 * nodes + go_right]
+            leaves[start:start + len(chunk)] = nodes
+        return leaves
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities, matching the estimator's ``predict_proba``.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features).
+
+        Returns:
+            Array of shape (n_rows, n_classes); columns follow ``classes_``.
+        """
+        leaves = self.apply(X)
+        return self.value[leaves].sum(axis=1, dtype=np.float64) / self.n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict class labels.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features).
+
+        Returns:
+            Most probable class of each row.
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def probe_rows(self, n_rows: int = 256, random_state: int = 0) -> np.ndarray:
+        """
+        Build rows that sit on and just above the forest's split thresholds.
+
+        Each feature takes a randomly chosen threshold of a split on it,
+        half of the time moved to the next float32 up, so both sides of many
+        decision boundaries are exercised.
+
+        Args:
+            n_rows: Number of rows.
+            random_state: Seed for reproducibility.
+
+        Returns:
+            Float32 matrix of shape (n_rows, n_features).
+        """
+        rng = np.random.default_rng(random_state)
+        X = np.zeros((n_rows, self.n_features_in_), dtype=np.float32)
+        internal = self.children[::2] != np.arange(len(self.nodes))
+        for column in range(self.n_features_in_):
+            thresholds = self.nodes['threshold'][internal & (self.nodes['feature'] == column)]
+            # Splits that only separate missing values have infinite thresholds
+            thresholds = thresholds[np.isfinite(thresholds)]
+            if not len(thresholds):
+                continue
+            values = rng.choice(thresholds, size=n_rows)
+            up = (rng.random(n_rows) < 0.5) & (values < np.finfo(np.float32).max)
+            values[up] = np.nextafter(values[up], np.float32(np.inf))
+            X[:, column] = values
+        return X
+
+    def check(self, estimator: Any, X: np.ndarray, atol: float = 1e-6) -> None:
+        """
+        Verify that the compiled forest reproduces ``estimator.predict_proba``.
+
+        Args:
+            estimator: The estimator that was compiled.
+            X: Rows to compare on.
+            atol: Largest allowed absolute difference of a probability.
+
+        Raises:
+            ValueError: If any probability differs by more than ``atol``.
+        """
+        with warnings.catch_warnings():
+            # Estimators fitted on frames warn about unnamed input columns
+            warnings.simplefilter('ignore', UserWarning)
+            expected = estimator.predict_proba(X)
+        error = float(np.abs(self.predict_proba(X) - expected).max(initial=0.0))
+        if error > atol:
+            raise ValueError(
+                f"Compiled forest differs from {type(estimator).__name__}.predict_proba "
+                f"by up to {error:.3g}"
+            )
+
+
+def compile_forest(model: Any, check_rows: int = 256) -> CompiledForest:
+    """
+    Compile a fitted tree classifier for fast batch inference.
+
+    Args:
+        model: Fitted ``RandomForestClassifier``, ``ExtraTreesClassifier`` or
+               ``DecisionTreeClassifier``, or a ``SemiSupervisedLearner``
+               wrapping one.
+        check_rows: Number of :meth:`CompiledForest.probe_rows` on which the
+                    compiled forest is checked against ``predict_proba``;
+                    0 skips the check.
+
+    Returns:
+        The compiled forest.
+
+    Raises:
+        ValueError: If the model is not a fitted single-output tree
+                    classifier, or the compiled outputs do not match.
+    """
+    # SemiSupervisedLearner wraps its estimator in ``model``
+    estimator = getattr(model, 'model', model)
+    if hasattr(estimator, 'estimators_'):
+        trees = [tree.tree_ for tree in estimator.estimators_]
+    elif hasattr(estimator, 'tree_'):
+        trees = [estimator.tree_]
+    else:
+        raise ValueError(f"Cannot compile {type(estimator).__name__}: not a fitted tree model")
+    if not hasattr(estimator, 'classes_') or getattr(estimator, 'n_outputs_', 1) != 1:
+        raise ValueError("Only single-output classifiers can be compiled")
+
+    compiled = CompiledForest(trees, estimator.classes_, estimator.n_features_in_)
+    if check_rows:
+        compiled.check(estimator, compiled.probe_rows(check_rows))
+    return compiled
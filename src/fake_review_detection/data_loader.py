@@ -4,22 +4,69 @@ Data Loading Module
 Handles loading data from SQLite database.
 """
 
+import json
+import logging
 import sqlite3
 import pandas as pd
+from datetime import date as Date
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from .instrumentation import span
+from .schema import compact_frame, concat_frames
 
-def load_data(db_path: Optional[str] = None) -> pd.DataFrame:
+logger = logging.getLogger(__name__)
+
+# Columns served from the review and restaurant tables, keyed by output name.
+# Reviewer columns are discovered from the database schema at query time.
+REVIEW_COLUMNS = {
+    'reviewID': 'review.reviewID',
+    'reviewerID': 'review.reviewerID',
+    'restaurantID': 'review.restaurantID',
+    'date': 'review.date',
+    'rating': 'review.rating',
+    'reviewUsefulCount': 'review.usefulCount',
+    'reviewContent': 'review.reviewContent',
+    'flagged': 'review.flagged',
+}
+RESTAURANT_COLUMNS = {
+    'restaurantRating': 'restaurant.rating',
+}
+
+# Normalizes review.date to ISO 'YYYY-MM-DD' so date ranges can be compared
+# as text. Handles both ISO dates and the Yelp dump's '\nM/D/YYYY' format.
+_DATE_SQL = "ltrim(review.date, char(10))"
+_DAY_YEAR_SQL = f"substr({_DATE_SQL}, instr({_DATE_SQL}, '/') + 1)"
+_ISO_DATE_SQL = (
+    f"(CASE WHEN instr({_DATE_SQL}, '/') > 0 THEN printf('%04d-%02d-%02d', "
+    f"CAST(substr({_DAY_YEAR_SQL}, instr({_DAY_YEAR_SQL}, '/') + 1) AS INTEGER), "
+    f"CAST({_DATE_SQL} AS INTEGER), "
+    f"CAST({_DAY_YEAR_SQL} AS INTEGER)) "
+    f"ELSE {_DATE_SQL} END)"
+)
+
+# Rows fetched and converted at a time when a whole table is read compactly
+FETCH_BATCH_SIZE = 50000
+
+# (table, column) pairs used by the join and filters in ReviewQuery.
+INDEXED_COLUMNS = [
+    ('review', 'reviewerID'),
+    ('review', 'restaurantID'),
+    ('review', 'flagged'),
+    ('reviewer', 'reviewerID'),
+    ('restaurant', 'restaurantID'),
+]
+
+
+def _resolve_db_path(db_path: Optional[str] = None) -> Path:
     """
-    Load review data from SQLite database.
+    Resolve the database path, falling back to the default locations.
 
     Args:
-        db_path: Path to the SQLite database file. If None, looks for
-                 'yelpResData.db' in the data/raw directory.
+        db_path: Path to the SQLite database file, or None for the default.
 
     Returns:
-        DataFrame containing merged review, reviewer, and restaurant data.
+        Path to an existing database file.
     """
     if db_path is None:
         # Default path: look in data/raw directory
@@ -37,48 +84,322 @@ def load_data(db_path: Optional[str] = None) -> pd.DataFrame:
                 # Fallback to old location
                 db_path = project_root / "Data" / "yelpResData.db"
 
+    db_path = Path(db_path)
     if not db_path.exists():
         raise FileNotFoundError(
             f"Database file not found at: {db_path}\n"
             f"Please place your SQLite database file (yelpResData.db) in the 'data/raw/' directory.\n"
             f"The database should contain tables: 'review', 'reviewer', and 'restaurant'."
         )
+    return db_path
+
 
-    print(f"Loading Data from Database: {db_path}")
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open a connection that decodes text columns the way the Yelp dump needs."""
     conn = sqlite3.connect(str(db_path))
     conn.text_factory = lambda x: str(x, 'gb2312', 'ignore')
-    cursor = conn.cursor()
-
-    # Load review data
-    cursor.execute("""
-        SELECT reviewID, reviewerID, restaurantID, date, rating, 
-               usefulCount as reviewUsefulCount, reviewContent, flagged 
-        FROM review 
-        WHERE flagged in ('Y','N')
-    """)
-    review_df = pd.DataFrame(
-        cursor.fetchall(),
-        columns=[column[0] for column in cursor.description]
-    )
-
-    # Load reviewer data
-    cursor.execute("SELECT * FROM reviewer")
-    reviewer_df = pd.DataFrame(
-        cursor.fetchall(),
-        columns=[column[0] for column in cursor.description]
-    )
-
-    # Load restaurant data
-    cursor.execute("SELECT restaurantID, rating as restaurantRating FROM restaurant")
-    restaurant_df = pd.DataFrame(
-        cursor.fetchall(),
-        columns=[column[0] for column in cursor.description]
-    )
-
-    # Merge all dataframes
-    df = review_df.merge(reviewer_df, on='reviewerID', how='inner')
-    df = df.merge(restaurant_df, on='restaurantID', how='inner')
-
-    conn.close()
-    print("Data Load Complete")
+    return conn
+
+
+def _reviewer_columns(conn: sqlite3.Connection) -> List[str]:
+    """Return the reviewer table columns other than the join key."""
+    rows = conn.execute("PRAGMA table_info(reviewer)").fetchall()
+    return [row[1] for row in rows if row[1] != 'reviewerID']
+
+
+def _has_index(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Check whether an index on ``table`` leads with ``column``."""
+    for index in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+        info = conn.execute(f'PRAGMA index_info("{index[1]}")').fetchall()
+        if info and min(info)[2] == column:
+            return True
+    return False
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> List[str]:
+    """
+    Create any missing indexes used by the review join and filters.
+
+    Args:
+        conn: Open connection to the review database.
+
+    Returns:
+        Names of the indexes that were created.
+    """
+    created = []
+    for table, column in INDEXED_COLUMNS:
+        if _has_index(conn, table, column):
+            continue
+        name = f"idx_{table}_{column}"
+        try:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ("{column}")')
+        except sqlite3.OperationalError as e:
+            # Read-only databases still work, just without the index
+            logger.warning("Could not create index %s: %s", name, e)
+            continue
+        created.append(name)
+    if created:
+        conn.commit()
+    return created
+
+
+def _iso_date(value: Union[str, Date]) -> str:
+    """Convert a date bound to an ISO 'YYYY-MM-DD' string."""
+    if isinstance(value, Date):
+        return value.isoformat()[:10]
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class ReviewQuery:
+    """Builds one projected, filtered SQL join over the review tables."""
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start_date: Optional[Union[str, Date]] = None,
+        end_date: Optional[Union[str, Date]] = None,
+        restaurant_ids: Optional[Iterable[str]] = None,
+        labels: Optional[Sequence[str]] = ('Y', 'N')
+    ):
+        """
+        Initialize the query.
+
+        Args:
+            columns: Output columns to select, in order. If None, selects the
+                     same columns as :func:`load_data`.
+            start_date: Earliest review date to include (inclusive).
+            end_date: Latest review date to include (inclusive).
+            restaurant_ids: Restrict to reviews of these restaurants.
+            labels: Values of ``flagged`` to include. None disables the filter.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.start_date = _iso_date(start_date) if start_date is not None else None
+        self.end_date = _iso_date(end_date) if end_date is not None else None
+        self.restaurant_ids = (
+            list(restaurant_ids) if restaurant_ids is not None else None
+        )
+        self.labels = list(labels) if labels is not None else None
+
+    def to_sql(self, reviewer_columns: Sequence[str] = ()) -> Tuple[str, List]:
+        """
+        Render the query.
+
+        Args:
+            reviewer_columns: Columns available in the reviewer table,
+                              excluding ``reviewerID``.
+
+        Returns:
+            Tuple of SQL text and its positional parameters.
+        """
+        available = dict(REVIEW_COLUMNS)
+        available.update(
+            (column, f'reviewer."{column}"') for column in reviewer_columns
+        )
+        available.update(RESTAURANT_COLUMNS)
+
+        columns = self.columns if self.columns is not None else list(available)
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown columns {unknown}. Available columns: {list(available)}"
+            )
+        select = ', '.join(f'{available[column]} as "{column}"' for column in columns)
+
+        where = []
+        params = []
+        if self.labels is not None:
+            where.append('review.flagged IN (SELECT value FROM json_each(?))')
+            params.append(json.dumps(self.labels))
+        if self.restaurant_ids is not None:
+            where.append('review.restaurantID IN (SELECT value FROM json_each(?))')
+            params.append(json.dumps(self.restaurant_ids))
+        if self.start_date is not None:
+            where.append(f'{_ISO_DATE_SQL} >= ?')
+            params.append(self.start_date)
+        if self.end_date is not None:
+            where.append(f'{_ISO_DATE_SQL} <= ?')
+            params.append(self.end_date)
+
+        sql = (
+            f"SELECT {select} FROM review "
+            f"JOIN reviewer ON reviewer.reviewerID = review.reviewerID "
+            f"JOIN restaurant ON restaurant.restaurantID = review.restaurantID"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql, params
+
+
+def _fetch_frame(cursor: sqlite3.Cursor, compact: bool = False) -> pd.DataFrame:
+    """
+    Read the remaining rows of an executed query into a frame.
+
+    With ``compact``, rows are fetched ``FETCH_BATCH_SIZE`` at a time and
+    each batch is converted with :func:`~.schema.compact_frame` before the
+    next one is read, so the full result never exists as Python objects.
+
+    Args:
+        cursor: Cursor of an executed query.
+        compact: Convert to memory-efficient column types while reading.
+
+    Returns:
+        DataFrame with the query's columns.
+    """
+    columns = [column[0] for column in cursor.description]
+    if not compact:
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+    batches = []
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        batches.append(compact_frame(pd.DataFrame.from_records(rows, columns=columns)))
+    return concat_frames(batches, columns)
+
+
+def _execute_query(conn: sqlite3.Connection, query: ReviewQuery) -> sqlite3.Cursor:
+    """Make sure the join is indexed and run the query."""
+    ensure_indexes(conn)
+    sql, params = query.to_sql(_reviewer_columns(conn))
+    return conn.execute(sql, params)
+
+
+def load_reviews(
+    db_path: Optional[str] = None,
+    query: Optional[ReviewQuery] = None,
+    compact: bool = False
+) -> pd.DataFrame:
+    """
+    Load only the columns and rows selected by a query.
+
+    The join, projection and filters all run inside SQLite, so only the
+    requested columns are decoded and moved into pandas.
+
+    Args:
+        db_path: Path to the SQLite database file. If None, looks for
+                 'yelpResData.db' in the data/raw directory.
+        query: Query to run. If None, loads the same data as :func:`load_data`.
+        compact: Convert each fetched batch to the compact column types of
+                 :func:`~.schema.compact_frame`.
+
+    Returns:
+        DataFrame with one row per matching review.
+    """
+    db_path = _resolve_db_path(db_path)
+    if query is None:
+        query = ReviewQuery()
+
+    with span('load', db_path=str(db_path)) as stage:
+        conn = _connect(db_path)
+        try:
+            df = _fetch_frame(_execute_query(conn, query), compact)
+        finally:
+            conn.close()
+        stage.rows_out = len(df)
     return df
+
+
+def load_data(db_path: Optional[str] = None, compact: bool = False) -> pd.DataFrame:
+    """
+    Load review data from SQLite database.
+
+    Args:
+        db_path: Path to the SQLite database file. If None, looks for
+                 'yelpResData.db' in the data/raw directory.
+        compact: Convert each table to the compact column types of
+                 :func:`~.schema.compact_frame` batch by batch as it is
+                 read, so the merge also runs on compact columns.
+
+    Returns:
+        DataFrame containing merged review, reviewer, and restaurant data.
+    """
+    db_path = _resolve_db_path(db_path)
+
+    with span('load', db_path=str(db_path), compact=compact) as stage:
+        conn = _connect(db_path)
+        cursor = conn.cursor()
+
+        # Load review data
+        cursor.execute("""
+            SELECT reviewID, reviewerID, restaurantID, date, rating, 
+                   usefulCount as reviewUsefulCount, reviewContent, flagged 
+            FROM review 
+            WHERE flagged in ('Y','N')
+        """)
+        review_df = _fetch_frame(cursor, compact)
+
+        # Load reviewer data
+        cursor.execute("SELECT * FROM reviewer")
+        reviewer_df = _fetch_frame(cursor, compact)
+
+        # Load restaurant data
+        cursor.execute("SELECT restaurantID, rating as restaurantRating FROM restaurant")
+        restaurant_df = _fetch_frame(cursor, compact)
+
+        # Merge all dataframes
+        df = review_df.merge(reviewer_df, on='reviewerID', how='inner')
+        df = df.merge(restaurant_df, on='restaurantID', how='inner')
+
+        if compact:
+            # Merging a categorical key with the other table's string key
+            # gives a plain string column
+            for key in ('reviewerID', 'restaurantID'):
+                if isinstance(review_df[key].dtype, pd.CategoricalDtype):
+                    df[key] = df[key].astype(review_df[key].dtype)
+
+        conn.close()
+        stage.rows_out = len(df)
+    return df
+
+
+def stream_data(
+    db_path: Optional[str] = None,
+    batch_size: int = 50000,
+    query: Optional[ReviewQuery] = None,
+    compact: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream joined review data from the SQLite database in fixed-size batches.
+
+    The review, reviewer and restaurant tables are joined inside SQLite and
+    rows are pulled with ``fetchmany``, so only one batch is held in memory
+    at a time regardless of the size of the database. By default each batch
+    has the same columns as the frame returned by :func:`load_data`.
+
+    Args:
+        db_path: Path to the SQLite database file. If None, looks for
+                 'yelpResData.db' in the data/raw directory.
+        batch_size: Maximum number of rows per yielded batch.
+        query: Projection and filters to apply. If None, streams everything
+               :func:`load_data` would load.
+        compact: Convert each batch to the compact column types of
+                 :func:`~.schema.compact_frame`; categories are chosen per
+                 batch.
+
+    Yields:
+        DataFrames of at most ``batch_size`` joined review rows.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    db_path = _resolve_db_path(db_path)
+    if query is None:
+        query = ReviewQuery()
+
+    logger.info("Streaming data from database: %s", db_path)
+    conn = _connect(db_path)
+    try:
+        cursor = _execute_query(conn, query)
+        columns = [column[0] for column in cursor.description]
+
+        while True:
+            # Only the fetch is timed, not the consumer's work between batches
+            with span('load_batch', db_path=str(db_path)) as stage:
+                rows = cursor.fetchmany(batch_size)
+                stage.rows_out = len(rows)
+            if not rows:
+                break
+            batch = pd.DataFrame.from_records(rows, columns=columns)
+            yield compact_frame(batch) if compact else batch
+    finally:
+        conn.close()
@@ -4,31 +4,152 @@ Data Processing Module
 Handles data cleaning and preprocessing operations.
 """
 
+import copy
+import hashlib
+import logging
+import os
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from nltk.corpus import stopwords
-from nltk.tokenize import RegexpTokenizer
-import nltk
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import filterfalse
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, Optional
 
-# Download required NLTK data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+from ._stopwords import ENGLISH_STOPWORDS
+from .instrumentation import span
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+logger = logging.getLogger(__name__)
+
+# Maps every ASCII character outside \w to a space, so that for ASCII text
+# ``s.translate(...).split()`` yields the same tokens as ``re.findall(r'\w+', s)``
+_ASCII_NON_WORD = str.maketrans({
+    chr(i): ' ' for i in range(128) if not (chr(i).isalnum() or chr(i) == '_')
+})
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(language: str = 'english') -> FrozenSet[str]:
+    """
+    Load a stopword list without touching the network.
+
+    NLTK is imported on first use, and its corpus is used if it is already
+    installed. Otherwise the bundled copy of the English list is returned;
+    run ``nltk.download('stopwords')`` beforehand to use NLTK's data.
+
+    Args:
+        language: Name of the NLTK stopword list.
+
+    Returns:
+        Set of stopwords.
+    """
+    try:
+        import nltk
+        nltk.data.find('corpora/stopwords')
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    except (ImportError, LookupError, OSError):
+        if language != 'english':
+            raise
+        logger.info("NLTK stopwords corpus not found, using the bundled English list")
+        return frozenset(ENGLISH_STOPWORDS)
+
+
+def _map_unique(series: pd.Series, func: Callable[[np.ndarray], list]) -> pd.Series:
+    """
+    Apply ``func`` once per distinct non-null value of ``series``.
+
+    Args:
+        series: Column to transform; nulls are passed through unchanged.
+        func: Maps an array of distinct values to a list of new values.
+
+    Returns:
+        Transformed series with the original index and name; categorical
+        input stays categorical.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Map the categories only; categories that map to the same value merge
+        mapped = func(np.asarray(series.cat.categories, dtype=object))
+        merged, categories = pd.factorize(pd.Index(mapped, dtype=object))
+        codes = series.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, merged[codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories),
+            index=series.index,
+            name=series.name
+        )
+    codes, uniques = pd.factorize(series)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = func(np.asarray(uniques, dtype=object))
+    values = mapped[codes]
+    missing = codes < 0
+    if missing.any():
+        values[missing] = series.to_numpy(dtype=object)[missing]
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+# Per-process processor used by pool workers, set once by _init_worker
+_worker_processor: Optional['DataProcessor'] = None
+
+
+def _init_worker(processor: 'DataProcessor') -> None:
+    """Keep one processor (stopwords and tokenizer) per worker process."""
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Clean one chunk with the worker's processor."""
+    return _worker_processor._clean_frame(chunk)
 
 
 class DataProcessor:
     """Handles data cleaning and preprocessing."""
 
-    def __init__(self):
-        """Initialize the data processor."""
-        self.stop_words = set(stopwords.words('english'))
-        self.tokenizer = RegexpTokenizer(r'\w+')
+    def __init__(self, n_jobs: int = 1, chunk_size: int = 50000):
+        """
+        Initialize the data processor.
+
+        Args:
+            n_jobs: Number of worker processes used by ``clean``. -1 uses
+                    all CPUs; 1 cleans in the calling process.
+            chunk_size: Number of rows per task sent to a worker.
+        """
+        self._stop_words: Optional[set] = None
+        self._tokenizer: Any = None
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+    @property
+    def stop_words(self) -> set:
+        """English stopwords, loaded on first use (see :func:`load_stopwords`)."""
+        if self._stop_words is None:
+            self._stop_words = set(load_stopwords('english'))
+        return self._stop_words
+
+    @stop_words.setter
+    def stop_words(self, value: Iterable[str]) -> None:
+        self._stop_words = set(value)
+
+    def cache_config(self) -> dict:
+        """
+        Settings that affect the cleaned output, for a pipeline cache key.
+
+        The stopword list differs between NLTK's corpus and the bundled
+        fallback, so it is identified by a hash of its words.
+
+        Returns:
+            JSON-serializable description of the cleaning settings.
+        """
+        words = '\n'.join(sorted(self.stop_words))
+        return {'stop_words': hashlib.sha256(words.encode()).hexdigest()}
+
+    @property
+    def tokenizer(self) -> Any:
+        """NLTK word tokenizer, imported on first use."""
+        if self._tokenizer is None:
+            from nltk.tokenize import RegexpTokenizer
+            self._tokenizer = RegexpTokenizer(r'\w+')
+        return self._tokenizer
 
     def clean(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -40,38 +161,134 @@ class DataProcessor:
         Returns:
             Cleaned dataframe.
         """
-        print("Cleaning Data")
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        with span('clean', rows_in=len(df), n_jobs=n_jobs) as stage:
+            if n_jobs > 1 and len(df) > self.chunk_size:
+                df = self._clean_parallel(df, n_jobs)
+            else:
+                df = self._clean_frame(df)
+            stage.rows_out = len(df)
+        return df
+
+    def _clean_parallel(self, df: pd.DataFrame, n_jobs: int) -> pd.DataFrame:
+        """
+        Clean ``df`` in a process pool, preserving row order.
+
+        Args:
+            df: Raw dataframe to clean.
+            n_jobs: Number of worker processes.
+
+        Returns:
+            Cleaned dataframe, identical to the serial result.
+        """
+        serial = copy.copy(self)
+        serial.n_jobs = 1
+        bounds = range(0, len(df), self.chunk_size)
+        chunks = (df.iloc[start:start + self.chunk_size] for start in bounds)
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(bounds)),
+            initializer=_init_worker,
+            initargs=(serial,)
+        ) as executor:
+            return pd.concat(executor.map(_clean_chunk, chunks))
+
+    def _clean_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Clean a dataframe in the calling process."""
         df = df.copy()
 
         # Clean date column
         if 'date' in df.columns:
-            df['date'] = df['date'].apply(
-                lambda x: x[1:] if isinstance(x, str) and x.startswith('\n') else x
-            )
+            df['date'] = _map_unique(df['date'], lambda values: [
+                x[1:] if isinstance(x, str) and x.startswith('\n') else x
+                for x in values
+            ])
 
         # Format yelpJoinDate
         if 'yelpJoinDate' in df.columns:
-            df['yelpJoinDate'] = df['yelpJoinDate'].apply(
-                lambda x: datetime.strftime(
-                    datetime.strptime(x, '%B %Y'), '01/%m/%Y'
-                ) if isinstance(x, str) else x
-            )
+            df['yelpJoinDate'] = _map_unique(df['yelpJoinDate'], self._format_join_dates)
 
-        # Clean review content
+        # Clean review content: remove stopwords, tokenize and lower-case
         if 'reviewContent' in df.columns:
-            # Remove stopwords
-            df['reviewContent'] = df['reviewContent'].apply(
-                lambda x: ' '.join(
-                    word for word in str(x).split()
-                    if word.lower() not in self.stop_words
-                )
+            content = df['reviewContent']
+            cleaned = pd.Series(
+                self._clean_text(content.to_numpy(dtype=object)),
+                index=df.index,
+                name='reviewContent'
             )
-            # Tokenize
-            df['reviewContent'] = df['reviewContent'].apply(
-                lambda x: ' '.join(self.tokenizer.tokenize(str(x)))
-            )
-            # Convert to lowercase
-            df['reviewContent'] = df['reviewContent'].str.lower()
+            # Keep compact (e.g. pyarrow-backed) string columns compact
+            if isinstance(content.dtype, pd.StringDtype):
+                cleaned = cleaned.astype(content.dtype)
+            df['reviewContent'] = cleaned
 
-        print("Data Cleaning Complete")
         return df
+
+    @staticmethod
+    def _format_join_dates(values: np.ndarray) -> list:
+        """Reformat 'Month YYYY' strings as '01/MM/YYYY', leaving non-strings as-is."""
+        is_str = np.array([isinstance(x, str) for x in values], dtype=bool)
+        result = values.copy()
+        if is_str.any():
+            parsed = pd.to_datetime(pd.Series(values[is_str]), format='%B %Y')
+            result[is_str] = parsed.dt.strftime('01/%m/%Y').to_numpy(dtype=object)
+        return list(result)
+
+    def _clean_text(self, values: np.ndarray) -> List[str]:
+        """
+        Remove stopwords, tokenize and lower-case review texts in one pass.
+
+        ASCII texts (nearly all reviews) are lower-cased up front, filtered
+        with a set lookup and tokenized with a translate table. Other texts
+        go through the tokenizer and are lower-cased together with the
+        pandas string accessor, because lower-casing non-ASCII text can
+        change word boundaries and ``Series.str.lower`` may differ from
+        ``str.lower`` there (pandas 3 lower-cases with pyarrow). Both paths
+        give the same output as removing stopwords, then tokenizing with
+        ``self.tokenizer``, then ``Series.str.lower()``.
+
+        Args:
+            values: Review texts; non-strings are converted with ``str``.
+
+        Returns:
+            Cleaned texts, one per input value.
+        """
+        stop_words = self.stop_words
+        is_stop_word = stop_words.__contains__
+        # The NLTK tokenizer is only imported once a non-ASCII text shows up
+        tokenize = None
+        cleaned = []
+        non_ascii = []
+        for text in values:
+            text = str(text)
+            if text.isascii():
+                kept = ' '.join(filterfalse(is_stop_word, text.lower().split()))
+                cleaned.append(' '.join(kept.translate(_ASCII_NON_WORD).split()))
+            else:
+                if tokenize is None:
+                    tokenize = self.tokenizer.tokenize
+                kept = ' '.join(
+                    word for word in text.split()
+                    if word.lower() not in stop_words
+                )
+                non_ascii.append(len(cleaned))
+                cleaned.append(' '.join(tokenize(kept)))
+        if non_ascii:
+            lowered = pd.Series([cleaned[i] for i in non_ascii], dtype=str).str.lower()
+            for i, text in zip(non_ascii, lowered):
+                cleaned[i] = text
+        return cleaned
+
+    def clean_batches(self, batches: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Clean a stream of dataframe batches as they arrive.
+
+        Cleaning is row-local, so each batch (for example from
+        ``data_loader.stream_data``) can be cleaned independently.
+
+        Args:
+            batches: Iterable of raw dataframes.
+
+        Yields:
+            Cleaned dataframes, one per input batch.
+        """
+        for batch in batches:
+            yield self.clean(batch)
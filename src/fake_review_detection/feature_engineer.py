@@ -4,19 +4,295 @@ Feature Engineering Module
 Creates new features for the machine learning models.
 """
 
+import hashlib
+import pickle
 import pandas as pd
 import numpy as np
-from collections import OrderedDict
+from itertools import chain
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import pairwise_distances
+from typing import Iterable, Optional, Tuple
+
+from .instrumentation import span
+
+
+def max_group_similarity(
+    matrix: sparse.csr_matrix,
+    groups: np.ndarray,
+    small_group_size: int = 64,
+    block_size: int = 1024,
+    pair_batch_size: int = 200000
+) -> np.ndarray:
+    """
+    Compute each group's maximum off-diagonal cosine similarity.
+
+    Rows of ``matrix`` must be L2-normalized (as produced by
+    ``TfidfVectorizer``), so dot products are cosine similarities. Rows are
+    grouped with a stable sort. Groups of up to ``small_group_size`` rows
+    are handled together by enumerating their within-group pairs; larger
+    groups are multiplied against themselves in blocks of ``block_size``
+    rows, so no dense group-by-group matrix is ever built.
+
+    Args:
+        matrix: Sparse row vectors, one per document.
+        groups: Non-negative integer group code per row; negative codes
+                are ignored.
+        small_group_size: Largest group handled by pair enumeration.
+        block_size: Rows per sparse product for large groups.
+        pair_batch_size: Pairs scored per batch for small groups.
+
+    Returns:
+        Array indexed by group code with the maximum similarity between two
+        different rows of that group, or 0 for groups with a single row.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    groups = np.asarray(groups)
+    n_groups = int(groups.max()) + 1 if len(groups) else 0
+    result = np.zeros(n_groups)
+
+    order = np.argsort(groups, kind='stable')
+    order = order[groups[order] >= 0]
+    sorted_groups = groups[order]
+    if len(order) == 0:
+        return result
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+    rows = matrix[order]
+
+    # Small groups: score all within-group pairs, batched across groups
+    for size in np.unique(sizes[(sizes > 1) & (sizes <= small_group_size)]):
+        group_starts = starts[sizes == size]
+        first, second = np.triu_indices(size, k=1)
+        left = (group_starts[:, None] + first).ravel()
+        right = (group_starts[:, None] + second).ravel()
+        owners = np.repeat(sorted_groups[group_starts], len(first))
+        for batch in range(0, len(left), pair_batch_size):
+            pairs = slice(batch, batch + pair_batch_size)
+            scores = np.asarray(
+                rows[left[pairs]].multiply(rows[right[pairs]]).sum(axis=1)
+            ).ravel()
+            np.maximum.at(result, owners[pairs], scores)
+
+    # Large groups: blocked sparse self-products, ignoring the diagonal
+    for start, size in zip(starts[sizes > small_group_size], sizes[sizes > small_group_size]):
+        block = rows[start:start + size]
+        best = 0.0
+        for offset in range(0, size, block_size):
+            product = (block[offset:offset + block_size] @ block.T).tocoo()
+            off_diagonal = product.data[product.row + offset != product.col]
+            if off_diagonal.size:
+                best = max(best, off_diagonal.max())
+        result[sorted_groups[start]] = best
+
+    return result
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: a fast, well-distributed uint64 -> uint64 hash."""
+    values = values.astype(np.uint64, copy=True)
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+class MinHashLSH:
+    """MinHash signatures with banded locality-sensitive hashing for near-duplicate text."""
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.8,
+        window: int = 10,
+        seed: int = 42
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: Number of hash functions in each MinHash signature.
+            bands: Number of LSH bands; must divide ``num_perm``.
+            shingle_size: Number of consecutive words per shingle.
+            threshold: Estimated Jaccard similarity at which two reviews are
+                       linked into the same duplicate cluster.
+            window: Number of neighbours each review is compared with inside
+                    an LSH bucket, which keeps large buckets linear.
+            seed: Seed for the hash functions.
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.window = window
+        self.seed = seed
+
+    def signatures(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute MinHash signatures over word shingles.
+
+        Args:
+            texts: Review texts.
+
+        Returns:
+            Tuple of a ``(n_texts, num_perm)`` uint64 signature matrix and a
+            boolean mask of texts that had at least one word.
+        """
+        words = [str(text).split() for text in texts]
+        lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+        word_ids, _ = pd.factorize(np.fromiter(
+            chain.from_iterable(words), dtype=object, count=int(lengths.sum())
+        ))
+        word_ids = word_ids.astype(np.uint64) + np.uint64(1)
+
+        # Hash every run of shingle_size words, padding past the end of a doc
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        doc = np.repeat(np.arange(len(words)), lengths)
+        doc_end = ends[doc]
+        position = np.arange(len(word_ids))
+        shingles = np.zeros(len(word_ids), dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            index = position + offset
+            inside = index < doc_end
+            token = np.zeros(len(word_ids), dtype=np.uint64)
+            token[inside] = word_ids[index[inside]]
+            shingles = _mix64(shingles ^ token)
+
+        # Keep full shingles, plus the single padded shingle of short docs
+        keep = (position + self.shingle_size <= doc_end) | (
+            (position == starts[doc]) & (lengths[doc] < self.shingle_size)
+        )
+        shingles = shingles[keep]
+        shingle_doc = doc[keep]
+
+        has_words = lengths > 0
+        segments = np.searchsorted(shingle_doc, np.flatnonzero(has_words))
+        # Shingle hashes are already mixed, so a*h + b (mod 2**64) with odd a
+        # is enough to act as an independent permutation per signature slot
+        seeds = _mix64(np.arange(2 * self.num_perm, dtype=np.uint64) + np.uint64(self.seed))
+        multipliers = seeds[:self.num_perm] | np.uint64(1)
+        offsets = seeds[self.num_perm:]
+        signatures = np.full((len(words), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        permuted = np.empty_like(shingles)
+        if len(shingles):
+            for i in range(self.num_perm):
+                np.multiply(shingles, multipliers[i], out=permuted)
+                permuted += offsets[i]
+                signatures[has_words, i] = np.minimum.reduceat(permuted, segments)
+        return signatures, has_words
+
+    def fit_transform(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find near-duplicate texts across the whole corpus.
+
+        Reviews that share a band are compared with their neighbours in that
+        band's bucket order, so the cost grows linearly with the corpus.
+
+        Args:
+            texts: Review texts.
+
+        Returns:
+            Tuple of each text's maximum estimated Jaccard similarity to any
+            other text, and the size of its duplicate cluster (1 when it has
+            no near-duplicate).
+        """
+        signatures, has_words = self.signatures(texts)
+        n = len(signatures)
+        docs = np.flatnonzero(has_words)
+        max_similarity = np.zeros(n)
+        edges_left, edges_right = [], []
+
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            keys = np.zeros(len(docs), dtype=np.uint64)
+            for column in range(band * rows, (band + 1) * rows):
+                keys = _mix64(keys ^ signatures[docs, column])
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            for offset in range(1, min(self.window, len(order) - 1) + 1):
+                same = np.flatnonzero(sorted_keys[offset:] == sorted_keys[:-offset])
+                if not len(same):
+                    continue
+                left = docs[order[same]]
+                right = docs[order[same + offset]]
+                similarity = (signatures[left] == signatures[right]).mean(axis=1)
+                np.maximum.at(max_similarity, left, similarity)
+                np.maximum.at(max_similarity, right, similarity)
+                linked = similarity >= self.threshold
+                edges_left.append(left[linked])
+                edges_right.append(right[linked])
+
+        if edges_left:
+            left = np.concatenate(edges_left)
+            right = np.concatenate(edges_right)
+        else:
+            left = right = np.zeros(0, dtype=np.int64)
+        graph = sparse.coo_matrix((np.ones(len(left)), (left, right)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        cluster_size = np.bincount(labels)[labels]
+        return max_similarity, cluster_size
 
 
 class FeatureEngineer:
     """Handles feature engineering operations."""
 
-    def __init__(self):
-        """Initialize the feature engineer."""
-        pass
+    def __init__(
+        self,
+        near_duplicates: Optional[MinHashLSH] = None,
+        mnr_reference_max: Optional[float] = None,
+        vectorizer: Optional[TfidfVectorizer] = None
+    ):
+        """
+        Initialize the feature engineer.
+
+        Args:
+            near_duplicates: If given, also add corpus-wide near-duplicate
+                             features computed with this MinHash index.
+            mnr_reference_max: Fixed divisor for normalizing MNR, e.g. the
+                               ``mnr_max_`` stored from training, so a single
+                               batch is scaled like the training data. If
+                               None, the batch's own maximum is used.
+            vectorizer: Fitted TF-IDF vectorizer to reuse for content
+                        similarity. If None, one is fitted on each corpus
+                        passed to ``create_features``.
+        """
+        self.vectorizer = vectorizer
+        self.fit_vectorizer = vectorizer is None
+        self.near_duplicates = near_duplicates
+        self.mnr_reference_max = mnr_reference_max
+        self.mnr_max_ = None
+
+    def cache_config(self) -> dict:
+        """
+        Constructor settings that affect the features, for a pipeline cache key.
+
+        A supplied vectorizer is identified by a hash of its pickle, so both
+        its parameters and its fitted vocabulary are covered.
+
+        Returns:
+            JSON-serializable description of the feature settings.
+        """
+        near_duplicates = None
+        if self.near_duplicates is not None:
+            near_duplicates = {
+                name: getattr(self.near_duplicates, name)
+                for name in ('num_perm', 'bands', 'shingle_size', 'threshold', 'window', 'seed')
+            }
+        vectorizer = None
+        if not self.fit_vectorizer:
+            vectorizer = hashlib.sha256(pickle.dumps(self.vectorizer)).hexdigest()
+        return {
+            'near_duplicates': near_duplicates,
+            'mnr_reference_max': self.mnr_reference_max,
+            'vectorizer': vectorizer,
+        }
 
     def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -28,79 +304,96 @@ class FeatureEngineer:
         Returns:
             Dataframe with new features added.
         """
-        print("Feature Engineering: Creating New Features")
-        df = df.copy()
+        with span('features', rows_in=len(df)) as stage:
+            df = df.copy()
+
+            # Feature 1: Maximum Number of Reviews (MNR) - normalized
+            if 'reviewerID' in df.columns and 'date' in df.columns:
+                df['mnr'] = self._mnr(df)
 
-        # Feature 1: Maximum Number of Reviews (MNR) - normalized
-        if 'reviewerID' in df.columns and 'date' in df.columns:
-            mnr_df1 = df[['reviewerID', 'date']].copy()
-            mnr_df2 = mnr_df1.groupby(by=['date', 'reviewerID']).size().reset_index(name='mnr')
-            if mnr_df2['mnr'].max() > 0:
-                mnr_df2['mnr'] = mnr_df2['mnr'] / mnr_df2['mnr'].max()
-            df = df.merge(mnr_df2, on=['reviewerID', 'date'], how='inner')
+            # Feature 2: Review Length (RL)
+            if 'reviewContent' in df.columns:
+                df['rl'] = df['reviewContent'].apply(lambda x: len(str(x).split()))
 
-        # Feature 2: Review Length (RL)
-        if 'reviewContent' in df.columns:
-            df['rl'] = df['reviewContent'].apply(lambda x: len(str(x).split()))
+            # Feature 3: Rating Deviation (RD)
+            if 'rating' in df.columns and 'restaurantRating' in df.columns:
+                df['rd'] = abs(df['rating'] - df['restaurantRating']) / 4
 
-        # Feature 3: Rating Deviation (RD)
-        if 'rating' in df.columns and 'restaurantRating' in df.columns:
-            df['rd'] = abs(df['rating'] - df['restaurantRating']) / 4
+            # Feature 4: Maximum Content Similarity
+            if 'reviewerID' in df.columns and 'reviewContent' in df.columns:
+                df = self._add_content_similarity(df)
 
-        # Feature 4: Maximum Content Similarity
-        if 'reviewerID' in df.columns and 'reviewContent' in df.columns:
-            df = self._add_content_similarity(df)
+            # Feature 5: Near-duplicate text across all reviewers and restaurants
+            if self.near_duplicates is not None and 'reviewContent' in df.columns:
+                max_similarity, cluster_size = self.near_duplicates.fit_transform(
+                    df['reviewContent']
+                )
+                df['Maximum Duplicate Similarity'] = max_similarity
+                df['Duplicate Cluster Size'] = cluster_size
 
-        # Remove rows with NaN values
-        df.dropna(inplace=True)
+            # Remove rows with NaN values
+            df.dropna(inplace=True)
 
-        print("Feature Engineering Complete")
+            stage.rows_out = len(df)
         return df
 
+    def _mnr(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Count each reviewer's reviews on the same date, normalized.
+
+        Counts are broadcast back to the rows with a grouped transform over
+        categorical keys, so no grouped frame is merged back. Rows with a
+        missing key get NaN and are dropped with the other incomplete rows.
+
+        Args:
+            df: Dataframe with ``reviewerID`` and ``date``.
+
+        Returns:
+            Normalized MNR per row.
+        """
+        counts = df.groupby(
+            [df['reviewerID'].astype('category'), df['date'].astype('category')],
+            observed=True,
+            sort=False
+        )['reviewerID'].transform('size')
+
+        if self.mnr_reference_max is not None:
+            self.mnr_max_ = self.mnr_reference_max
+        else:
+            self.mnr_max_ = counts.max() if counts.notna().any() else 0
+        if self.mnr_max_ > 0:
+            counts = counts / self.mnr_max_
+        return counts
+
     def _add_content_similarity(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate maximum content similarity for each reviewer.
 
+        One TF-IDF model is fitted on the whole corpus (or a fitted one is
+        reused) and each reviewer's maximum cosine similarity between two of
+        their own reviews is taken from that shared sparse matrix.
+
         Args:
             df: Dataframe with review content.
 
         Returns:
             Dataframe with similarity feature added.
         """
-        res = OrderedDict()
-        for _, row in df.iterrows():
-            res.setdefault(row.reviewerID, []).append(str(row.reviewContent))
-
-        individual_reviewer = [
-            {'reviewerID': k, 'reviewContent': v}
-            for k, v in res.items()
-        ]
-
-        reviewers = []
-        similarities = []
-        vectorizer = TfidfVectorizer(min_df=0)
-
-        for reviewer_data in individual_reviewer:
-            try:
-                if len(reviewer_data['reviewContent']) > 1:
-                    tfidf = vectorizer.fit_transform(reviewer_data['reviewContent'])
-                    cosine = 1 - pairwise_distances(tfidf, metric='cosine')
-                    np.fill_diagonal(cosine, -np.inf)
-                    max_sim = cosine.max()
-                    if max_sim == -np.inf:
-                        max_sim = 0
-                else:
-                    max_sim = 0
-            except Exception:
-                max_sim = 0
-
-            reviewers.append(reviewer_data['reviewerID'])
-            similarities.append(max_sim)
-
-        similarity_df = pd.DataFrame({
-            'reviewerID': reviewers,
-            'Maximum Content Similarity': similarities
-        })
-
-        df = pd.merge(df, similarity_df, on="reviewerID", how="left")
+        codes, reviewers = pd.factorize(df['reviewerID'])
+        texts = df['reviewContent'].map(str)
+        try:
+            if self.fit_vectorizer:
+                self.vectorizer = TfidfVectorizer()
+                tfidf = self.vectorizer.fit_transform(texts)
+            else:
+                tfidf = self.vectorizer.transform(texts)
+            similarities = max_group_similarity(tfidf, codes)
+        except ValueError:
+            # Empty vocabulary, e.g. every review was only stopwords
+            similarities = np.zeros(len(reviewers))
+
+        values = np.full(len(df), np.nan)
+        known = codes >= 0
+        values[known] = similarities[codes[known]]
+        df['Maximum Content Similarity'] = values
         return df
@@ -0,0 +1,169 @@
+"""
+Feature Matrix Module
+
+Exports engineered features as a memory-mappable ``.npy`` bundle, so
+training processes can open the matrix instead of rebuilding it.
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .models import feature_arrays
+
+FEATURE_MATRIX_FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+FEATURES_FILE = 'features.npy'
+LABELS_FILE = 'labels.npy'
+KEYS_FILE = 'keys.npy'
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    """Write an array with ``np.save`` so that a partial file is never left behind."""
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def write_feature_arrays(
+    directory: Union[str, Path],
+    X: np.ndarray,
+    y: np.ndarray,
+    feature_names: List[str],
+    target_column: str = 'flagged',
+    keys: Optional[np.ndarray] = None
+) -> Path:
+    """
+    Write a feature matrix and labels as a bundle.
+
+    Args:
+        directory: Output directory; created if missing.
+        X: Feature matrix.
+        y: Labels aligned with ``X``; string labels are stored as a
+           fixed-width array so they can be memory-mapped too.
+        feature_names: Names of the columns of ``X``.
+        target_column: Name of the label column, recorded in the manifest.
+        keys: Optional stable row identifiers (e.g. ``reviewID``) aligned
+              with ``X``, used for hash-based sampling.
+
+    Returns:
+        Path of the bundle directory.
+    """
+    if y.dtype == object:
+        if not all(isinstance(label, str) for label in y):
+            raise ValueError("Labels must be strings or a numeric array")
+        y = y.astype(str)
+    if X.shape != (len(y), len(feature_names)):
+        raise ValueError(
+            f"Feature matrix shape {X.shape} does not match "
+            f"{len(y)} labels and {len(feature_names)} feature names"
+        )
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _save_array(directory / FEATURES_FILE, np.ascontiguousarray(X))
+    _save_array(directory / LABELS_FILE, np.ascontiguousarray(y))
+    if keys is not None:
+        _save_array(directory / KEYS_FILE, np.asarray(keys).astype(str))
+    else:
+        (directory / KEYS_FILE).unlink(missing_ok=True)
+    manifest = {
+        'format_version': FEATURE_MATRIX_FORMAT_VERSION,
+        'rows': int(X.shape[0]),
+        'feature_columns': list(feature_names),
+        'target_column': target_column,
+        'features_dtype': X.dtype.str,
+        'labels_dtype': y.dtype.str,
+        'labels': sorted(np.unique(y).tolist()),
+        'has_keys': keys is not None,
+    }
+    tmp = directory / f'{MANIFEST_FILE}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, directory / MANIFEST_FILE)
+    return directory
+
+
+def export_features(
+    df: pd.DataFrame,
+    directory: Union[str, Path],
+    target_column: str = 'flagged',
+    drop_columns: Optional[List[str]] = None
+) -> Path:
+    """
+    Export the numeric features and labels of a featurized frame.
+
+    Args:
+        df: Output of ``FeatureEngineer.create_features``.
+        directory: Output directory.
+        target_column: Name of the target column.
+        drop_columns: Columns that are not features; defaults to the
+                      columns ``SemiSupervisedLearner.train`` drops.
+                      ``reviewID`` is stored as the bundle's row keys.
+
+    Returns:
+        Path of the bundle directory.
+    """
+    X, y, feature_names = feature_arrays(df, target_column, drop_columns)
+    keys = df['reviewID'].to_numpy() if 'reviewID' in df.columns else None
+    return write_feature_arrays(directory, X, y, feature_names, target_column, keys)
+
+
+def load_features(
+    directory: Union[str, Path],
+    mmap_mode: Optional[str] = 'r'
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Open a feature bundle written by :func:`export_features`.
+
+    With the default ``mmap_mode`` the arrays are read-only memory maps:
+    opening is instant and processes reading the same bundle share one
+    page-cached copy. The result can be passed straight to
+    ``SemiSupervisedLearner.train_arrays(X, y, feature_names)``.
+
+    Args:
+        directory: Bundle directory.
+        mmap_mode: ``np.load`` memory-map mode; None reads into memory.
+
+    Returns:
+        Tuple of (feature matrix, labels, feature names).
+    """
+    directory = Path(directory)
+    with open(directory / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FEATURE_MATRIX_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported feature matrix format version: {manifest.get('format_version')}"
+        )
+
+    X = np.load(directory / FEATURES_FILE, mmap_mode=mmap_mode, allow_pickle=False)
+    y = np.load(directory / LABELS_FILE, mmap_mode=mmap_mode, allow_pickle=False)
+    feature_names = manifest['feature_columns']
+    if X.shape != (manifest['rows'], len(feature_names)) or len(y) != manifest['rows']:
+        raise ValueError(f"Feature bundle in {directory} does not match its manifest")
+    return X, y, feature_names
+
+
+def load_feature_keys(
+    directory: Union[str, Path],
+    mmap_mode: Optional[str] = 'r'
+) -> Optional[np.ndarray]:
+    """
+    Open the row keys of a feature bundle.
+
+    Args:
+        directory: Bundle directory.
+        mmap_mode: ``np.load`` memory-map mode; None reads into memory.
+
+    Returns:
+        Array of row keys, or None if the bundle was written without keys.
+    """
+    path = Path(directory) / KEYS_FILE
+    if not path.exists():
+        return None
+    return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
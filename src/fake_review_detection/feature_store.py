@@ -0,0 +1,423 @@
+"""
+Feature Store Module
+
+Keeps per-reviewer state on disk so new reviews can be featurized
+incrementally instead of recomputing features for the whole corpus.
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Iterator, Optional, Tuple, Union
+
+from .instrumentation import span
+
+REQUIRED_COLUMNS = ['reviewID', 'reviewerID', 'date', 'reviewContent']
+
+
+def _max_new_pair_similarity(
+    matrix: sparse.csr_matrix,
+    groups: np.ndarray,
+    new_rows: np.ndarray,
+    n_groups: int,
+    pair_batch_size: int = 200000
+) -> np.ndarray:
+    """
+    Compute each group's maximum similarity over pairs involving a new row.
+
+    Only pairs of (new row, other row of the same group) are scored, so the
+    cost is proportional to the new rows times their groups' sizes rather
+    than to the square of the history.
+
+    Args:
+        matrix: L2-normalized sparse rows.
+        groups: Group code per row, in ``range(n_groups)``.
+        new_rows: Positions of the newly added rows.
+        n_groups: Number of groups.
+        pair_batch_size: Pairs scored per batch.
+
+    Returns:
+        Array of per-group maxima (0 where a group has no new pair).
+    """
+    result = np.zeros(n_groups)
+    order = np.argsort(groups, kind='stable')
+    group_sizes = np.bincount(groups, minlength=n_groups)
+    group_starts = np.cumsum(group_sizes) - group_sizes
+
+    new_groups = groups[new_rows]
+    sizes = group_sizes[new_groups]
+    left = np.repeat(new_rows, sizes)
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    right = order[np.repeat(group_starts[new_groups], sizes) + offsets]
+    distinct = left != right
+    left, right = left[distinct], right[distinct]
+
+    for batch in range(0, len(left), pair_batch_size):
+        pairs = slice(batch, batch + pair_batch_size)
+        scores = np.asarray(
+            matrix[left[pairs]].multiply(matrix[right[pairs]]).sum(axis=1)
+        ).ravel()
+        np.maximum.at(result, groups[left[pairs]], scores)
+    return result
+
+
+def _encode_rows(matrix: sparse.csr_matrix) -> Iterator[Tuple[bytes, bytes]]:
+    """Serialize each row of a sparse matrix as (term indices, weights) blobs."""
+    for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:]):
+        yield (
+            matrix.indices[start:end].astype(np.int32).tobytes(),
+            matrix.data[start:end].astype(np.float64).tobytes()
+        )
+
+
+def _decode_rows(indices: pd.Series, weights: pd.Series, n_features: int) -> sparse.csr_matrix:
+    """Rebuild a sparse matrix from blobs written by :func:`_encode_rows`."""
+    lengths = np.fromiter((len(blob) // 4 for blob in indices), dtype=np.int64, count=len(indices))
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    return sparse.csr_matrix(
+        (
+            np.frombuffer(b''.join(weights), dtype=np.float64),
+            np.frombuffer(b''.join(indices), dtype=np.int32),
+            indptr
+        ),
+        shape=(len(lengths), n_features)
+    )
+
+
+def _fingerprint(vectorizer: TfidfVectorizer) -> str:
+    """Identify a fitted vectorizer by a hash of its pickle."""
+    return hashlib.sha256(pickle.dumps(vectorizer)).hexdigest()
+
+
+class FeatureStore:
+    """SQLite-backed per-reviewer state for incremental feature engineering."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        vectorizer: Optional[TfidfVectorizer] = None
+    ):
+        """
+        Open (or create) a feature store.
+
+        Args:
+            path: Path to the store's SQLite file.
+            vectorizer: Fitted TF-IDF vectorizer for content similarity. If
+                        None, the store's saved vectorizer is used, or one is
+                        fitted on the first batch of reviews it receives.
+        """
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS review (
+                reviewID TEXT PRIMARY KEY,
+                reviewerID TEXT,
+                reviewContent TEXT,
+                term_indices BLOB,
+                term_weights BLOB
+            );
+            CREATE INDEX IF NOT EXISTS idx_review_reviewerID ON review (reviewerID);
+            CREATE TABLE IF NOT EXISTS reviewer_day (
+                reviewerID TEXT,
+                date TEXT,
+                reviews INTEGER,
+                PRIMARY KEY (reviewerID, date)
+            );
+            CREATE TABLE IF NOT EXISTS reviewer (
+                reviewerID TEXT PRIMARY KEY,
+                max_similarity REAL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value BLOB
+            );
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(review)")}
+        for column in ('term_indices', 'term_weights'):
+            if column not in columns:
+                # Stores created before vectors were persisted
+                self.conn.execute(f"ALTER TABLE review ADD COLUMN {column} BLOB")
+
+        self.vectorizer = vectorizer
+        if self.vectorizer is None:
+            saved = self._get_meta('vectorizer')
+            if saved is not None:
+                self.vectorizer = pickle.loads(saved)
+        if self.vectorizer is not None:
+            self._check_vectors()
+        self.conn.commit()
+
+    def __enter__(self) -> 'FeatureStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    @property
+    def mnr_max(self) -> int:
+        """Largest number of reviews any reviewer posted on a single day."""
+        value = self._get_meta('mnr_max')
+        return int(value) if value is not None else 0
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Ingest newly cleaned reviews and update per-reviewer state.
+
+        Reviews whose ``reviewID`` is already stored are ignored, so feeding
+        overlapping batches is safe.
+
+        Args:
+            df: Cleaned dataframe with at least ``reviewID``, ``reviewerID``,
+                ``date`` and ``reviewContent``.
+
+        Returns:
+            Number of reviews added to the store.
+        """
+        try:
+            added = self._ingest(df)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return added
+
+    def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ingest a batch of reviews and return its engineered features.
+
+        Args:
+            df: Cleaned dataframe of new reviews.
+
+        Returns:
+            Dataframe with the same features as
+            ``FeatureEngineer.create_features``, computed from stored state.
+        """
+        with span('features', rows_in=len(df), source='feature_store') as stage:
+            self.update(df)
+            df = self.transform(df)
+            stage.rows_out = len(df)
+        return df
+
+    def preview(
+        self,
+        df: pd.DataFrame,
+        mnr_reference_max: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Featurize reviews as if they were ingested, leaving the store unchanged.
+
+        The batch is written inside a transaction that is rolled back after
+        its features are read, so scoring never mutates stored state.
+
+        Args:
+            df: Cleaned dataframe of reviews to score.
+            mnr_reference_max: Divisor for MNR instead of the store's maximum.
+
+        Returns:
+            Dataframe with engineered features, as from ``transform``.
+        """
+        vectorizer = self.vectorizer
+        try:
+            self._ingest(df)
+            return self.transform(df, mnr_reference_max)
+        finally:
+            self.conn.rollback()
+            self.vectorizer = vectorizer
+
+    def transform(
+        self,
+        df: pd.DataFrame,
+        mnr_reference_max: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Add features to reviews that are already in the store.
+
+        Only the state of the reviewers present in ``df`` is read.
+
+        Args:
+            df: Cleaned dataframe.
+            mnr_reference_max: Divisor for MNR instead of the store's maximum,
+                               e.g. the maximum seen when the model was trained.
+
+        Returns:
+            Dataframe with ``mnr``, ``rl``, ``rd`` and
+            ``Maximum Content Similarity`` added and NaN rows removed.
+        """
+        df = df.copy()
+        reviewers = json.dumps(df['reviewerID'].dropna().unique().tolist())
+
+        # Feature 1: Maximum Number of Reviews (MNR), normalized by store max
+        counts = pd.read_sql_query(
+            "SELECT reviewerID, date, reviews FROM reviewer_day "
+            "WHERE reviewerID IN (SELECT value FROM json_each(?))",
+            self.conn, params=(reviewers,)
+        ).set_index(['reviewerID', 'date'])['reviews']
+        keys = pd.MultiIndex.from_arrays([df['reviewerID'], df['date']])
+        mnr_max = mnr_reference_max if mnr_reference_max is not None else self.mnr_max
+        df['mnr'] = counts.reindex(keys).to_numpy(dtype=float) / max(mnr_max, 1)
+
+        # Feature 2: Review Length (RL)
+        df['rl'] = df['reviewContent'].apply(lambda x: len(str(x).split()))
+
+        # Feature 3: Rating Deviation (RD)
+        if 'rating' in df.columns and 'restaurantRating' in df.columns:
+            df['rd'] = abs(df['rating'] - df['restaurantRating']) / 4
+
+        # Feature 4: Maximum Content Similarity
+        similarity = pd.read_sql_query(
+            "SELECT reviewerID, max_similarity FROM reviewer "
+            "WHERE reviewerID IN (SELECT value FROM json_each(?))",
+            self.conn, params=(reviewers,)
+        ).set_index('reviewerID')['max_similarity']
+        df['Maximum Content Similarity'] = df['reviewerID'].map(similarity)
+
+        df.dropna(inplace=True)
+        return df
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value) -> None:
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def _check_vectors(self) -> None:
+        """Drop stored TF-IDF vectors made with a different vectorizer.
+
+        They are recomputed from the stored text the next time their
+        reviewer receives a review.
+        """
+        fingerprint = _fingerprint(self.vectorizer)
+        if self._get_meta('vectors_fingerprint') != fingerprint:
+            self.conn.execute("UPDATE review SET term_indices = NULL, term_weights = NULL")
+            self._set_meta('vectors_fingerprint', fingerprint)
+
+    def _ingest(self, df: pd.DataFrame) -> int:
+        """Write a batch without committing; returns the number of new reviews."""
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        df = df[REQUIRED_COLUMNS].dropna().drop_duplicates('reviewID')
+        stored = pd.read_sql_query(
+            "SELECT reviewID FROM review WHERE reviewID IN (SELECT value FROM json_each(?))",
+            self.conn, params=(json.dumps(df['reviewID'].tolist()),)
+        )['reviewID']
+        df = df[~df['reviewID'].isin(stored)]
+        if df.empty:
+            return 0
+
+        if self.vectorizer is None:
+            self.vectorizer = TfidfVectorizer()
+            self.vectorizer.fit(df['reviewContent'].map(str))
+            self._set_meta('vectorizer', pickle.dumps(self.vectorizer))
+            self._set_meta('vectors_fingerprint', _fingerprint(self.vectorizer))
+
+        # Only the new reviews are vectorized; history is read back as vectors
+        vectors = sparse.csr_matrix(self.vectorizer.transform(df['reviewContent'].map(str)))
+        self._update_similarity(df, vectors)
+        self._update_counts(df)
+        self.conn.executemany(
+            "INSERT INTO review (reviewID, reviewerID, reviewContent, term_indices, term_weights) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                row + blobs for row, blobs in zip(
+                    df[['reviewID', 'reviewerID', 'reviewContent']].itertuples(
+                        index=False, name=None
+                    ),
+                    _encode_rows(vectors)
+                )
+            )
+        )
+        return len(df)
+
+    def _history_vectors(self, reviewers: str) -> Tuple[pd.Series, sparse.csr_matrix]:
+        """Read the stored reviewer and TF-IDF vector of the reviewers' reviews.
+
+        Reviews without a stored vector (from an older store, or invalidated
+        by a new vectorizer) are vectorized once and their vectors saved.
+        """
+        history = pd.read_sql_query(
+            "SELECT reviewID, reviewerID, term_indices, term_weights, "
+            "CASE WHEN term_indices IS NULL THEN reviewContent END AS reviewContent "
+            "FROM review WHERE reviewerID IN (SELECT value FROM json_each(?))",
+            self.conn, params=(reviewers,)
+        )
+        stale = history['term_indices'].isna()
+        if stale.any():
+            vectors = sparse.csr_matrix(
+                self.vectorizer.transform(history.loc[stale, 'reviewContent'].map(str))
+            )
+            blobs = pd.DataFrame(
+                list(_encode_rows(vectors)),
+                index=history.index[stale],
+                columns=['term_indices', 'term_weights']
+            )
+            blobs['reviewID'] = history.loc[stale, 'reviewID']
+            self.conn.executemany(
+                "UPDATE review SET term_indices = ?, term_weights = ? WHERE reviewID = ?",
+                blobs.itertuples(index=False, name=None)
+            )
+            history.loc[stale, ['term_indices', 'term_weights']] = blobs
+        matrix = _decode_rows(
+            history['term_indices'], history['term_weights'], len(self.vectorizer.vocabulary_)
+        )
+        return history['reviewerID'], matrix
+
+    def _update_similarity(self, df: pd.DataFrame, vectors: sparse.csr_matrix) -> None:
+        """Fold the new reviews into each affected reviewer's max similarity.
+
+        ``vectors`` holds the new reviews' TF-IDF rows; the affected
+        reviewers' earlier reviews are scored from their stored vectors.
+        """
+        reviewers = json.dumps(df['reviewerID'].unique().tolist())
+        history_reviewers, history_vectors = self._history_vectors(reviewers)
+        codes, uniques = pd.factorize(
+            pd.concat([history_reviewers, df['reviewerID']], ignore_index=True)
+        )
+        matrix = sparse.vstack([history_vectors, vectors], format='csr')
+        new_rows = np.arange(len(history_reviewers), len(codes))
+        best = _max_new_pair_similarity(matrix, codes, new_rows, len(uniques))
+
+        previous = pd.read_sql_query(
+            "SELECT reviewerID, max_similarity FROM reviewer "
+            "WHERE reviewerID IN (SELECT value FROM json_each(?))",
+            self.conn, params=(reviewers,)
+        ).set_index('reviewerID')['max_similarity']
+        best = np.maximum(best, previous.reindex(uniques).fillna(0).to_numpy())
+        self.conn.executemany(
+            "INSERT INTO reviewer (reviewerID, max_similarity) VALUES (?, ?) "
+            "ON CONFLICT(reviewerID) DO UPDATE SET max_similarity = excluded.max_similarity",
+            zip(uniques.tolist(), best.tolist())
+        )
+
+    def _update_counts(self, df: pd.DataFrame) -> None:
+        """Add the new reviews to the per-(reviewer, date) counts."""
+        counts = df.groupby(['reviewerID', 'date'], sort=False).size()
+        self.conn.executemany(
+            "INSERT INTO reviewer_day (reviewerID, date, reviews) VALUES (?, ?, ?) "
+            "ON CONFLICT(reviewerID, date) DO UPDATE SET reviews = reviews + excluded.reviews",
+            ((reviewer, date, int(n)) for (reviewer, date), n in counts.items())
+        )
+        reviewers = json.dumps(counts.index.get_level_values(0).unique().tolist())
+        (batch_max,) = self.conn.execute(
+            "SELECT MAX(reviews) FROM reviewer_day "
+            "WHERE reviewerID IN (SELECT value FROM json_each(?))",
+            (reviewers,)
+        ).fetchone()
+        if batch_max is not None and batch_max > self.mnr_max:
+            self._set_meta('mnr_max', int(batch_max))
@@ -0,0 +1,370 @@
+"""
+Instrumentation Module
+
+Per-stage spans (duration, rows in and out, memory delta) and per-iteration
+self-training metrics, reported as structured log records and collected in
+a process-wide snapshot that can be served or written for a local scraper.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+# Parent logger of every module in the package
+logger = logging.getLogger(__package__)
+
+# Number of finished spans kept in the snapshot, most recent last
+RECENT_SPANS = 100
+
+METRIC_PREFIX = 'fake_review'
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes.
+
+    Read from /proc where available, else the peak RSS from ``getrusage``
+    (0 where neither exists).
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageSpan:
+    """One running stage; set ``rows_out`` (and any extra fields) before it ends."""
+
+    def __init__(self, stage: str, rows_in: Optional[int] = None, **fields: Any):
+        """
+        Start measuring a stage.
+
+        Args:
+            stage: Stage name, such as ``'clean'``.
+            rows_in: Number of input rows, if known.
+            **fields: JSON-serializable context, such as the learner name.
+        """
+        self.stage = stage
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.fields = fields
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+        self._rss_start = current_rss()
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop measuring and return the span as a JSON-serializable dict."""
+        return {
+            'stage': self.stage,
+            'duration_seconds': time.perf_counter() - self._start,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'memory_delta_bytes': current_rss() - self._rss_start,
+            'error': self.error,
+            **self.fields,
+        }
+
+
+class Metrics:
+    """Collects stage spans and self-training iterations of one process."""
+
+    def __init__(self):
+        """Initialize an empty collection."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self.started = time.time()
+            self.stages: Dict[str, Dict[str, Any]] = {}
+            self.recent: deque = deque(maxlen=RECENT_SPANS)
+            self.training: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def span(self, stage: str, rows_in: Optional[int] = None, **fields: Any) -> Iterator[StageSpan]:
+        """
+        Measure the enclosed block as one run of ``stage``.
+
+        The span is recorded and logged when the block exits, also when it
+        raises; the exception is propagated.
+
+        Args:
+            stage: Stage name.
+            rows_in: Number of input rows, if known.
+            **fields: JSON-serializable context added to the record.
+
+        Yields:
+            The running :class:`StageSpan`.
+        """
+        span = StageSpan(stage, rows_in, **fields)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            self.record_span(span.finish())
+
+    def record_span(self, record: Dict[str, Any]) -> None:
+        """Add a finished span to the totals of its stage and log it."""
+        with self._lock:
+            totals = self.stages.setdefault(record['stage'], {
+                'runs': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                'rows_in': 0, 'rows_out': 0,
+            })
+            totals['runs'] += 1
+            totals['errors'] += int(record['error'] is not None)
+            totals['total_seconds'] += record['duration_seconds']
+            totals['max_seconds'] = max(totals['max_seconds'], record['duration_seconds'])
+            totals['rows_in'] += record['rows_in'] or 0
+            totals['rows_out'] += record['rows_out'] or 0
+            totals['last'] = record
+            self.recent.append(record)
+
+        rows = ''
+        if record['rows_in'] is not None or record['rows_out'] is not None:
+            rows = f", rows {_count(record['rows_in'])} -> {_count(record['rows_out'])}"
+        logger.log(
+            logging.ERROR if record['error'] else logging.INFO,
+            "Stage %s %s in %.3fs%s, memory %+.1f MB",
+            record['stage'],
+            f"failed ({record['error']})" if record['error'] else 'finished',
+            record['duration_seconds'],
+            rows,
+            record['memory_delta_bytes'] / 1024 ** 2,
+            extra={'event': 'stage', 'metrics': record}
+        )
+
+    def record_iteration(
+        self,
+        learner: str,
+        iteration: int,
+        pseudo_labeled: int,
+        fit_seconds: float,
+        predict_seconds: float,
+        **fields: Any
+    ) -> Dict[str, Any]:
+        """
+        Record one iteration of a self-training loop and log it.
+
+        Iteration 1 starts a new run of ``learner``, replacing its previous
+        per-iteration history; the totals keep accumulating.
+
+        Args:
+            learner: Algorithm name of the learner.
+            iteration: 1-based iteration number.
+            pseudo_labeled: Rows pseudo-labeled in this iteration.
+            fit_seconds: Time spent fitting the model.
+            predict_seconds: Time spent predicting the unlabeled rows.
+            **fields: JSON-serializable context, such as the number of
+                      unlabeled rows left.
+
+        Returns:
+            The recorded iteration.
+        """
+        record = {
+            'learner': learner,
+            'iteration': iteration,
+            'pseudo_labeled': pseudo_labeled,
+            'fit_seconds': fit_seconds,
+            'predict_seconds': predict_seconds,
+            **fields,
+        }
+        self.add_iterations([record])
+        logger.info(
+            "%s iteration %d: %d rows pseudo-labeled, fit %.3fs, predict %.3fs",
+            learner, iteration, pseudo_labeled, fit_seconds, predict_seconds,
+            extra={'event': 'iteration', 'metrics': record}
+        )
+        return record
+
+    def add_iterations(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add iterations without logging them, e.g. ones recorded in a worker
+        process and returned with its training metrics.
+
+        Args:
+            records: Iterations as returned by :meth:`record_iteration`.
+        """
+        with self._lock:
+            for record in records:
+                totals = self.training.setdefault(record['learner'], {
+                    'runs': 0, 'iterations': 0, 'pseudo_labeled': 0,
+                    'fit_seconds': 0.0, 'predict_seconds': 0.0, 'history': [],
+                })
+                if record['iteration'] == 1:
+                    totals['runs'] += 1
+                    totals['history'] = []
+                totals['iterations'] += 1
+                totals['pseudo_labeled'] += record['pseudo_labeled']
+                totals['fit_seconds'] += record['fit_seconds']
+                totals['predict_seconds'] += record['predict_seconds']
+                totals['history'].append(record)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return everything recorded so far as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                'started': self.started,
+                'updated': time.time(),
+                'pid': os.getpid(),
+                'rss_bytes': current_rss(),
+                'stages': {
+                    name: {**totals, 'last': dict(totals['last'])}
+                    for name, totals in self.stages.items()
+                },
+                'recent_spans': [dict(record) for record in self.recent],
+                'training': {
+                    name: {**totals, 'history': [dict(r) for r in totals['history']]}
+                    for name, totals in self.training.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the snapshot in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = [
+            f'# TYPE {METRIC_PREFIX}_rss_bytes gauge',
+            f'{METRIC_PREFIX}_rss_bytes {snap["rss_bytes"]}',
+        ]
+        stage_metrics = [
+            ('stage_runs_total', 'counter', lambda t: t['runs']),
+            ('stage_errors_total', 'counter', lambda t: t['errors']),
+            ('stage_seconds_total', 'counter', lambda t: t['total_seconds']),
+            ('stage_last_seconds', 'gauge', lambda t: t['last']['duration_seconds']),
+            ('stage_last_rows_in', 'gauge', lambda t: t['last']['rows_in']),
+            ('stage_last_rows_out', 'gauge', lambda t: t['last']['rows_out']),
+            ('stage_last_memory_delta_bytes', 'gauge', lambda t: t['last']['memory_delta_bytes']),
+        ]
+        training_metrics = [
+            ('training_iterations_total', 'counter', lambda t: t['iterations']),
+            ('training_pseudo_labeled_total', 'counter', lambda t: t['pseudo_labeled']),
+            ('training_fit_seconds_total', 'counter', lambda t: t['fit_seconds']),
+            ('training_predict_seconds_total', 'counter', lambda t: t['predict_seconds']),
+        ]
+        for label, groups, metrics in (
+            ('stage', snap['stages'], stage_metrics),
+            ('learner', snap['training'], training_metrics),
+        ):
+            for name, kind, value in metrics:
+                lines.append(f'# TYPE {METRIC_PREFIX}_{name} {kind}')
+                for group, totals in groups.items():
+                    if value(totals) is not None:
+                        lines.append(
+                            f'{METRIC_PREFIX}_{name}{{{label}="{_escape(group)}"}} {value(totals)}'
+                        )
+        return '\n'.join(lines) + '\n'
+
+    def write_snapshot(self, path: Union[str, Path]) -> None:
+        """
+        Atomically write the snapshot for a local scraper.
+
+        Args:
+            path: Output file; a ``.prom`` suffix writes the Prometheus text
+                  format (for a node exporter textfile collector), anything
+                  else writes JSON.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.prom':
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2, default=str)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(text)
+        os.replace(tmp, path)
+
+
+def _count(value: Optional[int]) -> str:
+    """Format a row count, or '?' when unknown."""
+    return '?' if value is None else f'{value:,}'
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as one JSON object per line, with their metrics."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render ``record`` as JSON."""
+        payload = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if hasattr(record, 'event'):
+            payload['event'] = record.event
+            payload.update(record.metrics)
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level: int = logging.INFO, json_format: bool = False) -> logging.Handler:
+    """
+    Send the package's log records to stderr.
+
+    Args:
+        level: Minimum level to emit.
+        json_format: Emit structured JSON lines instead of plain messages.
+
+    Returns:
+        The installed handler; a handler from an earlier call is replaced.
+    """
+    for handler in list(logger.handlers):
+        if getattr(handler, '_fake_review_handler', False):
+            logger.removeHandler(handler)
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter('%(message)s'))
+    handler._fake_review_handler = True
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+# Process-wide collection used by every stage of the package
+METRICS = Metrics()
+
+
+def span(stage: str, rows_in: Optional[int] = None, **fields: Any):
+    """Measure a stage in :data:`METRICS`; see :meth:`Metrics.span`."""
+    return METRICS.span(stage, rows_in, **fields)
+
+
+def record_iteration(learner: str, iteration: int, pseudo_labeled: int,
+                     fit_seconds: float, predict_seconds: float, **fields: Any) -> Dict[str, Any]:
+    """Record a self-training iteration in :data:`METRICS`."""
+    return METRICS.record_iteration(
+        learner, iteration, pseudo_labeled, fit_seconds, predict_seconds, **fields
+    )
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return the snapshot of :data:`METRICS`."""
+    return METRICS.snapshot()
+
+
+def write_snapshot(path: Union[str, Path]) -> None:
+    """Write the snapshot of :data:`METRICS`; see :meth:`Metrics.write_snapshot`."""
+    METRICS.write_snapshot(path)
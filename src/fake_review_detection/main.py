@@ -4,37 +4,108 @@ Main Script
 Entry point for running the fake review detection pipeline.
 """
 
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
+from pathlib import Path
 from time import time
+from typing import List, Optional
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.naive_bayes import GaussianNB
 
-from .data_loader import load_data
+from . import data_loader, data_processor, feature_engineer as feature_engineering, schema
+from .cache import Stage, StageCache, file_fingerprint
+from .data_loader import _resolve_db_path, load_data
 from .data_processor import DataProcessor
 from .feature_engineer import FeatureEngineer
+from .feature_matrix import export_features
+from .instrumentation import configure_logging, write_snapshot
 from .models import SemiSupervisedLearner
+from .orchestration import comparison_report, train_many
+from .schema import MemoryReport, compact_frame
+from .scoring import save_model
 from .utils import plot_confusion_matrix, under_sample
 
 
-def main():
+def pipeline_stages(
+    db_path: Path,
+    processor: DataProcessor,
+    feature_engineer: FeatureEngineer,
+    compact: bool = True
+) -> List[Stage]:
+    """
+    Build the cached load, clean and features stages.
+
+    Each stage's key covers the source of the modules it runs and the
+    settings chosen here (the load options, the stopword list and the
+    feature engineer's arguments), so changing either reruns it.
+
+    Args:
+        db_path: Path of the SQLite database.
+        processor: Processor used by the clean stage.
+        feature_engineer: Engineer used, and fitted, by the features stage.
+        compact: Convert tables to compact dtypes while loading them.
+
+    Returns:
+        Stages for :meth:`StageCache.run`.
+    """
+    return [
+        Stage(
+            'load',
+            lambda _: load_data(str(db_path), compact=compact),
+            code=(data_loader, schema),
+            config={'compact': compact}
+        ),
+        Stage(
+            'clean',
+            processor.clean,
+            code=(data_processor,),
+            config=processor.cache_config()
+        ),
+        Stage(
+            'features',
+            lambda df: compact_frame(feature_engineer.create_features(df)),
+            code=(feature_engineering, schema),
+            config=feature_engineer.cache_config(),
+            state=feature_engineer
+        ),
+    ]
+
+
+def main(argv: Optional[List[str]] = None):
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Fake review detection pipeline")
+    parser.add_argument('--export-features', metavar='DIR', default=None,
+                        help="Also write the balanced feature matrix to DIR, for "
+                             "load_features in other training runs")
+    args = parser.parse_args(argv)
     start_time = time()
+    configure_logging()
 
-    # Load data
-    df = load_data()
-
-    # Process data
+    # Load, clean and engineer features, reusing cached stages when the
+    # database and the code and settings of each stage are unchanged. Tables
+    # are converted to compact dtypes batch by batch as they are read,
+    # cleaning keeps those dtypes, and the new feature columns are narrowed;
+    # the memory use of every stage is reported.
     processor = DataProcessor()
-    df = processor.clean(df)
-
-    # Engineer features
     feature_engineer = FeatureEngineer()
-    df = feature_engineer.create_features(df)
+    db_path = _resolve_db_path()
+    cache = StageCache('data/processed/cache')
+    memory = MemoryReport()
+    df = cache.run(
+        file_fingerprint(db_path),
+        pipeline_stages(db_path, processor, feature_engineer),
+        on_output=memory.record
+    )
+    print(f"\nMemory by Stage\n{memory.to_frame().to_string(index=False)}")
 
     # Balance dataset
     df = under_sample(df)
 
+    # Optionally export the training matrix so other runs can memory-map it
+    if args.export_features is not None:
+        export_features(df, args.export_features)
+
     # Initialize models
     rf_model = RandomForestClassifier(
         random_state=42,
@@ -45,36 +116,29 @@ def main():
     )
     nb_model = GaussianNB()
 
-    # Train Random Forest
+    # Train both learners concurrently on shared features
     rf_learner = SemiSupervisedLearner(rf_model, algorithm_name='Random Forest')
-    rf_metrics = rf_learner.train(
-        df,
-        threshold=0.7,
-        iterations=15
-    )
-    plot_confusion_matrix(
-        rf_metrics['true_labels'],
-        rf_metrics['predictions'],
-        ['N', 'Y'],
-        'Random Forest Confusion Matrix'
-    )
-    plt.show()
-
-    # Train Naive Bayes
     nb_learner = SemiSupervisedLearner(nb_model, algorithm_name='Naive Bayes')
-    nb_metrics = nb_learner.train(
+    results = train_many(
         df,
+        [rf_learner, nb_learner],
         threshold=0.7,
         iterations=15
     )
-    plot_confusion_matrix(
-        nb_metrics['true_labels'],
-        nb_metrics['predictions'],
-        ['N', 'Y'],
-        'Naive Bayes Confusion Matrix'
-    )
-    plt.show()
+    print(f"\nModel Comparison\n{comparison_report(results).to_string()}")
+    save_model(rf_learner, feature_engineer, 'models/random_forest.pkl')
+
+    for name, metrics in results.items():
+        plot_confusion_matrix(
+            metrics['true_labels'],
+            metrics['predictions'],
+            ['N', 'Y'],
+            f'{name} Confusion Matrix'
+        )
+        plt.show()
 
+    # Per-stage spans and training iterations, for a local metrics scraper
+    write_snapshot('data/processed/metrics.json')
     print(f"\nTotal Time taken: {time() - start_time:.2f} seconds")
 
 
@@ -4,10 +4,13 @@ Machine Learning Models Module
 Implements semi-supervised learning algorithms for fake review detection.
 """
 
+import logging
 import pandas as pd
 import numpy as np
-from typing import Any, Dict
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
 from sklearn.model_selection import train_test_split
+from sklearn.utils import check_random_state
 from sklearn.metrics import (
     accuracy_score,
     precision_score,
@@ -15,7 +18,44 @@ from sklearn.metrics import (
     f1_score,
     confusion_matrix
 )
-from tqdm import tqdm
+
+from .instrumentation import record_iteration, span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DROP_COLUMNS = [
+    'reviewID', 'reviewerID', 'restaurantID', 'date',
+    'name', 'location', 'yelpJoinDate', 'flagged',
+    'reviewContent', 'restaurantRating'
+]
+
+
+def feature_arrays(
+    df: pd.DataFrame,
+    target_column: str = 'flagged',
+    drop_columns: Optional[List[str]] = None
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Split a feature dataframe into a float feature matrix and labels.
+
+    Args:
+        df: Dataframe with features and target.
+        target_column: Name of the target column.
+        drop_columns: Columns that are not features; defaults to
+                      ``DEFAULT_DROP_COLUMNS``.
+
+    Returns:
+        Tuple of (feature matrix, labels, feature names).
+    """
+    if drop_columns is None:
+        drop_columns = DEFAULT_DROP_COLUMNS
+
+    features = df.drop(
+        [col for col in drop_columns if col in df.columns],
+        axis=1,
+        errors='ignore'
+    )
+    return features.to_numpy(dtype=float), df[target_column].to_numpy(), list(features.columns)
 
 
 class SemiSupervisedLearner:
@@ -31,6 +71,11 @@ class SemiSupervisedLearner:
         """
         self.model = model
         self.algorithm_name = algorithm_name
+        self.feature_columns_ = None
+        self.stop_reason_ = None
+        self.iteration_times_ = []
+        self.iteration_metrics_ = []
+        self.validation_scores_ = []
 
     def train(
         self,
@@ -40,7 +85,8 @@ class SemiSupervisedLearner:
         threshold: float = 0.8,
         iterations: int = 40,
         random_state: int = 42,
-        drop_columns: list = None
+        drop_columns: list = None,
+        **kwargs: Any
     ) -> Dict[str, Any]:
         """
         Train the model using semi-supervised learning.
@@ -53,89 +99,312 @@ class SemiSupervisedLearner:
             iterations: Maximum number of iterations.
             random_state: Random state for reproducibility.
             drop_columns: Columns to drop before training.
+            **kwargs: Further options of ``train_arrays``, such as
+                      ``warm_start`` or the early stopping criteria.
 
         Returns:
             Dictionary containing evaluation metrics and predictions.
         """
-        print(f"Training {self.algorithm_name} Model")
-
-        if drop_columns is None:
-            drop_columns = [
-                'reviewID', 'reviewerID', 'restaurantID', 'date',
-                'name', 'location', 'yelpJoinDate', 'flagged',
-                'reviewContent', 'restaurantRating'
-            ]
-
-        labels = df[target_column].copy()
-        features = df.drop(
-            [col for col in drop_columns if col in df.columns],
-            axis=1,
-            errors='ignore'
+        X, y, feature_names = feature_arrays(df, target_column, drop_columns)
+        metrics = self.train_arrays(
+            X,
+            y,
+            feature_names=feature_names,
+            test_size=test_size,
+            threshold=threshold,
+            iterations=iterations,
+            random_state=random_state,
+            **kwargs
         )
+        metrics['true_labels'] = df[target_column].iloc[metrics['test_indices']]
+        return metrics
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            features, labels, test_size=test_size, random_state=random_state
-        )
+    def train_arrays(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        feature_names: Optional[List[str]] = None,
+        test_size: float = 0.25,
+        threshold: float = 0.8,
+        iterations: int = 40,
+        random_state: int = 42,
+        warm_start: bool = False,
+        trees_per_iteration: Optional[int] = None,
+        min_new_fraction: float = 0.0,
+        validation_fraction: Optional[float] = None,
+        patience: int = 3,
+        tol: float = 1e-4
+    ) -> Dict[str, Any]:
+        """
+        Train the model using semi-supervised learning on feature arrays.
+
+        The split rows are held in one preallocated matrix: the labeled rows
+        fill its front and confident pseudo-labeled rows are appended in
+        place, so each iteration fits on a view instead of a concatenated
+        copy. Predictions are the argmax of ``predict_proba``, so every
+        iteration runs a single inference pass over the unlabeled rows.
+
+        With ``warm_start``, only the first iteration fits the model from
+        scratch. Afterwards, averaging ensembles with a ``warm_start``
+        parameter (such as ``RandomForestClassifier``) replace their oldest
+        ``trees_per_iteration`` trees with trees fitted on the current
+        labeled set, so the forest always keeps ``n_estimators`` trees and
+        ``get_params()`` describes the fitted model. Models with
+        ``partial_fit`` (such as ``GaussianNB``) are updated with the newly
+        labeled rows only. Boosted ensembles cannot drop old stages and are
+        refitted from scratch.
+
+        Training stops early when an iteration labels no new rows, when it
+        labels less than ``min_new_fraction`` of the remaining unlabeled
+        rows, or, if ``validation_fraction`` is set, when F1 on rows held out
+        of the labeled set has not improved by more than ``tol`` for
+        ``patience`` iterations. The reason is kept in ``stop_reason_``, the
+        duration of each iteration in ``iteration_times_``, and the rows
+        pseudo-labeled and the fit and predict times of each iteration in
+        ``iteration_metrics_``; every iteration is also reported to
+        ``instrumentation.METRICS``.
+
+        Args:
+            X: Feature matrix, one row per review.
+            y: Labels aligned with ``X``.
+            feature_names: Names of the columns of ``X``, kept as
+                           ``feature_columns_`` for scoring.
+            test_size: Proportion of data to use for testing.
+            threshold: Confidence threshold for pseudo-labeling.
+            iterations: Maximum number of iterations.
+            random_state: Random state for reproducibility.
+            warm_start: Update the model incrementally after the first iteration.
+            trees_per_iteration: Trees replaced per iteration in warm-start
+                                 mode; defaults to a tenth of ``n_estimators``.
+            min_new_fraction: Stop when an iteration labels a smaller fraction
+                              of the remaining unlabeled rows.
+            validation_fraction: Fraction of the labeled rows held out to
+                                 detect a validation F1 plateau; None disables it.
+            patience: Iterations without validation improvement before stopping.
+            tol: Minimum F1 gain that counts as an improvement.
+
+        Returns:
+            Dictionary containing evaluation metrics, predictions and the
+            positions of the test rows in ``X``.
+        """
+        with span('train', rows_in=len(X), learner=self.algorithm_name) as stage:
+            params = self.model.get_params()
+            refreshes_ensemble = 'warm_start' in params and 'n_estimators' in params
+            if warm_start and not (refreshes_ensemble or hasattr(self.model, 'partial_fit')):
+                raise ValueError(
+                    f"{type(self.model).__name__} supports neither warm_start nor partial_fit"
+                )
+            if trees_per_iteration is None and refreshes_ensemble:
+                trees_per_iteration = max(1, params['n_estimators'] // 10)
+            if refreshes_ensemble:
+                trees_per_iteration = min(trees_per_iteration, params['n_estimators'])
+                # Fresh seeds for replacement trees; the forest's own seed
+                # sequence would repeat those of the trees it keeps
+                tree_seeds = check_random_state(params.get('random_state'))
+
+            if feature_names is None:
+                feature_names = [f'x{i}' for i in range(X.shape[1])]
+            self.feature_columns_ = list(feature_names)
+
+            # String labels as a fixed-width array: estimators sort the labels on
+            # every fit, which is far slower for Python objects
+            if y.dtype == object and all(isinstance(label, str) for label in y):
+                y = y.astype(str)
+
+            train_idx, test_idx = train_test_split(
+                np.arange(len(X)), test_size=test_size, random_state=random_state
+            )
+            X_test, y_test = X[test_idx], y[test_idx]
+            if validation_fraction:
+                train_idx, val_idx = train_test_split(
+                    train_idx, test_size=validation_fraction, random_state=random_state
+                )
+                X_val, y_val = X[val_idx], y[val_idx]
+
+            # Labeled rows occupy X_fit[:n_labeled], in the order they were added
+            X_fit = np.empty((len(train_idx) + len(test_idx), X.shape[1]), dtype=X.dtype)
+            y_fit = np.empty(len(X_fit), dtype=y.dtype)
+            n_labeled = len(train_idx)
+            X_fit[:n_labeled] = X[train_idx]
+            y_fit[:n_labeled] = y[train_idx]
+
+            # Test rows that have not been pseudo-labeled yet
+            labeled = np.zeros(len(test_idx), dtype=bool)
+            unlabeled = np.arange(len(test_idx))
+
+            # Semi-supervised learning loop
+            current_iteration = 0
+            n_fitted = 0
+            best_score = -np.inf
+            stale_iterations = 0
+            self.stop_reason_ = 'max_iterations'
+            self.iteration_times_ = []
+            self.iteration_metrics_ = []
+            self.validation_scores_ = []
+            from tqdm import tqdm
+            pbar = tqdm(total=iterations, desc=f"{self.algorithm_name} Training")
+
+            try:
+                if refreshes_ensemble and warm_start:
+                    self.model.set_params(warm_start=False)
+                while current_iteration < iterations:
+                    if not len(unlabeled):
+                        self.stop_reason_ = 'all_labeled'
+                        break
+                    current_iteration += 1
+                    iteration_start = perf_counter()
+                    n_unlabeled = len(unlabeled)
 
-        X_test_copy = X_test.copy()
-        y_test_copy = y_test.copy()
-
-        # Semi-supervised learning loop
-        current_iteration = 0
-        pbar = tqdm(total=iterations, desc=f"{self.algorithm_name} Training")
-
-        while not X_test.empty and current_iteration < iterations:
-            current_iteration += 1
-
-            # Train on current labeled data
-            self.model.fit(X_train, y_train)
-
-            # Get predictions and probabilities
-            probs = self.model.predict_proba(X_test)
-            preds = self.model.predict(X_test)
-
-            # Find confident predictions
-            max_probs = np.max(probs, axis=1)
-            confident_mask = max_probs > threshold
-            confident_indices = X_test.index[confident_mask].tolist()
-
-            # Add confident predictions to training set
-            if confident_indices:
-                X_train = pd.concat([X_train, X_test.loc[confident_indices]])
-                y_train = pd.concat([y_train, pd.Series(
-                    preds[confident_mask],
-                    index=confident_indices
-                )])
-
-                # Remove from test set
-                X_test = X_test.drop(confident_indices)
-                y_test = y_test.drop(confident_indices)
-
-            pbar.update(1)
-
-        pbar.close()
-
-        # Final evaluation
-        final_preds = self.model.predict(X_test_copy)
-
-        # Calculate metrics
-        metrics = {
-            'accuracy': accuracy_score(y_test_copy, final_preds),
-            'precision': precision_score(y_test_copy, final_preds, pos_label="Y", zero_division=0),
-            'recall': recall_score(y_test_copy, final_preds, pos_label="Y", zero_division=0),
-            'f1': f1_score(y_test_copy, final_preds, pos_label="Y", zero_division=0),
-            'confusion_matrix': confusion_matrix(y_test_copy, final_preds),
-            'predictions': final_preds,
-            'true_labels': y_test_copy
-        }
-
-        # Print results
-        print(f"\n{self.algorithm_name} Model Results")
-        print("--" * 20)
-        print(f'Accuracy Score: {metrics["accuracy"]:.4f}')
-        print(f'Precision Score: {metrics["precision"]:.4f}')
-        print(f'Recall Score: {metrics["recall"]:.4f}')
-        print(f'F1 Score: {metrics["f1"]:.4f}')
-        print(f'Confusion Matrix:\n{metrics["confusion_matrix"]}')
+                    # Train on current labeled data
+                    if not warm_start or current_iteration == 1:
+                        self.model.fit(X_fit[:n_labeled], y_fit[:n_labeled])
+                    elif refreshes_ensemble:
+                        if isinstance(self.model.estimators_, list):
+                            # Drop the oldest trees; warm start refills the forest
+                            del self.model.estimators_[:trees_per_iteration]
+                            if hasattr(self.model, 'estimators_features_'):
+                                del self.model.estimators_features_[:trees_per_iteration]
+                            self.model.set_params(warm_start=True)
+                            if 'random_state' in params:
+                                self.model.set_params(
+                                    random_state=tree_seeds.randint(np.iinfo(np.int32).max)
+                                )
+                        self.model.fit(X_fit[:n_labeled], y_fit[:n_labeled])
+                    else:
+                        self.model.partial_fit(
+                            X_fit[n_fitted:n_labeled], y_fit[n_fitted:n_labeled]
+                        )
+                    n_fitted = n_labeled
+                    fit_seconds = perf_counter() - iteration_start
 
+                    # Stop once validation F1 has plateaued
+                    if validation_fraction:
+                        score = f1_score(
+                            y_val, self.model.predict(X_val), pos_label="Y", zero_division=0
+                        )
+                        self.validation_scores_.append(score)
+                        if score > best_score + tol:
+                            best_score, stale_iterations = score, 0
+                        else:
+                            stale_iterations += 1
+                        if stale_iterations >= patience:
+                            self.stop_reason_ = 'validation_plateau'
+                            self._end_iteration(
+                                current_iteration, iteration_start, 0,
+                                fit_seconds, 0.0, n_unlabeled
+                            )
+                            pbar.update(1)
+                            break
+
+                    # Get probabilities; predictions are their argmax
+                    predict_start = perf_counter()
+                    probs = self.model.predict_proba(X_test[unlabeled])
+                    best = np.argmax(probs, axis=1)
+
+                    # Find confident predictions
+                    confident_mask = probs[np.arange(len(best)), best] > threshold
+                    confident = unlabeled[confident_mask]
+                    predict_seconds = perf_counter() - predict_start
+
+                    # Move confident predictions into the labeled set
+                    if len(confident):
+                        added = n_labeled + len(confident)
+                        X_fit[n_labeled:added] = X_test[confident]
+                        y_fit[n_labeled:added] = self.model.classes_[best[confident_mask]]
+                        n_labeled = added
+                        labeled[confident] = True
+
+                    self._end_iteration(
+                        current_iteration, iteration_start, len(confident),
+                        fit_seconds, predict_seconds, n_unlabeled
+                    )
+                    pbar.update(1)
+
+                    # Refitting on unchanged (or nearly unchanged) data is wasted work
+                    if not len(confident):
+                        self.stop_reason_ = 'no_new_labels'
+                        break
+                    if len(confident) / len(unlabeled) < min_new_fraction:
+                        self.stop_reason_ = 'min_new_fraction'
+                        break
+                    unlabeled = unlabeled[~confident_mask]
+            finally:
+                pbar.close()
+                # Restore the configured parameters; the fitted trees are kept
+                if refreshes_ensemble and warm_start:
+                    self.model.set_params(warm_start=params['warm_start'])
+                    if 'random_state' in params:
+                        self.model.set_params(random_state=params['random_state'])
+
+            # Final evaluation
+            final_preds = self.model.predict(X_test)
+
+            # Calculate metrics
+            metrics = {
+                'accuracy': accuracy_score(y_test, final_preds),
+                'precision': precision_score(
+                    y_test, final_preds, pos_label="Y", zero_division=0
+                ),
+                'recall': recall_score(y_test, final_preds, pos_label="Y", zero_division=0),
+                'f1': f1_score(y_test, final_preds, pos_label="Y", zero_division=0),
+                'confusion_matrix': confusion_matrix(y_test, final_preds),
+                'predictions': final_preds,
+                'true_labels': y_test,
+                'test_indices': test_idx,
+                'pseudo_labeled': int(labeled.sum()),
+                'iterations': current_iteration,
+                'stop_reason': self.stop_reason_,
+                'iteration_times': list(self.iteration_times_),
+                'iteration_metrics': list(self.iteration_metrics_)
+            }
+            # Rows in the final labeled set, including pseudo-labels
+            stage.rows_out = n_labeled
+
+        log_results(self, metrics)
         return metrics
+
+    def _end_iteration(
+        self,
+        iteration: int,
+        iteration_start: float,
+        pseudo_labeled: int,
+        fit_seconds: float,
+        predict_seconds: float,
+        unlabeled: int
+    ) -> None:
+        """Record the duration and metrics of a finished iteration."""
+        self.iteration_times_.append(perf_counter() - iteration_start)
+        self.iteration_metrics_.append(record_iteration(
+            self.algorithm_name,
+            iteration,
+            pseudo_labeled,
+            fit_seconds,
+            predict_seconds,
+            unlabeled=unlabeled
+        ))
+
+
+def log_results(learner: SemiSupervisedLearner, metrics: Dict[str, Any]) -> None:
+    """Log the evaluation metrics and stopping reason of a training run."""
+    logger.info(
+        "%s model results\n%s\n"
+        "Accuracy Score: %.4f\nPrecision Score: %.4f\nRecall Score: %.4f\nF1 Score: %.4f\n"
+        "Confusion Matrix:\n%s\nStopped after %d iterations (%s), %.2fs in the training loop",
+        learner.algorithm_name,
+        "--" * 20,
+        metrics['accuracy'],
+        metrics['precision'],
+        metrics['recall'],
+        metrics['f1'],
+        metrics['confusion_matrix'],
+        metrics['iterations'],
+        metrics['stop_reason'],
+        sum(learner.iteration_times_),
+        extra={'event': 'results', 'metrics': {
+            'learner': learner.algorithm_name,
+            **{key: metrics[key] for key in (
+                'accuracy', 'precision', 'recall', 'f1',
+                'pseudo_labeled', 'iterations', 'stop_reason'
+            )},
+        }}
+    )
@@ -0,0 +1,162 @@
+"""
+Orchestration Module
+
+Trains several semi-supervised learners concurrently on one shared feature
+matrix and compares their results.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .instrumentation import METRICS, span
+from .models import SemiSupervisedLearner, feature_arrays
+
+# (shared memory block name, shape, dtype string) of an array in shared memory
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+REPORT_COLUMNS = [
+    'accuracy', 'precision', 'recall', 'f1',
+    'iterations', 'stop_reason', 'pseudo_labeled', 'train_seconds'
+]
+
+
+def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, ArraySpec]:
+    """Copy an array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _train_shared(
+    learner: SemiSupervisedLearner,
+    X_spec: ArraySpec,
+    y_spec: ArraySpec,
+    feature_names: List[str],
+    train_kwargs: Dict[str, Any]
+) -> Tuple[SemiSupervisedLearner, Dict[str, Any]]:
+    """Train one learner in a worker on arrays attached from shared memory."""
+    blocks = []
+    arrays = []
+    for name, shape, dtype in (X_spec, y_spec):
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+    try:
+        return _train(learner, arrays[0], arrays[1], feature_names, train_kwargs)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _train(
+    learner: SemiSupervisedLearner,
+    X: np.ndarray,
+    y: np.ndarray,
+    feature_names: List[str],
+    train_kwargs: Dict[str, Any]
+) -> Tuple[SemiSupervisedLearner, Dict[str, Any]]:
+    """Train one learner and time it."""
+    start = perf_counter()
+    metrics = learner.train_arrays(X, y, feature_names=feature_names, **train_kwargs)
+    metrics['train_seconds'] = perf_counter() - start
+    return learner, metrics
+
+
+def train_many(
+    df: pd.DataFrame,
+    learners: Sequence[SemiSupervisedLearner],
+    target_column: str = 'flagged',
+    drop_columns: Optional[List[str]] = None,
+    n_jobs: Optional[int] = None,
+    **train_kwargs: Any
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Train several learners concurrently on the same features.
+
+    The feature matrix and labels are copied once into shared memory; each
+    worker process maps them instead of receiving its own pickled copy. The
+    trained models are copied back into ``learners``, so they can be saved
+    or used for scoring afterwards.
+
+    Args:
+        df: Dataframe with features and target.
+        learners: Learners to train; their ``algorithm_name`` must be unique.
+        target_column: Name of the target column.
+        drop_columns: Columns to drop before training.
+        n_jobs: Number of worker processes; defaults to one per learner,
+                capped at the CPU count. 1 trains in the calling process.
+        **train_kwargs: Options passed to every ``train_arrays`` call, such as
+                        ``threshold`` or ``iterations``.
+
+    Returns:
+        Metrics of each learner, keyed by algorithm name.
+    """
+    names = [learner.algorithm_name for learner in learners]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Learner algorithm names must be unique: {names}")
+
+    X, y, feature_names = feature_arrays(df, target_column, drop_columns)
+    if y.dtype == object and all(isinstance(label, str) for label in y):
+        y = y.astype(str)
+    if n_jobs is None:
+        n_jobs = min(len(learners), os.cpu_count() or 1)
+
+    with span('train_many', rows_in=len(X), learners=names, n_jobs=n_jobs):
+        if n_jobs == 1 or y.dtype == object:
+            results = [
+                _train(learner, X, y, feature_names, train_kwargs) for learner in learners
+            ]
+        else:
+            blocks = []
+            try:
+                X_block, X_spec = _share(X)
+                blocks.append(X_block)
+                y_block, y_spec = _share(y)
+                blocks.append(y_block)
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    futures = [
+                        executor.submit(
+                            _train_shared, learner, X_spec, y_spec, feature_names, train_kwargs
+                        )
+                        for learner in learners
+                    ]
+                    results = [future.result() for future in futures]
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+            # Iterations were recorded in the workers' copies of the metrics
+            for _, metrics in results:
+                METRICS.add_iterations(metrics.get('iteration_metrics', []))
+
+    all_metrics = {}
+    for learner, (trained, metrics) in zip(learners, results):
+        learner.__dict__.update(trained.__dict__)
+        metrics['true_labels'] = df[target_column].iloc[metrics['test_indices']]
+        all_metrics[learner.algorithm_name] = metrics
+    return all_metrics
+
+
+def comparison_report(results: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Summarize the results of :func:`train_many` side by side.
+
+    Args:
+        results: Metrics keyed by algorithm name.
+
+    Returns:
+        Dataframe with one row per learner, sorted by F1 (best first).
+    """
+    report = pd.DataFrame.from_dict(
+        {name: {column: metrics.get(column) for column in REPORT_COLUMNS}
+         for name, metrics in results.items()},
+        orient='index'
+    )
+    report.index.name = 'algorithm'
+    return report.sort_values('f1', ascending=False)
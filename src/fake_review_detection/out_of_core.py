@@ -0,0 +1,315 @@
+"""
+Out-of-Core Module
+
+Trains semi-supervised learners on feature chunks streamed from disk, so
+memory use stays flat as the corpus grows past RAM.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .feature_matrix import MANIFEST_FILE, export_features, load_feature_keys, load_features
+from .instrumentation import span
+from .models import SemiSupervisedLearner, log_results
+from .resampling import hash_fraction
+
+PART_PREFIX = 'part-'
+
+# Row roles in the split, stored as one byte per row
+_DROPPED, _TRAIN, _TEST = 0, 1, 2
+
+
+def class_sampling_rates(
+    counts: Dict[Any, int],
+    ratio: Optional[float] = 1.0
+) -> Dict[Any, float]:
+    """
+    Per-class keep rates for under-sampling to the minority class.
+
+    Args:
+        counts: Number of rows per class.
+        ratio: Rows kept per class relative to the minority class; 1.0
+               balances the classes and None keeps every row.
+
+    Returns:
+        Keep probability per class.
+    """
+    if ratio is None or not counts:
+        return {label: 1.0 for label in counts}
+    minority = min(counts.values())
+    return {label: min(1.0, ratio * minority / count) for label, count in counts.items()}
+
+
+def export_feature_chunks(
+    frames: Iterable[pd.DataFrame],
+    directory: Union[str, Path],
+    target_column: str = 'flagged',
+    drop_columns: Optional[List[str]] = None
+) -> int:
+    """
+    Export featurized frames as numbered part bundles.
+
+    Parts are appended after any that already exist, so new data can be
+    added without rewriting old parts.
+
+    Args:
+        frames: Featurized frames, e.g. from ``FeatureStore.create_features``
+                applied to ``data_loader.stream_data`` batches.
+        directory: Directory holding the part bundles.
+        target_column: Name of the target column.
+        drop_columns: Columns that are not features.
+
+    Returns:
+        Number of parts written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = len(list(directory.glob(f'{PART_PREFIX}*')))
+    written = 0
+    for df in frames:
+        if df.empty:
+            continue
+        export_features(
+            df, directory / f'{PART_PREFIX}{existing + written:05d}', target_column, drop_columns
+        )
+        written += 1
+    return written
+
+
+class FeatureChunks:
+    """Re-iterable stream of ``(X, y, keys)`` chunks from feature bundles on disk."""
+
+    def __init__(self, directory: Union[str, Path], chunk_size: int = 100000):
+        """
+        Open a feature bundle or a directory of part bundles.
+
+        Args:
+            directory: Bundle from ``feature_matrix.export_features`` or
+                       directory from :func:`export_feature_chunks`.
+            chunk_size: Maximum number of rows per chunk.
+        """
+        directory = Path(directory)
+        if (directory / MANIFEST_FILE).exists():
+            self.parts = [directory]
+        else:
+            self.parts = sorted(directory.glob(f'{PART_PREFIX}*'))
+        if not self.parts:
+            raise FileNotFoundError(f"No feature bundles found in {directory}")
+        self.chunk_size = chunk_size
+
+        manifests = []
+        for part in self.parts:
+            with open(part / MANIFEST_FILE) as f:
+                manifests.append(json.load(f))
+        self.feature_names = manifests[0]['feature_columns']
+        if any(m['feature_columns'] != self.feature_names for m in manifests):
+            raise ValueError(f"Feature bundles in {directory} have different columns")
+        self.n_rows = sum(m['rows'] for m in manifests)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+        """Yield memory-mapped slices of each part in order."""
+        for part in self.parts:
+            X, y, _ = load_features(part)
+            keys = load_feature_keys(part)
+            for start in range(0, len(y), self.chunk_size):
+                stop = start + self.chunk_size
+                yield X[start:stop], y[start:stop], None if keys is None else keys[start:stop]
+
+
+def _metrics_from_confusion(
+    matrix: np.ndarray,
+    classes: np.ndarray,
+    pos_label: Any
+) -> Dict[str, float]:
+    """Accuracy, precision, recall and F1 (zero when undefined) from a confusion matrix."""
+    total = matrix.sum()
+    metrics = {'accuracy': matrix.trace() / total if total else 0.0}
+    hits = np.flatnonzero(classes == pos_label)
+    tp = matrix[hits[0], hits[0]] if len(hits) else 0
+    predicted = matrix[:, hits[0]].sum() if len(hits) else 0
+    actual = matrix[hits[0], :].sum() if len(hits) else 0
+    precision = tp / predicted if predicted else 0.0
+    recall = tp / actual if actual else 0.0
+    metrics['precision'] = precision
+    metrics['recall'] = recall
+    metrics['f1'] = (
+        2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    )
+    return metrics
+
+
+def train_out_of_core(
+    learner: SemiSupervisedLearner,
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]],
+    test_size: float = 0.25,
+    threshold: float = 0.8,
+    iterations: int = 40,
+    sampling_ratio: Optional[float] = 1.0,
+    random_state: int = 42,
+    min_new_fraction: float = 0.0,
+    pos_label: Any = 'Y'
+) -> Dict[str, Any]:
+    """
+    Self-train an incremental learner on streamed feature chunks.
+
+    The counterpart of ``SemiSupervisedLearner.train_arrays`` for data that
+    does not fit in memory. Rows are under-sampled per class and split into
+    train and test sets by hashing their keys (row positions when a chunk
+    has no keys), so no index arrays or frames are materialized. The model
+    is fitted with ``partial_fit``: first on the labeled training rows, then
+    in each iteration on the rows pseudo-labeled in the previous one, as in
+    warm-start training. Besides the current chunk, memory holds four bytes
+    of state per row (split role, pseudo-label and the iteration it was
+    assigned in).
+
+    Args:
+        learner: Learner whose model supports ``partial_fit`` and
+                 ``predict_proba`` (e.g. ``GaussianNB`` or
+                 ``SGDClassifier(loss='log_loss')``).
+        chunks: Re-iterable source of ``(X, y, keys)`` chunks, such as
+                :class:`FeatureChunks`; it is read several times per
+                iteration and must yield the same rows in the same order.
+        test_size: Fraction of the sampled rows used as the unlabeled pool
+                   and for evaluation.
+        threshold: Confidence threshold for pseudo-labeling.
+        iterations: Maximum number of iterations.
+        sampling_ratio: Rows kept per class relative to the minority class;
+                        None disables under-sampling.
+        random_state: Salt of the sampling and split hashes.
+        min_new_fraction: Stop when an iteration labels a smaller fraction
+                          of the remaining unlabeled rows.
+        pos_label: Label of the fake class for precision, recall and F1.
+
+    Returns:
+        Dictionary of evaluation metrics on the test rows, the confusion
+        matrix and training statistics.
+    """
+    model = learner.model
+    if not hasattr(model, 'partial_fit'):
+        raise ValueError(f"{type(model).__name__} does not support partial_fit")
+    learner.feature_columns_ = list(getattr(chunks, 'feature_names', None) or [])
+
+    def rows():
+        """Yield chunks with their global row positions."""
+        offset = 0
+        for X, y, keys in chunks:
+            positions = np.arange(offset, offset + len(y))
+            offset += len(y)
+            yield X, y, positions, positions if keys is None else keys
+
+    with span('train', learner=learner.algorithm_name, out_of_core=True) as stage:
+        # Pass 0: class counts decide the per-class sampling rates
+        counts: Dict[Any, int] = {}
+        n_rows = 0
+        for _, y, _, _ in rows():
+            labels, label_counts = np.unique(y, return_counts=True)
+            for label, count in zip(labels.tolist(), label_counts.tolist()):
+                counts[label] = counts.get(label, 0) + count
+            n_rows += len(y)
+        classes = np.array(sorted(counts))
+        rates = class_sampling_rates(counts, sampling_ratio)
+        class_rates = np.array([rates[label] for label in classes.tolist()])
+
+        roles = np.zeros(n_rows, dtype=np.int8)
+        pseudo = np.full(n_rows, -1, dtype=np.int8)
+        assigned = np.zeros(n_rows, dtype=np.int16)
+
+        current_iteration = 0
+        n_unlabeled = 0
+        learner.stop_reason_ = 'max_iterations'
+        learner.iteration_times_ = []
+        learner.iteration_metrics_ = []
+        learner.validation_scores_ = []
+        from tqdm import tqdm
+        pbar = tqdm(total=iterations, desc=f"{learner.algorithm_name} Training")
+
+        try:
+            while current_iteration < iterations:
+                if current_iteration and not n_unlabeled:
+                    learner.stop_reason_ = 'all_labeled'
+                    break
+                current_iteration += 1
+                iteration_start = perf_counter()
+
+                # Fit on the labeled rows (first iteration) or the new pseudo-labels
+                for X, y, positions, keys in rows():
+                    if current_iteration == 1:
+                        codes = np.searchsorted(classes, y)
+                        sampled = hash_fraction(keys, random_state) < class_rates[codes]
+                        test = hash_fraction(keys, random_state + 1) < test_size
+                        chunk_roles = np.where(sampled, np.where(test, _TEST, _TRAIN), _DROPPED)
+                        roles[positions] = chunk_roles
+                        n_unlabeled += int((chunk_roles == _TEST).sum())
+                        selected = chunk_roles == _TRAIN
+                        targets = y[selected]
+                    else:
+                        selected = assigned[positions] == current_iteration - 1
+                        targets = classes[pseudo[positions][selected]]
+                    if selected.any():
+                        model.partial_fit(np.asarray(X[selected]), targets, classes=classes)
+
+                # Pseudo-label confident predictions on the unlabeled test rows
+                fit_seconds = perf_counter() - iteration_start
+                predict_start = perf_counter()
+                remaining = n_unlabeled
+                n_new = 0
+                for X, _, positions, _ in rows():
+                    selected = (roles[positions] == _TEST) & (pseudo[positions] == -1)
+                    if not selected.any():
+                        continue
+                    probs = model.predict_proba(np.asarray(X[selected]))
+                    best = np.argmax(probs, axis=1)
+                    confident = probs[np.arange(len(best)), best] > threshold
+                    new_rows = positions[selected][confident]
+                    pseudo[new_rows] = best[confident]
+                    assigned[new_rows] = current_iteration
+                    n_new += len(new_rows)
+
+                learner._end_iteration(
+                    current_iteration, iteration_start, n_new,
+                    fit_seconds, perf_counter() - predict_start, remaining
+                )
+                pbar.update(1)
+
+                if not n_new:
+                    learner.stop_reason_ = 'no_new_labels'
+                    break
+                if n_unlabeled and n_new / n_unlabeled < min_new_fraction:
+                    learner.stop_reason_ = 'min_new_fraction'
+                    break
+                n_unlabeled -= n_new
+        finally:
+            pbar.close()
+
+        # Final evaluation on every sampled test row
+        matrix = np.zeros((len(classes), len(classes)), dtype=np.int64)
+        for X, y, positions, _ in rows():
+            selected = roles[positions] == _TEST
+            if selected.any():
+                predictions = model.predict(np.asarray(X[selected]))
+                np.add.at(
+                    matrix,
+                    (np.searchsorted(classes, y[selected]), np.searchsorted(classes, predictions)),
+                    1
+                )
+
+        metrics = _metrics_from_confusion(matrix, classes, pos_label)
+        metrics.update({
+            'confusion_matrix': matrix,
+            'sampled_rows': int((roles != _DROPPED).sum()),
+            'test_rows': int(matrix.sum()),
+            'pseudo_labeled': int((pseudo >= 0).sum()),
+            'iterations': current_iteration,
+            'stop_reason': learner.stop_reason_,
+            'iteration_times': list(learner.iteration_times_),
+            'iteration_metrics': list(learner.iteration_metrics_),
+        })
+        stage.rows_in = n_rows
+        stage.rows_out = metrics['sampled_rows']
+
+    log_results(learner, metrics)
+    return metrics
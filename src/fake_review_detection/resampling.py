@@ -0,0 +1,182 @@
+"""
+Resampling Module
+
+Class re-balancing by under-sampling, computed on label codes with NumPy
+so the frame itself is copied only once, when the sampled rows are taken.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, List, Optional, Union
+
+from .feature_engineer import _mix64
+from .instrumentation import span
+
+SAMPLING_METHODS = ('random', 'hash')
+
+
+def hash_fraction(keys: np.ndarray, salt: int = 0) -> np.ndarray:
+    """
+    Map row keys to deterministic pseudo-random numbers in [0, 1).
+
+    A row's value depends only on its key and ``salt``, so sampling by
+    thresholding it keeps the same rows no matter how the data is chunked
+    or how much data is added later.
+
+    Args:
+        keys: Row keys, e.g. review IDs or row positions.
+        salt: Seed; different salts give independent values.
+
+    Returns:
+        Float array aligned with ``keys``.
+    """
+    keys = np.asarray(keys)
+    if keys.dtype.kind in 'US':
+        keys = keys.astype(object)
+    hashed = pd.util.hash_array(keys, categorize=False)
+    # Offset the salt by the SplitMix64 increment so no key maps to zero
+    seed = _mix64(np.array([salt], dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15))
+    mixed = _mix64(hashed ^ seed)
+    return (mixed >> np.uint64(11)).astype(np.float64) / float(2 ** 53)
+
+
+def sample_indices(
+    labels: Union[pd.Series, np.ndarray],
+    ratio: float = 1.0,
+    reference_label: Any = None,
+    method: str = 'random',
+    keys: Optional[np.ndarray] = None,
+    strata: Optional[np.ndarray] = None,
+    random_state: int = 42,
+    shuffle: bool = True
+) -> np.ndarray:
+    """
+    Choose the row positions of an under-sampled dataset.
+
+    Every row of the reference class is kept, and every other class is
+    reduced to ``ratio`` times the reference count (classes that are
+    already smaller are kept whole). Rows with a missing label are dropped.
+
+    Args:
+        labels: Class label of each row.
+        ratio: Rows kept per other class for each reference row.
+        reference_label: Class whose count sets the sample sizes; defaults
+                         to the smallest class.
+        method: ``'random'`` draws exact sample sizes with
+                ``np.random.RandomState(random_state)``. ``'hash'`` keeps
+                rows whose :func:`hash_fraction` of ``keys`` is below the
+                class's sampling rate. Sizes are approximate, but as data
+                is added a row only leaves or joins the sample when the
+                rate moves past its hash, so earlier samples stay nested.
+        keys: Stable row identifiers, required by the ``'hash'`` method.
+        strata: Integer group code of each row (e.g. a restaurant); classes
+                are then balanced within each group, and groups without
+                reference rows are dropped.
+        random_state: Seed of the random draws and of the hash.
+        shuffle: Return positions in random order instead of grouped by
+                 class (``'random'``) or ascending (``'hash'`` or strata).
+
+    Returns:
+        Integer positions of the sampled rows.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"method must be one of {SAMPLING_METHODS}, got {method!r}")
+    if method == 'hash' and keys is None:
+        raise ValueError("The 'hash' method requires row keys")
+
+    codes, classes = pd.factorize(labels, sort=True)
+    n_classes = len(classes)
+    groups = np.zeros(len(codes), dtype=np.int64) if strata is None else np.asarray(strata)
+    n_groups = int(groups.max()) + 1 if len(groups) else 0
+    valid = codes >= 0
+    cells = np.where(valid, groups * n_classes + codes, 0)
+    counts = np.bincount(
+        cells[valid], minlength=n_groups * n_classes
+    ).reshape(n_groups, n_classes)
+
+    if reference_label is None:
+        reference = int(np.argmin(counts.sum(axis=0))) if n_classes else -1
+    else:
+        reference = pd.Index(classes).get_indexer([reference_label])[0]
+    reference_counts = counts[:, reference] if reference >= 0 else np.zeros(n_groups, np.int64)
+    targets = np.minimum(counts, np.rint(ratio * reference_counts).astype(np.int64)[:, None])
+    if reference >= 0:
+        targets[:, reference] = counts[:, reference]
+
+    rng = np.random.RandomState(random_state)
+    if method == 'hash':
+        rates = (targets / np.maximum(counts, 1)).ravel()
+        keep = valid & (
+            (codes == reference) | (hash_fraction(keys, random_state) < rates[cells])
+        )
+        selected = np.flatnonzero(keep)
+    elif strata is None:
+        # Class by class, matching DataFrame.sample on each class's rows
+        positions = np.flatnonzero(valid)
+        by_class = np.split(
+            positions[np.argsort(codes[positions], kind='stable')],
+            np.cumsum(counts[0])[:-1]
+        ) if n_groups else []
+        selected = np.concatenate([
+            members if code == reference
+            else members[rng.choice(len(members), targets[0, code], replace=False)]
+            for code, members in enumerate(by_class)
+        ] or [np.array([], dtype=np.int64)])
+    else:
+        # Rank rows randomly within each (group, class) cell and keep the first rows
+        positions = np.flatnonzero(valid)
+        order = positions[np.lexsort((rng.random_sample(len(positions)), cells[positions]))]
+        starts = np.concatenate([[0], np.cumsum(counts.ravel())[:-1]])
+        ranks = np.arange(len(order)) - starts[cells[order]]
+        selected = np.sort(order[ranks < targets.ravel()[cells[order]]])
+
+    if shuffle:
+        selected = selected[np.random.RandomState(random_state).permutation(len(selected))]
+    return selected
+
+
+def resample(
+    df: pd.DataFrame,
+    target_column: str = 'flagged',
+    ratio: float = 1.0,
+    reference_label: Any = None,
+    method: str = 'random',
+    key_column: str = 'reviewID',
+    stratify: Optional[Union[str, List[str]]] = None,
+    random_state: int = 42,
+    shuffle: bool = True
+) -> pd.DataFrame:
+    """
+    Under-sample a dataframe to re-balance its classes.
+
+    Args:
+        df: Dataframe to resample; it is not modified.
+        target_column: Name of the label column.
+        ratio: Rows kept per other class for each reference row, e.g. 2.0
+               keeps two authentic reviews per fake one.
+        reference_label: Class kept whole; defaults to the smallest class.
+        method: ``'random'`` or ``'hash'`` (see :func:`sample_indices`).
+        key_column: Column of stable row identifiers for the ``'hash'``
+                    method; the index is used if the column is missing.
+        stratify: Column(s) to balance within, e.g. ``'restaurantID'`` or
+                  ``['restaurantID', 'date']``.
+        random_state: Seed for reproducibility.
+        shuffle: Shuffle the sampled rows.
+
+    Returns:
+        Sampled dataframe.
+    """
+    with span('resample', rows_in=len(df), method=method) as stage:
+        keys = None
+        if method == 'hash':
+            keys = df[key_column].to_numpy() if key_column in df.columns else df.index.to_numpy()
+        strata = None
+        if stratify is not None:
+            strata = df.groupby(
+                stratify, sort=False, observed=True, dropna=False
+            ).ngroup().to_numpy()
+        positions = sample_indices(
+            df[target_column], ratio, reference_label, method, keys, strata, random_state, shuffle
+        )
+        stage.rows_out = len(positions)
+    return df.take(positions)
@@ -0,0 +1,175 @@
+"""
+Schema Module
+
+Memory-optimized column types for review frames and per-stage memory
+reporting.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from typing import Iterable, List
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ['reviewContent']
+
+# Object columns with fewer distinct values than this fraction of their
+# rows (reviewer, restaurant and date columns) become categoricals
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+
+def _compact_integers(series: pd.Series) -> pd.Series:
+    """Use int16 or int32 when every value fits.
+
+    int8 is skipped so that small arithmetic on the result (such as rating
+    differences) keeps some headroom.
+    """
+    if series.empty:
+        return series
+    low, high = series.min(), series.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def _compact_floats(series: pd.Series, float32: bool) -> pd.Series:
+    """Use float32 when it represents every value exactly (or when forced)."""
+    narrow = series.astype(np.float32)
+    if float32 or np.array_equal(
+        narrow.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True
+    ):
+        return narrow
+    return series
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    text_columns: Iterable[str] = TEXT_COLUMNS,
+    float32: bool = False
+) -> pd.DataFrame:
+    """
+    Convert a frame to memory-efficient column types.
+
+    - Repetitive string columns (``reviewerID``, ``restaurantID``, ``date``,
+      ``flagged``, ...) become categoricals.
+    - Review text and other mostly-unique string columns (``reviewID``) use
+      pyarrow-backed strings when pyarrow is installed.
+    - Integer columns are narrowed to int16/int32 when their range allows.
+    - Float columns become float32 when that is lossless, or always if
+      ``float32`` is set.
+
+    Args:
+        df: Frame to convert; it is not modified.
+        text_columns: Free-text columns, never made categorical.
+        float32: Downcast every float column, accepting rounding.
+
+    Returns:
+        Frame with the same values in compact dtypes.
+    """
+    text_columns = set(text_columns)
+    columns = {}
+    for name, series in df.items():
+        kind = series.dtype.kind
+        if kind in 'iu':
+            series = _compact_integers(series)
+        elif kind == 'f':
+            series = _compact_floats(series, float32)
+        elif kind == 'O':
+            is_text = name in text_columns
+            if not is_text and series.nunique() <= CATEGORICAL_MAX_UNIQUE_RATIO * len(series):
+                series = series.astype('category')
+            elif HAS_PYARROW and pd.api.types.infer_dtype(series) in ('string', 'empty'):
+                series = series.astype(pd.StringDtype('pyarrow'))
+        columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def concat_frames(frames: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    """
+    Concatenate compact frames without losing their categoricals.
+
+    ``pd.concat`` falls back to object dtype when categoricals have different
+    categories (as separately compacted batches do), so a column that is
+    categorical in any frame is combined with ``union_categoricals`` instead.
+
+    Args:
+        frames: Frames with the same columns, e.g. compacted batches.
+        columns: Column order, used when ``frames`` is empty.
+
+    Returns:
+        One frame with a fresh RangeIndex.
+    """
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    categorical = [
+        name for name in frames[0].columns
+        if any(isinstance(df[name].dtype, pd.CategoricalDtype) for df in frames)
+    ]
+    df = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for name in categorical:
+        df[name] = union_categoricals([_object_categories(frame[name]) for frame in frames])
+    return df[list(frames[0].columns)]
+
+
+def _object_categories(series: pd.Series) -> pd.Categorical:
+    """Categorical of ``series`` with object categories, as union_categoricals
+    needs every part's categories to share a dtype (plain vs pyarrow strings)."""
+    values = series.array if isinstance(series.dtype, pd.CategoricalDtype) else pd.Categorical(
+        series.to_numpy(dtype=object)
+    )
+    return values.rename_categories(pd.Index(values.categories, dtype=object))
+
+
+def frame_memory(df: pd.DataFrame) -> int:
+    """Total memory of a frame in bytes, including string contents."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class MemoryReport:
+    """Records the memory footprint of each pipeline stage's output."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.rows: List[dict] = []
+
+    def record(self, stage: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Measure a stage's output frame.
+
+        Args:
+            stage: Stage name.
+            df: Frame produced by the stage.
+
+        Returns:
+            ``df``, unchanged, so the call can wrap a stage.
+        """
+        memory = frame_memory(df)
+        self.rows.append({
+            'stage': stage,
+            'rows': len(df),
+            'columns': df.shape[1],
+            'memory_mb': memory / 1024 ** 2,
+            'bytes_per_row': memory / max(len(df), 1),
+        })
+        logger.info(
+            "Memory after %s: %.1f MB for %s rows", stage, memory / 1024 ** 2, f'{len(df):,}'
+        )
+        return df
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the recorded measurements, one row per stage."""
+        return pd.DataFrame(
+            self.rows, columns=['stage', 'rows', 'columns', 'memory_mb', 'bytes_per_row']
+        )
@@ -0,0 +1,213 @@
+"""
+Scoring Module
+
+Persists trained models and scores new reviews without retraining.
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .compiled_forest import compile_forest
+from .data_processor import DataProcessor
+from .feature_engineer import FeatureEngineer
+from .feature_store import FeatureStore
+from .instrumentation import span
+from .models import SemiSupervisedLearner
+
+MODEL_FORMAT_VERSION = 1
+
+
+def save_model(
+    learner: SemiSupervisedLearner,
+    feature_engineer: FeatureEngineer,
+    path: Union[str, Path],
+    positive_label: str = 'Y'
+) -> Path:
+    """
+    Save a trained learner together with everything needed to score.
+
+    The bundle holds the fitted estimator, the feature column order used in
+    training, the MNR normalization constant and the fitted TF-IDF
+    vectorizer used for content similarity.
+
+    Args:
+        learner: Learner after ``train``.
+        feature_engineer: Feature engineer that produced the training features.
+        path: Output file.
+        positive_label: Label of the fake class.
+
+    Returns:
+        Path the model was written to.
+    """
+    if learner.feature_columns_ is None:
+        raise ValueError("The learner has not been trained yet")
+
+    bundle = {
+        'format_version': MODEL_FORMAT_VERSION,
+        'algorithm_name': learner.algorithm_name,
+        'estimator': learner.model,
+        'feature_columns': list(learner.feature_columns_),
+        'mnr_max': feature_engineer.mnr_max_,
+        'vectorizer': feature_engineer.vectorizer,
+        'positive_label': positive_label,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+class ScoringModel:
+    """Scores small batches of raw reviews with a persisted model."""
+
+    def __init__(
+        self,
+        bundle: Dict[str, Any],
+        store: Optional[FeatureStore] = None,
+        compiled: bool = False
+    ):
+        """
+        Initialize the scoring model.
+
+        Args:
+            bundle: Model bundle as written by :func:`save_model`.
+            store: Feature store with reviewer history. If None, per-reviewer
+                   features are computed from each scored group alone.
+            compiled: Replace a tree ensemble (such as the random forest) with
+                      its :class:`~.compiled_forest.CompiledForest`, which
+                      scores small batches much faster and uses less memory.
+        """
+        if bundle.get('format_version') != MODEL_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model format version: {bundle.get('format_version')}"
+            )
+        if compiled:
+            # Drop the scikit-learn estimator so only the packed arrays stay loaded
+            bundle = {**bundle, 'estimator': compile_forest(bundle['estimator'])}
+        self.bundle = bundle
+        self.estimator = bundle['estimator']
+        self.feature_columns = bundle['feature_columns']
+        self.store = store
+        self.processor = DataProcessor()
+        self.positive_index = list(self.estimator.classes_).index(bundle['positive_label'])
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        store_path: Optional[Union[str, Path]] = None,
+        compiled: bool = False
+    ) -> 'ScoringModel':
+        """
+        Load a model saved with :func:`save_model`.
+
+        Args:
+            path: Model file.
+            store_path: Optional feature store to read reviewer history from.
+                        It is opened with the model's vectorizer.
+            compiled: Score with the compiled form of a tree ensemble.
+
+        Returns:
+            Ready-to-use scoring model.
+        """
+        with open(path, 'rb') as f:
+            bundle = pickle.load(f)
+        store = None
+        if store_path is not None:
+            store = FeatureStore(store_path, vectorizer=bundle['vectorizer'])
+        return cls(bundle, store, compiled=compiled)
+
+    def featurize(self, reviews: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean reviews and compute the model's feature matrix.
+
+        Args:
+            reviews: Raw reviews with the columns used at training time.
+
+        Returns:
+            Feature frame in training column order, indexed like ``reviews``;
+            rows that could not be featurized are dropped.
+        """
+        df = self.processor.clean(reviews)
+        if self.store is not None:
+            df = self.store.preview(df, mnr_reference_max=self.bundle['mnr_max'])
+        else:
+            engineer = FeatureEngineer(
+                mnr_reference_max=self.bundle['mnr_max'],
+                vectorizer=self.bundle['vectorizer']
+            )
+            df = engineer.create_features(df)
+
+        missing = [column for column in self.feature_columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Reviews are missing feature columns: {missing}")
+        return df[self.feature_columns]
+
+    def score(
+        self,
+        reviews: Union[pd.DataFrame, Iterable[Dict[str, Any]]]
+    ) -> np.ndarray:
+        """
+        Return the probability that each review is fake.
+
+        Args:
+            reviews: Dataframe or iterable of review records.
+
+        Returns:
+            Array of probabilities aligned with the input; NaN for reviews
+            that could not be featurized.
+        """
+        return self.score_many([reviews])[0]
+
+    def score_many(
+        self,
+        groups: Iterable[Union[pd.DataFrame, Iterable[Dict[str, Any]]]]
+    ) -> List[np.ndarray]:
+        """
+        Score independent groups of reviews with one model call.
+
+        Each group is featurized on its own, so per-reviewer features such as
+        MNR and content similarity only see reviews of the same group (or the
+        feature store); the feature rows of all groups are then stacked and
+        passed to ``predict_proba`` once.
+
+        Args:
+            groups: Dataframes or iterables of review records, e.g. the
+                    reviews of several concurrent requests.
+
+        Returns:
+            One array of probabilities per group, aligned with it; NaN for
+            reviews that could not be featurized.
+        """
+        # Rows are matched to their scores by position, so the caller's index
+        # may contain duplicates (as after ``pd.concat``)
+        frames = [
+            reviews.reset_index(drop=True) if isinstance(reviews, pd.DataFrame)
+            else pd.DataFrame.from_records(list(reviews))
+            for reviews in groups
+        ]
+        with span('score', rows_in=sum(len(df) for df in frames), groups=len(frames)) as stage:
+            features = [self.featurize(df) for df in frames]
+
+            scores = np.empty(0)
+            if any(len(f) for f in features):
+                X = pd.concat([f for f in features if len(f)]).astype(float)
+                if not hasattr(self.estimator, 'feature_names_in_'):
+                    X = X.to_numpy()
+                scores = self.estimator.predict_proba(X)[:, self.positive_index]
+
+            results = []
+            offset = 0
+            for df, group_features in zip(frames, features):
+                probabilities = np.full(len(df), np.nan)
+                probabilities[group_features.index.to_numpy()] = (
+                    scores[offset:offset + len(group_features)]
+                )
+                offset += len(group_features)
+                results.append(probabilities)
+            stage.rows_out = offset
+        return results
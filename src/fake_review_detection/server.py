@@ -0,0 +1,515 @@
+"""
+Scoring Server Module
+
+Small asyncio HTTP service that scores reviews with a persisted model,
+gathering concurrent requests into micro-batches.
+
+Usage:
+    python -m src.fake_review_detection.server --model models/random_forest.pkl
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .instrumentation import METRICS, configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Scores the records of several requests, one list of probabilities per request
+ScoreFunction = Callable[[List[List[Dict[str, Any]]]], Sequence[Sequence[float]]]
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+# Largest request body accepted by default (bytes)
+MAX_BODY_BYTES = 1024 ** 2
+
+
+class RequestError(Exception):
+    """A request that cannot be read, answered with ``status`` before closing."""
+
+    def __init__(self, status: int, message: str):
+        """
+        Initialize the error.
+
+        Args:
+            status: HTTP status code of the response.
+            message: Error message returned to the client.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class ServerMetrics:
+    """Request, batch, latency and throughput counters."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.reviews = 0
+        self.batches = 0
+        self.batch_reviews = 0
+        self.max_batch_size = 0
+        self.score_seconds = 0.0
+        self.latency_seconds = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe_request(self, latency: float, reviews: int, error: bool = False) -> None:
+        """Record one finished HTTP request."""
+        self.requests += 1
+        self.errors += int(error)
+        self.reviews += reviews
+        self.latency_seconds += latency
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_buckets[i] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+
+    def observe_batch(self, size: int, seconds: float) -> None:
+        """Record one call to the model."""
+        self.batches += 1
+        self.batch_reviews += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.score_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters as a JSON-serializable dict."""
+        uptime = time.monotonic() - self.started
+        return {
+            'uptime_seconds': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'reviews': self.reviews,
+            'reviews_per_second': self.reviews / uptime if uptime > 0 else 0.0,
+            'batches': self.batches,
+            'mean_batch_size': self.batch_reviews / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'mean_score_seconds': self.score_seconds / self.batches if self.batches else 0.0,
+            'mean_latency_seconds': (
+                self.latency_seconds / self.requests if self.requests else 0.0
+            ),
+            'latency_histogram': {
+                **{f'le_{bound}': count for bound, count in
+                   zip(LATENCY_BUCKETS, self.latency_buckets)},
+                'le_inf': self.latency_buckets[-1],
+            },
+        }
+
+
+class MicroBatcher:
+    """Collects requests from concurrent callers into batched model calls.
+
+    A request's records are always scored together and never split across
+    batches, so a score function can featurize each request on its own and
+    batch only the model call. If a batch fails, its requests are retried
+    one by one, so a bad record only fails the request that sent it.
+    """
+
+    def __init__(
+        self,
+        score_fn: ScoreFunction,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        metrics: Optional[ServerMetrics] = None
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            score_fn: Scores the records of several requests, returning one
+                      list of probabilities per request. Always called from
+                      the same worker thread.
+            max_batch_size: Number of reviews at which a batch stops taking
+                            more requests; a larger request is scored alone.
+            max_wait: Longest time (seconds) the first queued request waits
+                      for others to join its batch.
+            metrics: Counters to update with batch statistics.
+        """
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = metrics if metrics is not None else ServerMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scorer')
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and the scoring thread."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, records: List[Dict[str, Any]]) -> List[float]:
+        """
+        Score records, sharing the model call with other pending requests.
+
+        Args:
+            records: Review records from one request.
+
+        Returns:
+            One probability per record.
+        """
+        if not records:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((records, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[Dict[str, Any]], asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or times out."""
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            size += len(batch[-1][0])
+        return batch
+
+    def _score(self, requests: List[List[Dict[str, Any]]]) -> List[Any]:
+        """
+        Score a batch on the worker thread, isolating failed requests.
+
+        Args:
+            requests: Records of each request in the batch.
+
+        Returns:
+            Per request, its list of probabilities or the exception it raised.
+        """
+        try:
+            return self._score_checked(requests)
+        except Exception as e:
+            if len(requests) == 1:
+                return [e]
+            logger.warning("Scoring a batch of %d requests failed (%s), retrying one by one",
+                           len(requests), e)
+        results = []
+        for records in requests:
+            try:
+                results.extend(self._score_checked([records]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _score_checked(self, requests: List[List[Dict[str, Any]]]) -> List[List[float]]:
+        """Call ``score_fn`` and check that it returned one score per record."""
+        scores = [[float(score) for score in request_scores]
+                  for request_scores in self.score_fn(requests)]
+        if len(scores) != len(requests) or any(
+            len(request_scores) != len(records)
+            for request_scores, records in zip(scores, requests)
+        ):
+            raise ValueError(
+                f"Score function returned {[len(s) for s in scores]} scores "
+                f"for requests of {[len(r) for r in requests]} records"
+            )
+        return scores
+
+    async def _run(self) -> None:
+        """Score batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            requests = [records for records, _ in batch]
+            start = time.monotonic()
+            try:
+                results = await loop.run_in_executor(self.executor, self._score, requests)
+            except Exception as e:
+                results = [e] * len(batch)
+            self.metrics.observe_batch(sum(map(len, requests)), time.monotonic() - start)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class ScoringServer:
+    """HTTP/1.1 front end for a :class:`MicroBatcher`.
+
+    Endpoints:
+        POST /score    body is one review object, a list of them, or
+                       ``{"reviews": [...]}``; returns ``{"probabilities": [...]}``
+        GET /metrics   latency and throughput counters, with the stage
+                       spans of this process under ``pipeline``
+        GET /health    liveness check
+    """
+
+    def __init__(
+        self,
+        score_fn: ScoreFunction,
+        host: str = '127.0.0.1',
+        port: int = 8000,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        max_body_bytes: int = MAX_BODY_BYTES
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            score_fn: Scores the records of several requests.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free port.
+            max_batch_size: Number of reviews at which a batch is full.
+            max_wait: Longest time (seconds) a request waits for a batch.
+            max_body_bytes: Largest request body accepted; larger ones are
+                            answered with 413 without being read.
+        """
+        self.host = host
+        self.port = port
+        self.max_body_bytes = max_body_bytes
+        self.metrics = ServerMetrics()
+        self.batcher = MicroBatcher(score_fn, max_batch_size, max_wait, self.metrics)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Bind the socket and start accepting connections."""
+        await self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop accepting connections and shut down the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """Start the server and run until cancelled."""
+        await self.start()
+        logger.info("Scoring server listening on http://%s:%d", self.host, self.port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except RequestError as e:
+                    # The rest of the request is unread, so the connection is closed
+                    self.metrics.observe_request(0.0, 0, error=True)
+                    await self._respond(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """
+        Read one request from a connection.
+
+        Returns:
+            Tuple of (method, path, lower-cased headers, body), or None when
+            the client closed the connection.
+
+        Raises:
+            RequestError: If the request line or headers cannot be parsed, or
+                          the declared body is larger than ``max_body_bytes``.
+        """
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return None
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                raise RequestError(400, 'Malformed request line')
+            method, path, _ = parts
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, separator, value = line.decode('latin-1').partition(':')
+                if not separator or not name.strip():
+                    raise RequestError(400, 'Malformed header line')
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            # A line longer than the stream reader's limit
+            raise RequestError(400, 'Request line or header too long') from None
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, f"Invalid Content-Length: {headers['content-length']!r}")
+        if length > self.max_body_bytes:
+            raise RequestError(
+                413, f'Request body of {length} bytes exceeds {self.max_body_bytes} bytes'
+            )
+        body = await reader.readexactly(length)
+        return method, path, headers, body
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        keep_alive: bool
+    ) -> None:
+        """Write one JSON response."""
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+            + data
+        )
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Dispatch one request and return its status and JSON payload."""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return 200, {**self.metrics.snapshot(), 'pipeline': METRICS.snapshot()}
+        if method != 'POST' or path != '/score':
+            return 404, {'error': f'No route for {method} {path}'}
+
+        start = time.monotonic()
+        try:
+            payload = json.loads(body or b'null')
+            if isinstance(payload, dict):
+                records = payload.get('reviews', [payload])
+            else:
+                records = payload
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ValueError("Expected a review object or a list of review objects")
+        except ValueError as e:
+            self.metrics.observe_request(time.monotonic() - start, 0, error=True)
+            return 400, {'error': str(e)}
+
+        try:
+            scores = await self.batcher.submit(records)
+        except Exception as e:
+            self.metrics.observe_request(time.monotonic() - start, len(records), error=True)
+            return 500, {'error': str(e)}
+        self.metrics.observe_request(time.monotonic() - start, len(records))
+        return 200, {
+            'probabilities': [None if math.isnan(score) else score for score in scores]
+        }
+
+
+def model_score_function(
+    model_path: str,
+    store_path: Optional[str] = None,
+    compiled: bool = False
+) -> ScoreFunction:
+    """
+    Build a score function backed by a persisted model.
+
+    The model is loaded lazily on the first call, which happens on the
+    batcher's scoring thread, so the feature store connection is only ever
+    used from that thread. Each request is featurized on its own, so its
+    scores do not depend on the requests it is batched with; only the model
+    call is shared (see :meth:`~.scoring.ScoringModel.score_many`).
+
+    Args:
+        model_path: Model file written by ``scoring.save_model``.
+        store_path: Optional feature store with reviewer history.
+        compiled: Score with the compiled form of a tree ensemble, which is
+                  faster for the small batches a server sees.
+
+    Returns:
+        Function scoring the records of several requests.
+    """
+    from .scoring import ScoringModel
+
+    state = {}
+
+    def score(requests: List[List[Dict[str, Any]]]) -> Sequence[Sequence[float]]:
+        if 'model' not in state:
+            state['model'] = ScoringModel.load(
+                model_path, store_path=store_path, compiled=compiled
+            )
+        return state['model'].score_many(requests)
+
+    return score
+
+
+def main():
+    """Run the scoring server from the command line."""
+    parser = argparse.ArgumentParser(description="Fake review scoring server")
+    parser.add_argument('--model', required=True, help="Model file from save_model")
+    parser.add_argument('--store', default=None, help="Optional feature store database")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait', type=float, default=0.005,
+                        help="Seconds a request may wait for its batch to fill")
+    parser.add_argument('--max-body-bytes', type=int, default=MAX_BODY_BYTES,
+                        help="Largest request body accepted; larger ones get 413")
+    parser.add_argument('--compiled', action='store_true',
+                        help="Score tree ensembles with packed NumPy arrays")
+    parser.add_argument('--log-json', action='store_true',
+                        help="Write structured JSON log lines")
+    args = parser.parse_args()
+    configure_logging(json_format=args.log_json)
+
+    server = ScoringServer(
+        model_score_function(args.model, args.store, compiled=args.compiled),
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait,
+        max_body_bytes=args.max_body_bytes
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
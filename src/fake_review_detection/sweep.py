@@ -0,0 +1,220 @@
+"""
+Sweep Module
+
+Grid or random search over semi-supervised training parameters and model
+hyperparameters, with cached features and resumable, on-disk trial results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Union
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+from .feature_matrix import MANIFEST_FILE, load_features, write_feature_arrays
+from .models import SemiSupervisedLearner, feature_arrays
+
+logger = logging.getLogger(__name__)
+
+# Parameters with this prefix are set on the estimator; all others are
+# passed to SemiSupervisedLearner.train_arrays (threshold, iterations, ...)
+MODEL_PARAM_PREFIX = 'model__'
+
+RESULT_METRICS = ['accuracy', 'precision', 'recall', 'f1', 'iterations', 'stop_reason']
+
+
+def _to_json(value: Any) -> str:
+    """Serialize deterministically, converting NumPy scalars."""
+    return json.dumps(
+        value, sort_keys=True, default=lambda o: o.item() if hasattr(o, 'item') else str(o)
+    )
+
+
+def dataset_fingerprint(X: np.ndarray, y: np.ndarray, feature_names: List[str]) -> str:
+    """
+    Hash a featurized dataset.
+
+    Args:
+        X: Feature matrix.
+        y: Labels.
+        feature_names: Names of the columns of ``X``.
+
+    Returns:
+        Hex digest that changes whenever the features, labels or their
+        order change.
+    """
+    digest = hashlib.sha256()
+    digest.update(_to_json([feature_names, X.shape, X.dtype.str, y.dtype.str]).encode())
+    digest.update(np.ascontiguousarray(X).data)
+    digest.update(np.ascontiguousarray(y).data)
+    return digest.hexdigest()[:16]
+
+
+def parameter_candidates(
+    param_space: Union[Dict[str, Any], List[Dict[str, Any]]],
+    n_iter: Optional[int] = None,
+    random_state: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter space into trial settings.
+
+    Args:
+        param_space: Mapping of parameter name to a list of values (or, for
+                     random search, a scipy distribution), as accepted by
+                     ``ParameterGrid``/``ParameterSampler``.
+        n_iter: Number of random samples; None enumerates the full grid.
+        random_state: Seed for random search.
+
+    Returns:
+        List of parameter dicts, one per trial.
+    """
+    if n_iter is None:
+        return list(ParameterGrid(param_space))
+    return list(ParameterSampler(param_space, n_iter=n_iter, random_state=random_state))
+
+
+def _run_trial(
+    estimator: Any,
+    params: Dict[str, Any],
+    features_dir: str,
+    feature_names: List[str],
+    train_kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Train one configuration on the memory-mapped cached features."""
+    X, y, _ = load_features(features_dir)
+
+    model_params = {
+        name[len(MODEL_PARAM_PREFIX):]: value for name, value in params.items()
+        if name.startswith(MODEL_PARAM_PREFIX)
+    }
+    options = {
+        **train_kwargs,
+        **{name: value for name, value in params.items()
+           if not name.startswith(MODEL_PARAM_PREFIX)},
+    }
+    learner = SemiSupervisedLearner(
+        clone(estimator).set_params(**model_params),
+        algorithm_name=type(estimator).__name__
+    )
+    start = perf_counter()
+    metrics = learner.train_arrays(X, y, feature_names=feature_names, **options)
+    result = {name: metrics[name] for name in RESULT_METRICS}
+    result['train_seconds'] = perf_counter() - start
+    return result
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    estimator: Any,
+    param_space: Union[Dict[str, Any], List[Dict[str, Any]]],
+    n_iter: Optional[int] = None,
+    cache_dir: Union[str, Path] = 'data/processed/sweeps',
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+    target_column: str = 'flagged',
+    drop_columns: Optional[List[str]] = None,
+    **train_kwargs: Any
+) -> pd.DataFrame:
+    """
+    Run a hyperparameter sweep, resuming from earlier results.
+
+    The featurized dataset is fingerprinted and exported as a feature
+    bundle (see ``feature_matrix``) under ``cache_dir/<fingerprint>``;
+    trials open it as memory maps. Each
+    finished trial is written to ``trials/<key>.json`` as soon as it
+    completes, where the key hashes the fingerprint, the estimator and the
+    trial's parameters, so rerunning an interrupted sweep only runs the
+    missing trials.
+
+    Args:
+        df: Featurized dataframe, e.g. from ``FeatureEngineer.create_features``.
+        estimator: Unfitted scikit-learn estimator; it is cloned per trial.
+        param_space: Parameters to search. Names starting with ``model__``
+                     are estimator parameters (``model__max_depth``); others
+                     are ``train_arrays`` options (``threshold``, ``iterations``).
+        n_iter: Number of random-search trials; None runs the full grid.
+        cache_dir: Directory for cached features and trial results.
+        n_jobs: Number of worker processes; defaults to the CPU count.
+                1 runs trials in the calling process.
+        random_state: Seed for random search.
+        target_column: Name of the target column.
+        drop_columns: Columns to drop before training.
+        **train_kwargs: Fixed ``train_arrays`` options for every trial.
+
+    Returns:
+        Dataframe with one row per trial (parameters, metrics, training
+        time and whether it came from the cache), best F1 first.
+    """
+    X, y, feature_names = feature_arrays(df, target_column, drop_columns)
+    if y.dtype == object and all(isinstance(label, str) for label in y):
+        y = y.astype(str)
+    fingerprint = dataset_fingerprint(X, y, feature_names)
+
+    features_dir = Path(cache_dir) / fingerprint
+    trials_dir = features_dir / 'trials'
+    trials_dir.mkdir(parents=True, exist_ok=True)
+    if not (features_dir / MANIFEST_FILE).exists():
+        write_feature_arrays(features_dir, X, y, feature_names, target_column)
+    del X, y
+
+    estimator_key = _to_json([type(estimator).__name__, estimator.get_params()])
+    trials = []
+    for params in parameter_candidates(param_space, n_iter, random_state):
+        key = hashlib.sha256(
+            _to_json([fingerprint, estimator_key, params, train_kwargs]).encode()
+        ).hexdigest()[:16]
+        trials.append((key, params))
+
+    results = {}
+    pending = []
+    for key, params in trials:
+        path = trials_dir / f'{key}.json'
+        if path.exists():
+            with open(path) as f:
+                results[key] = {**json.load(f), 'cached': True}
+        else:
+            pending.append((key, params))
+    logger.info(
+        "Sweep %s: %d trials, %d cached", fingerprint, len(trials), len(trials) - len(pending)
+    )
+
+    def record(key: str, params: Dict[str, Any], result: Dict[str, Any]) -> None:
+        result = json.loads(_to_json({'params': params, **result}))
+        tmp = trials_dir / f'{key}.json.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(result, f, indent=2)
+        os.replace(tmp, trials_dir / f'{key}.json')
+        results[key] = {**result, 'cached': False}
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1 or len(pending) <= 1:
+        for key, params in pending:
+            record(key, params, _run_trial(
+                estimator, params, str(features_dir), feature_names, train_kwargs
+            ))
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(pending))) as executor:
+            futures = {
+                executor.submit(
+                    _run_trial, estimator, params, str(features_dir),
+                    feature_names, train_kwargs
+                ): (key, params)
+                for key, params in pending
+            }
+            for future in as_completed(futures):
+                record(*futures[future], future.result())
+
+    rows = [
+        {**results[key]['params'],
+         **{name: value for name, value in results[key].items() if name != 'params'}}
+        for key, _ in trials
+    ]
+    return pd.DataFrame(rows).sort_values('f1', ascending=False, kind='stable')
@@ -4,11 +4,13 @@ Utility Functions Module
 Contains helper functions for visualization and data manipulation.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from sklearn.metrics import confusion_matrix
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+
+from .resampling import sample_indices
+
+if TYPE_CHECKING:
+    import matplotlib.figure
 
 
 def plot_confusion_matrix(
@@ -16,23 +18,28 @@ def plot_confusion_matrix(
     y_pred,
     classes: List[str],
     title: Optional[str] = None,
-    cmap=plt.cm.Blues,
+    cmap='Blues',
     figsize: tuple = (8, 6)
-) -> plt.Figure:
+) -> 'matplotlib.figure.Figure':
     """
     Plot a confusion matrix.
 
+    Matplotlib is imported on first call, so importing this module stays cheap.
+
     Args:
         y_true: True labels.
         y_pred: Predicted labels.
         classes: List of class names.
         title: Title for the plot.
-        cmap: Colormap for the plot.
+        cmap: Colormap or colormap name for the plot.
         figsize: Figure size.
 
     Returns:
         Matplotlib figure object.
     """
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import confusion_matrix
+
     cm = confusion_matrix(y_true, y_pred)
     fig, ax = plt.subplots(figsize=figsize)
     im = ax.imshow(cm, interpolation='nearest', cmap=cmap)
@@ -68,6 +75,11 @@ def under_sample(df, target_column: str = 'flagged', random_state: int = 42):
     """
     Perform under-sampling to balance the dataset.
 
+    Keeps every fake ('Y') review and an equal number of randomly chosen
+    authentic ('N') ones, in shuffled order; rows with any other label are
+    dropped. See ``resampling.resample`` for other ratios, stratification
+    and hash-based sampling.
+
     Args:
         df: Dataframe to balance.
         target_column: Name of the target column.
@@ -75,12 +87,18 @@ def under_sample(df, target_column: str = 'flagged', random_state: int = 42):
 
     Returns:
         Balanced dataframe.
+
+    Raises:
+        ValueError: If there are fewer authentic than fake reviews.
     """
-    print("Under-Sampling Data")
-    sample_size = len(df[df[target_column] == 'Y'])
-    authentic = df[df[target_column] == 'N'].sample(
-        sample_size, random_state=random_state
+    labels = df[target_column]
+    fake, authentic = int((labels == 'Y').sum()), int((labels == 'N').sum())
+    if authentic < fake:
+        raise ValueError(
+            f"Cannot under-sample {authentic} authentic reviews to match {fake} fake ones"
+        )
+    # Other labels are masked as missing, which sample_indices drops
+    positions = sample_indices(
+        labels.where(labels.isin(['Y', 'N'])), reference_label='Y', random_state=random_state
     )
-    fake = df[df[target_column] == 'Y']
-    balanced_df = pd.concat([authentic, fake]).sample(frac=1, random_state=random_state)
-    return balanced_df
+    return df.take(positions)
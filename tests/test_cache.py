@@ -0,0 +1,125 @@
+"""
+Tests for cache module.
+"""
+
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.fake_review_detection import cache as cache_module
+from src.fake_review_detection.cache import Stage, StageCache, file_fingerprint
+from src.fake_review_detection.data_processor import DataProcessor
+from src.fake_review_detection.feature_engineer import FeatureEngineer, MinHashLSH
+from src.fake_review_detection.main import pipeline_stages
+
+
+class Counter:
+    """Stateful stage that remembers the size of its input."""
+
+    def __init__(self):
+        self.fitted_ = None
+
+    def __call__(self, df):
+        self.fitted_ = len(df)
+        return df.assign(doubled=df['value'] * 2)
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Create an input file for the first stage."""
+    path = tmp_path / 'input.csv'
+    pd.DataFrame({'value': range(5)}).to_csv(path, index=False)
+    return path
+
+
+def _pipeline(source, counter, runs, offset=0):
+    """Build a load -> filter -> double pipeline that logs stage runs."""
+    def load(_):
+        runs.append('load')
+        return pd.read_csv(source)
+
+    def double(df):
+        runs.append('double')
+        return counter(df)
+
+    return [
+        Stage('load', load),
+        Stage('filter', lambda df: df[df['value'] >= offset], config={'offset': offset}),
+        Stage('double', double, code=(Counter,), state=counter),
+    ]
+
+
+def test_run_skips_cached_stages(source, tmp_path):
+    """Test that unchanged stages are reused and changed ones rerun."""
+    stage_cache = StageCache(tmp_path / 'cache')
+    runs = []
+    first = stage_cache.run(file_fingerprint(source), _pipeline(source, Counter(), runs))
+    assert runs == ['load', 'double']
+
+    # Fully cached: nothing runs, but the fitted state is restored
+    restored, runs = Counter(), []
+    second = stage_cache.run(file_fingerprint(source), _pipeline(source, restored, runs))
+    pd.testing.assert_frame_equal(first, second)
+    assert runs == []
+    assert restored.fitted_ == 5
+
+    # A config change reruns that stage and the ones after it only
+    runs, outputs = [], []
+    third = stage_cache.run(
+        file_fingerprint(source), _pipeline(source, Counter(), runs, offset=2),
+        on_output=lambda name, df: outputs.append(name)
+    )
+    assert runs == ['double']
+    assert outputs == ['load', 'filter', 'double']
+    assert list(third.index) == [2, 3, 4]
+
+    # A new input file invalidates everything
+    pd.DataFrame({'value': range(7)}).to_csv(source, index=False)
+    runs = []
+    stage_cache.run(file_fingerprint(source), _pipeline(source, Counter(), runs))
+    assert runs == ['load', 'double']
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    """Test that the least recently used entries are evicted first."""
+    monkeypatch.setattr(cache_module, 'HAS_PYARROW', False)
+    stage_cache = StageCache(tmp_path, max_bytes=10 ** 9)
+    frame = pd.DataFrame({'value': range(1000)})
+    for key in ('a', 'b', 'c'):
+        stage_cache.put(key, frame)
+    entry_size = sum(f.stat().st_size for f in (tmp_path / 'a').iterdir())
+
+    assert stage_cache.get('a') is not None  # 'b' is now least recently used
+    stage_cache.max_bytes = 2 * entry_size
+    stage_cache.evict()
+
+    assert stage_cache.get('b') is None
+    assert stage_cache.get('a') is not None
+    assert stage_cache.get('c') is not None
+
+
+def test_pipeline_settings_miss_cache(source, tmp_path):
+    """Test that the main pipeline's stage settings are part of the keys."""
+    stage_cache = StageCache(tmp_path / 'cache')
+
+    def run(compact=True, stop_words=('the',), **engineer_kwargs):
+        processor = DataProcessor()
+        processor.stop_words = stop_words
+        stages = pipeline_stages(source, processor, FeatureEngineer(**engineer_kwargs), compact)
+        runs = []
+
+        def recorder(stage):
+            def func(df):
+                runs.append(stage.name)
+                return pd.read_csv(source) if df is None else df
+            return stage._replace(func=func, state=None)
+
+        stage_cache.run(file_fingerprint(source), [recorder(stage) for stage in stages])
+        return runs
+
+    assert run() == ['load', 'clean', 'features']
+    assert run() == []
+    assert run(mnr_reference_max=3.0) == ['features']
+    assert run(near_duplicates=MinHashLSH()) == ['features']
+    assert run(vectorizer=TfidfVectorizer().fit(['a fitted vocabulary'])) == ['features']
+    assert run(stop_words=('the', 'a')) == ['clean', 'features']
+    assert run(compact=False) == ['load', 'clean', 'features']
@@ -0,0 +1,80 @@
+"""
+Tests for compiled_forest module.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.tree import DecisionTreeClassifier
+from src.fake_review_detection.compiled_forest import compile_forest
+from src.fake_review_detection.models import SemiSupervisedLearner
+
+
+@pytest.fixture
+def features():
+    """Create a noisy, roughly separable feature matrix with string labels."""
+    rng = np.random.default_rng(0)
+    X = rng.random((500, 5))
+    X[:, 3] = rng.integers(0, 20, size=500)
+    y = np.where(X[:, 0] + rng.normal(scale=0.3, size=500) > 0.5, 'Y', 'N')
+    return X, y
+
+
+@pytest.mark.parametrize('make_model', [
+    lambda: RandomForestClassifier(
+        n_estimators=50, criterion='entropy', max_depth=14, max_features='sqrt', random_state=0
+    ),
+    lambda: ExtraTreesClassifier(n_estimators=20, random_state=0),
+    lambda: DecisionTreeClassifier(random_state=0),
+])
+def test_matches_predict_proba(features, make_model):
+    """Test probabilities, labels and leaves against scikit-learn."""
+    X, y = features
+    model = make_model().fit(X, y)
+    compiled = compile_forest(model)
+    X_new = np.random.default_rng(1).random((300, 5)) * [1, 1, 1, 20, 1]
+
+    np.testing.assert_allclose(compiled.predict_proba(X_new), model.predict_proba(X_new), atol=1e-6)
+    np.testing.assert_array_equal(compiled.predict(X_new), model.predict(X_new))
+    trees = getattr(model, 'estimators_', [model])
+    expected_leaves = np.column_stack([tree.apply(X_new) for tree in trees])
+    np.testing.assert_array_equal(compiled.apply(X_new) - compiled.roots, expected_leaves)
+
+
+def test_split_boundaries(features):
+    """Test rows exactly on and just above float32-rounded thresholds."""
+    X, y = features
+    model = RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+    compiled = compile_forest(model, check_rows=0)
+    probe = compiled.probe_rows(1000)
+    np.testing.assert_allclose(compiled.predict_proba(probe), model.predict_proba(probe), atol=1e-6)
+
+
+def test_compile_learner(features):
+    """Test compiling the forest trained by SemiSupervisedLearner."""
+    X, y = features
+    learner = SemiSupervisedLearner(
+        RandomForestClassifier(n_estimators=20, random_state=0), algorithm_name='RF'
+    )
+    learner.train_arrays(X, y, threshold=0.7, iterations=3, warm_start=True)
+    compiled = compile_forest(learner)
+
+    assert compiled.n_trees == len(learner.model.estimators_)
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), learner.model.predict_proba(X), atol=1e-6
+    )
+    with pytest.raises(ValueError, match="shape"):
+        compiled.predict_proba(X[:, :3])
+    with pytest.raises(ValueError, match="NaN"):
+        compiled.missing_left = None
+        compiled.predict_proba(np.full((1, 5), np.nan))
+
+
+def test_rejects_other_models(features):
+    """Test that non-tree models are rejected."""
+    X, y = features
+    with pytest.raises(ValueError, match="not a fitted tree model"):
+        compile_forest(GaussianNB().fit(X, y))
+    with pytest.raises(ValueError, match="not a fitted tree model"):
+        compile_forest(RandomForestClassifier())
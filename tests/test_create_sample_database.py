@@ -0,0 +1,68 @@
+"""
+Tests for the create_sample_database script.
+"""
+
+import sqlite3
+
+from create_sample_database import create_database
+from src.fake_review_detection.data_loader import load_data
+
+
+def dump(db_path):
+    """Read every table of a database into sorted lists of rows."""
+    with sqlite3.connect(db_path) as conn:
+        return {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+            for table in ('review', 'reviewer', 'restaurant')
+        }
+
+
+def test_same_seed_gives_same_database(tmp_path):
+    """Test that generation is deterministic for a seed."""
+    create_database(str(tmp_path / 'a.db'), num_reviews=500, seed=1)
+    create_database(str(tmp_path / 'b.db'), num_reviews=500, seed=1)
+    create_database(str(tmp_path / 'c.db'), num_reviews=500, seed=2)
+
+    assert dump(tmp_path / 'a.db') == dump(tmp_path / 'b.db')
+    assert dump(tmp_path / 'a.db') != dump(tmp_path / 'c.db')
+
+
+def test_generated_data_shape(tmp_path):
+    """Test counts, label rate, bursts and near-duplicates of a generated database."""
+    db_path = tmp_path / 'reviews.db'
+    create_database(
+        str(db_path), num_reviews=5000, num_reviewers=300, num_restaurants=40,
+        fake_rate=0.2, burst_rate=0.2, duplicate_rate=0.1
+    )
+    df = load_data(str(db_path))
+
+    assert len(df) == 5000
+    assert df['reviewerID'].nunique() <= 300
+    assert df['restaurantID'].nunique() <= 40
+    assert abs((df['flagged'] == 'Y').mean() - 0.2) < 0.03
+
+    # Zipfian activity: the busiest reviewer posts far more than the median
+    activity = df['reviewerID'].value_counts()
+    assert activity.iloc[0] > 10 * activity.median()
+
+    # Bursts: a reviewer posting several reviews on one day
+    same_day = df.groupby(['reviewerID', 'date']).size()
+    assert (same_day > 1).sum() > 0.1 * len(same_day)
+
+    # Near-duplicates share most of their opening words with an earlier review
+    openings = df['reviewContent'].str.split().str[:8].str.join(' ')
+    assert openings.duplicated().mean() > 0.02
+
+
+def test_reviewer_activity_is_capped(tmp_path):
+    """Test that no reviewer writes far more than max_reviewer_reviews."""
+    db_path = tmp_path / 'reviews.db'
+    create_database(
+        str(db_path), num_reviews=20000, num_reviewers=2000,
+        burst_rate=0.0, max_reviewer_reviews=100
+    )
+    activity = load_data(str(db_path))['reviewerID'].value_counts()
+
+    # Uncapped, the busiest of 2000 reviewers would write about 3400 reviews
+    assert activity.iloc[0] < 150
+    assert activity.iloc[0] > 10 * activity.median()
@@ -0,0 +1,122 @@
+"""
+Tests for data loader module.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.fake_review_detection import data_loader
+from src.fake_review_detection.data_loader import (
+    ReviewQuery,
+    load_data,
+    load_reviews,
+    stream_data,
+)
+
+
+@pytest.fixture
+def sample_db(tmp_path):
+    """Create a small review database."""
+    db_path = tmp_path / "reviews.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE review (
+            reviewID TEXT PRIMARY KEY, reviewerID TEXT, restaurantID TEXT,
+            date TEXT, rating INTEGER, usefulCount INTEGER,
+            reviewContent TEXT, flagged TEXT
+        );
+        CREATE TABLE reviewer (
+            reviewerID TEXT PRIMARY KEY, name TEXT, location TEXT, yelpJoinDate TEXT
+        );
+        CREATE TABLE restaurant (restaurantID TEXT PRIMARY KEY, rating REAL);
+    """)
+    conn.executemany(
+        "INSERT INTO reviewer VALUES (?, ?, ?, ?)",
+        [(f"U{i}", f"User {i}", "Chicago, IL", "May 2010") for i in range(3)]
+    )
+    conn.executemany(
+        "INSERT INTO restaurant VALUES (?, ?)",
+        [("R0", 3.5), ("R1", 4.0)]
+    )
+    conn.executemany(
+        "INSERT INTO review VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (f"V{i}", f"U{i % 3}", f"R{i % 2}", "2012-01-01", i % 5 + 1, i,
+             f"review number {i}", "YNX"[i % 3])
+            for i in range(9)
+        ] + [
+            ("V9", "U0", "R1", "\n3/15/2013", 5, 0, "review number 9", "Y")
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_stream_data_matches_load_data(sample_db):
+    """Test that streamed batches reassemble into the in-memory load."""
+    expected = load_data(sample_db).sort_values('reviewID').reset_index(drop=True)
+    batches = list(stream_data(sample_db, batch_size=3))
+
+    assert all(len(batch) <= 3 for batch in batches)
+    streamed = pd.concat(batches).sort_values('reviewID').reset_index(drop=True)
+    assert list(streamed.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_stream_data_missing_database(tmp_path):
+    """Test that a missing database raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        next(stream_data(tmp_path / "missing.db"))
+
+
+def test_load_reviews_projection_and_filters(sample_db):
+    """Test that columns and filters are pushed into the query."""
+    query = ReviewQuery(
+        columns=['reviewID', 'flagged', 'restaurantRating'],
+        start_date='2012-06-01',
+        restaurant_ids=['R1'],
+        labels=['Y']
+    )
+    df = load_reviews(sample_db, query)
+
+    assert list(df.columns) == ['reviewID', 'flagged', 'restaurantRating']
+    assert df['reviewID'].tolist() == ['V9']
+    assert df['restaurantRating'].tolist() == [4.0]
+
+
+def test_load_reviews_creates_indexes(sample_db):
+    """Test that missing indexes on join and filter columns are created."""
+    load_reviews(sample_db, ReviewQuery(columns=['reviewID']))
+
+    conn = sqlite3.connect(str(sample_db))
+    names = {row[1] for row in conn.execute("PRAGMA index_list(review)")}
+    conn.close()
+    assert {'idx_review_reviewerID', 'idx_review_restaurantID', 'idx_review_flagged'} <= names
+
+
+def test_review_query_unknown_column():
+    """Test that unknown columns are rejected."""
+    with pytest.raises(ValueError):
+        ReviewQuery(columns=['missing']).to_sql()
+
+
+def test_compact_load_reads_batches(sample_db, monkeypatch):
+    """Test that batch-wise compact loading keeps the values of a plain load."""
+    monkeypatch.setattr(data_loader, 'FETCH_BATCH_SIZE', 4)
+    expected = load_data(sample_db)
+    compact = load_data(sample_db, compact=True)
+
+    for column in ('reviewerID', 'restaurantID', 'date', 'location'):
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype)
+    assert compact['rating'].dtype == np.int16
+    assert compact['restaurantRating'].dtype == np.float32
+    pd.testing.assert_frame_equal(
+        compact.astype(object), expected.astype(object), check_dtype=False
+    )
+
+    reviews = load_reviews(sample_db, compact=True)
+    assert isinstance(reviews['reviewerID'].dtype, pd.CategoricalDtype)
+    assert len(reviews) == len(expected)
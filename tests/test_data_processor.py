@@ -2,8 +2,10 @@
 Tests for data processor module.
 """
 
+import numpy as np
 import pandas as pd
 import pytest
+from datetime import datetime
 from src.fake_review_detection.data_processor import DataProcessor
 
 
@@ -25,3 +27,60 @@ def test_clean_basic():
     cleaned_df = processor.clean(df)
     assert 'reviewContent' in cleaned_df.columns
     assert len(cleaned_df) == 2
+
+
+def _reference_clean(processor, df):
+    """Row-by-row cleaning the vectorized engine must reproduce exactly."""
+    df = df.copy()
+    df['date'] = df['date'].apply(
+        lambda x: x[1:] if isinstance(x, str) and x.startswith('\n') else x
+    )
+    df['yelpJoinDate'] = df['yelpJoinDate'].apply(
+        lambda x: datetime.strftime(
+            datetime.strptime(x, '%B %Y'), '01/%m/%Y'
+        ) if isinstance(x, str) else x
+    )
+    df['reviewContent'] = df['reviewContent'].apply(
+        lambda x: ' '.join(
+            word for word in str(x).split()
+            if word.lower() not in processor.stop_words
+        )
+    )
+    df['reviewContent'] = df['reviewContent'].apply(
+        lambda x: ' '.join(processor.tokenizer.tokenize(str(x)))
+    )
+    df['reviewContent'] = df['reviewContent'].str.lower()
+    return df
+
+
+def test_clean_matches_reference():
+    """Test that cleaning output matches the row-by-row reference byte for byte."""
+    processor = DataProcessor()
+    df = pd.DataFrame({
+        'reviewContent': [
+            "I'm NOT sure they'll come back!! The pasta... was great_ish.",
+            'THE Food, the service & THE view: 10/10 \u212aale',
+            'Caf\u00e9 \u00dcBER gut \u2014 \u0130stanbul \u039f\u0394\u039f\u03a3. '
+            'Don\u2019t miss',
+            'a an the',
+            '',
+            np.nan,
+        ],
+        'date': ['\n2024-01-01', '2024-01-02', '\n\n2024-01-03', None, '2024-01-02', '\n9/1/2012'],
+        'yelpJoinDate': ['May 2010', 'January 2009', None, 'May 2010', 'December 2014', np.nan],
+    })
+    cleaned = processor.clean(df)
+    expected = _reference_clean(processor, df)
+    pd.testing.assert_frame_equal(cleaned, expected)
+
+
+def test_clean_parallel_matches_serial():
+    """Test that multiprocess cleaning keeps row order and output."""
+    df = pd.DataFrame({
+        'reviewContent': [f'The review number {i} was GREAT!' for i in range(25)],
+        'date': ['\n2024-01-01'] * 25,
+        'yelpJoinDate': ['May 2010', None, 'June 2011', 'July 2012', 'May 2010'] * 5,
+    }, index=range(100, 125))
+    serial = DataProcessor().clean(df)
+    parallel = DataProcessor(n_jobs=2, chunk_size=4).clean(df)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,104 @@
+"""
+Tests for feature engineer module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.fake_review_detection.feature_engineer import (
+    FeatureEngineer,
+    MinHashLSH,
+    max_group_similarity,
+)
+
+
+@pytest.fixture
+def reviews():
+    """Create a small cleaned review dataframe."""
+    rng = np.random.default_rng(0)
+    words = ['food', 'great', 'service', 'slow', 'pasta', 'best', 'town', 'cold']
+    reviewers = ['A'] * 6 + ['B'] * 2 + ['C'] + ['D'] * 3
+    return pd.DataFrame({
+        'reviewerID': reviewers,
+        'date': ['2012-01-01', '2012-01-01', '2012-01-02'] * 4,
+        'rating': rng.integers(1, 6, size=len(reviewers)),
+        'restaurantRating': [3.5] * len(reviewers),
+        'reviewContent': [
+            ' '.join(rng.choice(words, size=rng.integers(3, 8))) for _ in reviewers
+        ],
+    })
+
+
+def test_max_group_similarity_matches_dense(reviews):
+    """Test the sparse engine against dense per-group cosine matrices."""
+    tfidf = TfidfVectorizer().fit_transform(reviews['reviewContent'])
+    codes, _ = pd.factorize(reviews['reviewerID'])
+
+    expected = []
+    for code in range(codes.max() + 1):
+        block = tfidf[codes == code].toarray()
+        cosine = block @ block.T
+        np.fill_diagonal(cosine, -np.inf)
+        expected.append(max(cosine.max(), 0) if len(block) > 1 else 0)
+
+    for small_group_size in (1, 64):
+        result = max_group_similarity(
+            tfidf, codes, small_group_size=small_group_size, block_size=2
+        )
+        np.testing.assert_allclose(result, expected)
+
+
+def test_create_features(reviews):
+    """Test that all engineered features are added."""
+    df = FeatureEngineer().create_features(reviews)
+    for column in ['mnr', 'rl', 'rd', 'Maximum Content Similarity']:
+        assert column in df.columns
+    assert (df.loc[df['reviewerID'] == 'C', 'Maximum Content Similarity'] == 0).all()
+    assert df['mnr'].max() == 1
+
+
+def test_minhash_lsh_finds_near_duplicates():
+    """Test that copied and lightly edited reviews form one cluster."""
+    rng = np.random.default_rng(1)
+    vocab = [f'word{i}' for i in range(500)]
+    base = list(rng.choice(vocab, size=60))
+    edited = base.copy()
+    edited[30] = 'changed'
+    texts = [' '.join(base), ' '.join(base), ' '.join(edited)] + [
+        ' '.join(rng.choice(vocab, size=60)) for _ in range(20)
+    ] + ['', 'short']
+
+    max_similarity, cluster_size = MinHashLSH().fit_transform(texts)
+
+    assert max_similarity[0] == 1.0 and max_similarity[1] == 1.0
+    assert max_similarity[2] > 0.8
+    assert cluster_size[:3].tolist() == [3, 3, 3]
+    assert (max_similarity[3:] < 0.5).all()
+    assert (cluster_size[3:] == 1).all()
+
+
+def test_create_features_near_duplicates(reviews):
+    """Test that near-duplicate features are added when requested."""
+    df = FeatureEngineer(near_duplicates=MinHashLSH()).create_features(reviews)
+    assert 'Maximum Duplicate Similarity' in df.columns
+    assert (df['Duplicate Cluster Size'] >= 1).all()
+
+
+def test_mnr_matches_grouped_merge(reviews):
+    """Test MNR against the grouped-and-merged computation."""
+    grouped = reviews.groupby(['date', 'reviewerID']).size().reset_index(name='mnr')
+    grouped['mnr'] = grouped['mnr'] / grouped['mnr'].max()
+    expected = reviews.merge(grouped, on=['reviewerID', 'date'], how='inner')['mnr']
+
+    engineer = FeatureEngineer()
+    df = engineer.create_features(reviews)
+    np.testing.assert_allclose(df['mnr'], expected)
+    assert engineer.mnr_max_ == 4
+
+
+def test_mnr_reference_max(reviews):
+    """Test that a stored maximum scales a single batch like training data."""
+    batch = reviews[reviews['reviewerID'] == 'B']
+    df = FeatureEngineer(mnr_reference_max=8).create_features(batch)
+    assert df['mnr'].tolist() == [0.25, 0.25]
@@ -0,0 +1,70 @@
+"""
+Tests for feature_matrix module.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.feature_matrix import export_features, load_features
+from src.fake_review_detection.models import SemiSupervisedLearner
+
+
+@pytest.fixture
+def features():
+    """Create a featurized frame with ID and text columns."""
+    rng = np.random.default_rng(4)
+    n = 300
+    df = pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(n)],
+        'reviewerID': [f'U{i % 20}' for i in range(n)],
+        'reviewContent': ['food great'] * n,
+        'mnr': rng.random(n),
+        'rl': rng.integers(1, 200, size=n),
+        'Maximum Content Similarity': rng.random(n),
+    })
+    df['flagged'] = np.where(df['mnr'] + rng.normal(scale=0.3, size=n) > 0.5, 'Y', 'N')
+    return df
+
+
+def test_export_and_load_round_trip(features, tmp_path):
+    """Test that the bundle holds the numeric features, labels and manifest."""
+    export_features(features, tmp_path / 'bundle')
+    X, y, names = load_features(tmp_path / 'bundle')
+
+    assert isinstance(X, np.memmap) and isinstance(y, np.memmap)
+    assert not X.flags.writeable
+    assert names == ['mnr', 'rl', 'Maximum Content Similarity']
+    np.testing.assert_array_equal(X, features[names].to_numpy(dtype=float))
+    np.testing.assert_array_equal(y, features['flagged'].to_numpy(dtype=str))
+
+    with open(tmp_path / 'bundle' / 'manifest.json') as f:
+        manifest = json.load(f)
+    assert manifest['rows'] == len(features)
+    assert manifest['labels'] == ['N', 'Y']
+
+
+def test_train_on_loaded_bundle_matches_frame(features, tmp_path):
+    """Test that training on the memory-mapped bundle matches training on the frame."""
+    export_features(features, tmp_path)
+
+    from_bundle = SemiSupervisedLearner(GaussianNB())
+    bundle_metrics = from_bundle.train_arrays(*load_features(tmp_path), iterations=3)
+    from_frame = SemiSupervisedLearner(GaussianNB())
+    frame_metrics = from_frame.train(features, iterations=3)
+
+    np.testing.assert_array_equal(bundle_metrics['predictions'], frame_metrics['predictions'])
+    assert from_bundle.feature_columns_ == from_frame.feature_columns_
+
+
+def test_load_rejects_mismatched_manifest(features, tmp_path):
+    """Test that a manifest that does not match the arrays is rejected."""
+    export_features(features, tmp_path)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest['rows'] += 1
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError, match='does not match'):
+        load_features(tmp_path)
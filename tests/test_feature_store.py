@@ -0,0 +1,117 @@
+"""
+Tests for feature store module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.fake_review_detection.feature_engineer import max_group_similarity
+from src.fake_review_detection.feature_store import FeatureStore
+
+
+@pytest.fixture
+def reviews():
+    """Create a cleaned review dataframe spanning two days."""
+    rng = np.random.default_rng(0)
+    words = ['food', 'great', 'service', 'slow', 'pasta', 'best', 'town', 'cold']
+    reviewers = ['A'] * 6 + ['B'] * 3 + ['C'] + ['D'] * 4
+    return pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(len(reviewers))],
+        'reviewerID': reviewers,
+        'date': ['2012-01-01', '2012-01-02'] * 7,
+        'rating': rng.integers(1, 6, size=len(reviewers)),
+        'restaurantRating': [3.5] * len(reviewers),
+        'reviewContent': [
+            ' '.join(rng.choice(words, size=rng.integers(3, 8))) for _ in reviewers
+        ],
+    })
+
+
+def test_incremental_updates_match_single_update(tmp_path, reviews):
+    """Test that ingesting in batches gives the same state as one batch."""
+    vectorizer = TfidfVectorizer().fit(reviews['reviewContent'])
+    with FeatureStore(tmp_path / 'incremental.db', vectorizer=vectorizer) as store:
+        store.update(reviews.iloc[:5])
+        store.update(reviews.iloc[3:9])
+        store.update(reviews.iloc[9:])
+        incremental = store.transform(reviews)
+    with FeatureStore(tmp_path / 'full.db', vectorizer=vectorizer) as store:
+        assert store.update(reviews) == len(reviews)
+        full = store.transform(reviews)
+
+    pd.testing.assert_frame_equal(incremental, full)
+    codes, _ = pd.factorize(reviews['reviewerID'])
+    expected = max_group_similarity(vectorizer.transform(reviews['reviewContent']), codes)
+    np.testing.assert_allclose(full['Maximum Content Similarity'], expected[codes])
+    assert full['mnr'].max() == 1
+    assert (full.loc[full['reviewerID'] == 'C', 'Maximum Content Similarity'] == 0).all()
+
+
+def test_store_persists_state(tmp_path, reviews):
+    """Test that a reopened store keeps its vectorizer and counts."""
+    with FeatureStore(tmp_path / 'store.db') as store:
+        features = store.create_features(reviews)
+        mnr_max = store.mnr_max
+    with FeatureStore(tmp_path / 'store.db') as store:
+        assert store.vectorizer is not None
+        assert store.mnr_max == mnr_max
+        pd.testing.assert_frame_equal(store.transform(reviews), features)
+
+
+class CountingVectorizer(TfidfVectorizer):
+    """TF-IDF vectorizer that records how many texts it transforms."""
+
+    transformed = 0
+
+    def transform(self, raw_documents):
+        raw_documents = list(raw_documents)
+        CountingVectorizer.transformed += len(raw_documents)
+        return super().transform(raw_documents)
+
+
+def test_update_vectorizes_only_new_reviews(tmp_path, reviews):
+    """Test that history is read back as stored vectors, not re-vectorized."""
+    vectorizer = CountingVectorizer().fit(reviews['reviewContent'])
+    with FeatureStore(tmp_path / 'store.db', vectorizer=vectorizer) as store:
+        store.update(reviews.iloc[:12])
+        CountingVectorizer.transformed = 0
+        store.update(reviews.iloc[12:])
+        assert CountingVectorizer.transformed == 2
+
+
+def test_missing_vectors_are_backfilled(tmp_path, reviews):
+    """Test that reviews stored without vectors are vectorized once."""
+    vectorizer = CountingVectorizer().fit(reviews['reviewContent'])
+    first = reviews.iloc[:9]
+    again = first.assign(reviewID=first['reviewID'] + 'x')
+    with FeatureStore(tmp_path / 'expected.db', vectorizer=vectorizer) as store:
+        store.update(first)
+        store.update(again)
+        expected = store.transform(first)
+
+    with FeatureStore(tmp_path / 'store.db', vectorizer=vectorizer) as store:
+        store.update(first)
+        # As in a store written before vectors were persisted
+        store.conn.execute("UPDATE review SET term_indices = NULL, term_weights = NULL")
+        store.conn.commit()
+        CountingVectorizer.transformed = 0
+        store.update(again)
+        assert CountingVectorizer.transformed == 9 + 9
+        pd.testing.assert_frame_equal(store.transform(first), expected)
+
+        CountingVectorizer.transformed = 0
+        store.update(first.assign(reviewID=first['reviewID'] + 'y'))
+        assert CountingVectorizer.transformed == 9
+
+
+def test_new_vectorizer_drops_stored_vectors(tmp_path, reviews):
+    """Test that vectors are recomputed when the store's vectorizer changes."""
+    with FeatureStore(tmp_path / 'store.db') as store:
+        store.update(reviews)
+    other = TfidfVectorizer(ngram_range=(1, 2)).fit(reviews['reviewContent'])
+    with FeatureStore(tmp_path / 'store.db', vectorizer=other) as store:
+        (stale,) = store.conn.execute(
+            "SELECT COUNT(*) FROM review WHERE term_indices IS NULL"
+        ).fetchone()
+        assert stale == len(reviews)
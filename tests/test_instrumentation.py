@@ -0,0 +1,86 @@
+"""
+Tests for instrumentation module.
+"""
+
+import json
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.data_processor import DataProcessor
+from src.fake_review_detection.instrumentation import METRICS, JsonFormatter, Metrics
+from src.fake_review_detection.models import SemiSupervisedLearner
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Start every test with empty process-wide metrics."""
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+def test_span_records_rows_and_errors():
+    """Test span totals, including a span that raises."""
+    metrics = Metrics()
+    with metrics.span('clean', rows_in=10) as stage:
+        stage.rows_out = 8
+    with pytest.raises(KeyError):
+        with metrics.span('clean', rows_in=5):
+            raise KeyError('x')
+
+    totals = metrics.snapshot()['stages']['clean']
+    assert totals['runs'] == 2
+    assert totals['errors'] == 1
+    assert totals['rows_in'] == 15
+    assert totals['rows_out'] == 8
+    assert totals['last']['error'] == 'KeyError'
+    assert 'memory_delta_bytes' in totals['last']
+    assert totals['total_seconds'] >= totals['max_seconds'] >= 0
+
+
+def test_stage_spans_and_structured_logs(caplog):
+    """Test that a pipeline stage reports a span as a structured log record."""
+    df = pd.DataFrame({'reviewContent': ['The food was great', 'Slow service']})
+    with caplog.at_level(logging.INFO):
+        DataProcessor().clean(df)
+
+    record = next(r for r in caplog.records if getattr(r, 'event', None) == 'stage')
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload['stage'] == 'clean'
+    assert payload['rows_in'] == payload['rows_out'] == 2
+    assert METRICS.snapshot()['stages']['clean']['runs'] == 1
+
+
+def test_training_iterations_are_recorded():
+    """Test per-iteration metrics of the self-training loop."""
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 3))
+    y = np.where(X[:, 0] > 0.5, 'Y', 'N')
+    learner = SemiSupervisedLearner(GaussianNB(), algorithm_name='NB')
+    metrics = learner.train_arrays(X, y, threshold=0.7, iterations=5)
+
+    history = METRICS.snapshot()['training']['NB']['history']
+    assert len(history) == metrics['iterations'] == len(learner.iteration_metrics_)
+    assert sum(r['pseudo_labeled'] for r in history) == metrics['pseudo_labeled']
+    assert all(r['fit_seconds'] >= 0 and r['predict_seconds'] >= 0 for r in history)
+    assert METRICS.snapshot()['stages']['train']['last']['learner'] == 'NB'
+
+
+def test_write_snapshot(tmp_path):
+    """Test the JSON and Prometheus snapshot files."""
+    metrics = Metrics()
+    with metrics.span('features', rows_in=3) as stage:
+        stage.rows_out = 3
+    metrics.record_iteration('Random Forest', 1, 4, 0.5, 0.1)
+
+    metrics.write_snapshot(tmp_path / 'metrics.json')
+    snapshot = json.loads((tmp_path / 'metrics.json').read_text())
+    assert snapshot['stages']['features']['rows_out'] == 3
+    assert snapshot['training']['Random Forest']['pseudo_labeled'] == 4
+
+    metrics.write_snapshot(tmp_path / 'metrics.prom')
+    text = (tmp_path / 'metrics.prom').read_text()
+    assert 'fake_review_stage_runs_total{stage="features"} 1' in text
+    assert 'fake_review_training_pseudo_labeled_total{learner="Random Forest"} 4' in text
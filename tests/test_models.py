@@ -0,0 +1,138 @@
+"""
+Tests for models module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.models import SemiSupervisedLearner
+
+
+@pytest.fixture
+def labeled_features():
+    """Create a noisy, roughly separable feature frame."""
+    rng = np.random.default_rng(1)
+    n = 600
+    df = pd.DataFrame({
+        'mnr': rng.random(n),
+        'rl': rng.integers(1, 200, size=n),
+        'rd': rng.random(n),
+        'reviewID': [f'V{i}' for i in range(n)],
+    })
+    df['flagged'] = np.where(df['mnr'] + rng.normal(scale=0.3, size=n) > 0.5, 'Y', 'N')
+    return df
+
+
+def _reference_train(model, df, threshold, iterations):
+    """The original DataFrame concat/drop self-training loop."""
+    features = df.drop(columns=['reviewID', 'flagged'])
+    X_train, X_test, y_train, y_test = train_test_split(
+        features, df['flagged'], test_size=0.25, random_state=42
+    )
+    X_eval = X_test.copy()
+    for _ in range(iterations):
+        if X_test.empty:
+            break
+        model.fit(X_train, y_train)
+        probs = model.predict_proba(X_test)
+        preds = model.predict(X_test)
+        confident = np.max(probs, axis=1) > threshold
+        indices = X_test.index[confident]
+        X_train = pd.concat([X_train, X_test.loc[indices]])
+        y_train = pd.concat([y_train, pd.Series(preds[confident], index=indices)])
+        X_test = X_test.drop(indices)
+    return model.predict(X_eval)
+
+
+@pytest.mark.parametrize('make_model', [
+    lambda: RandomForestClassifier(n_estimators=15, random_state=0),
+    GaussianNB,
+])
+def test_train_matches_reference_loop(labeled_features, make_model):
+    """Test that the array-backed loop reproduces the original predictions."""
+    expected = _reference_train(make_model(), labeled_features, 0.7, 5)
+
+    learner = SemiSupervisedLearner(make_model())
+    metrics = learner.train(labeled_features, threshold=0.7, iterations=5)
+
+    np.testing.assert_array_equal(metrics['predictions'], expected)
+    assert learner.feature_columns_ == ['mnr', 'rl', 'rd']
+    assert metrics['true_labels'].index.equals(
+        labeled_features.index[metrics['test_indices']]
+    )
+    assert 0 < metrics['pseudo_labeled'] <= len(metrics['test_indices'])
+
+
+def test_train_arrays(labeled_features):
+    """Test training directly on arrays with named features."""
+    X = labeled_features[['mnr', 'rl', 'rd']].to_numpy(dtype=float)
+    y = labeled_features['flagged'].to_numpy()
+
+    learner = SemiSupervisedLearner(GaussianNB())
+    metrics = learner.train_arrays(X, y, feature_names=['mnr', 'rl', 'rd'], iterations=3)
+
+    assert learner.feature_columns_ == ['mnr', 'rl', 'rd']
+    assert list(learner.model.classes_) == ['N', 'Y']
+    np.testing.assert_array_equal(metrics['true_labels'], y[metrics['test_indices']])
+    assert metrics['confusion_matrix'].sum() == len(metrics['test_indices'])
+
+
+def test_warm_start_replaces_oldest_trees(labeled_features):
+    """Test that warm start refreshes trees while keeping n_estimators of them."""
+    model = RandomForestClassifier(n_estimators=10, random_state=0)
+    learner = SemiSupervisedLearner(model)
+    metrics = learner.train(
+        labeled_features, threshold=0.6, iterations=4,
+        warm_start=True, trees_per_iteration=3
+    )
+
+    assert metrics['iterations'] > 1
+    assert len(model.estimators_) == 10
+    assert model.get_params()['n_estimators'] == 10
+    assert model.get_params()['warm_start'] is False
+    assert model.get_params()['random_state'] == 0
+    # Replacement trees do not repeat the seeds of the trees they join
+    seeds = [tree.random_state for tree in model.estimators_]
+    assert len(set(seeds)) == len(seeds)
+    assert metrics['predictions'].shape == metrics['true_labels'].shape
+
+
+def test_warm_start_partial_fit_matches_refit(labeled_features):
+    """Test that partial_fit on new rows gives the same class means as a refit."""
+    warm = SemiSupervisedLearner(GaussianNB())
+    full = SemiSupervisedLearner(GaussianNB())
+    warm_metrics = warm.train(labeled_features, threshold=0.7, iterations=2, warm_start=True)
+    full_metrics = full.train(labeled_features, threshold=0.7, iterations=2)
+
+    np.testing.assert_allclose(warm.model.theta_, full.model.theta_)
+    np.testing.assert_allclose(warm.model.class_count_, full.model.class_count_)
+    np.testing.assert_array_equal(warm_metrics['predictions'], full_metrics['predictions'])
+
+
+def test_warm_start_requires_support(labeled_features):
+    """Test that models without incremental fitting are rejected."""
+    from sklearn.linear_model import LogisticRegression
+    learner = SemiSupervisedLearner(LogisticRegression())
+    with pytest.raises(ValueError, match='neither warm_start nor partial_fit'):
+        learner.train(labeled_features, iterations=2, warm_start=True)
+
+
+@pytest.mark.parametrize('options, reason, iterations', [
+    ({'threshold': 1.0}, 'no_new_labels', 1),
+    ({'threshold': 0.6, 'min_new_fraction': 1.0}, 'min_new_fraction', 1),
+    ({'threshold': 0.6, 'validation_fraction': 0.2, 'patience': 1, 'tol': 1.0},
+     'validation_plateau', 2),
+    ({'threshold': 0.0}, 'all_labeled', 1),
+])
+def test_early_stopping(labeled_features, options, reason, iterations):
+    """Test that each convergence criterion ends training and is reported."""
+    learner = SemiSupervisedLearner(GaussianNB())
+    metrics = learner.train(labeled_features, iterations=10, **options)
+
+    assert learner.stop_reason_ == reason
+    assert metrics['stop_reason'] == reason
+    assert metrics['iterations'] == iterations
+    assert len(learner.iteration_times_) == iterations
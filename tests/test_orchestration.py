@@ -0,0 +1,63 @@
+"""
+Tests for orchestration module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.models import SemiSupervisedLearner
+from src.fake_review_detection.orchestration import comparison_report, train_many
+
+
+@pytest.fixture
+def labeled_features():
+    """Create a noisy, roughly separable feature frame."""
+    rng = np.random.default_rng(2)
+    n = 400
+    df = pd.DataFrame({
+        'mnr': rng.random(n),
+        'rl': rng.integers(1, 200, size=n),
+        'reviewID': [f'V{i}' for i in range(n)],
+    })
+    df['flagged'] = np.where(df['mnr'] + rng.normal(scale=0.3, size=n) > 0.5, 'Y', 'N')
+    return df
+
+
+def _learners():
+    return [
+        SemiSupervisedLearner(
+            RandomForestClassifier(n_estimators=10, random_state=0), algorithm_name='RF'
+        ),
+        SemiSupervisedLearner(GaussianNB(), algorithm_name='NB'),
+    ]
+
+
+def test_train_many_matches_sequential(labeled_features):
+    """Test that parallel training on shared memory matches training one by one."""
+    learners = _learners()
+    results = train_many(labeled_features, learners, n_jobs=2, threshold=0.7, iterations=3)
+
+    for learner, expected_learner in zip(learners, _learners()):
+        expected = expected_learner.train(labeled_features, threshold=0.7, iterations=3)
+        metrics = results[learner.algorithm_name]
+        np.testing.assert_array_equal(metrics['predictions'], expected['predictions'])
+        assert metrics['true_labels'].equals(expected['true_labels'])
+        assert learner.feature_columns_ == ['mnr', 'rl']
+        np.testing.assert_array_equal(
+            learner.model.predict(np.array([[0.9, 10.0]])),
+            expected_learner.model.predict(np.array([[0.9, 10.0]]))
+        )
+
+    report = comparison_report(results)
+    assert set(report.index) == {'RF', 'NB'}
+    assert report['f1'].is_monotonic_decreasing
+    assert (report['train_seconds'] > 0).all()
+
+
+def test_train_many_rejects_duplicate_names(labeled_features):
+    """Test that learners must have distinct names."""
+    learners = [SemiSupervisedLearner(GaussianNB()), SemiSupervisedLearner(GaussianNB())]
+    with pytest.raises(ValueError, match='unique'):
+        train_many(labeled_features, learners)
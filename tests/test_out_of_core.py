@@ -0,0 +1,69 @@
+"""
+Tests for out_of_core module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.models import SemiSupervisedLearner
+from src.fake_review_detection.out_of_core import (
+    FeatureChunks,
+    export_feature_chunks,
+    train_out_of_core,
+)
+
+
+def make_features(n, start=0, seed=0):
+    """Create an imbalanced featurized frame with review IDs."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(start, start + n)],
+        'mnr': rng.random(n),
+        'rl': rng.integers(1, 200, size=n),
+    })
+    df['flagged'] = np.where(df['mnr'] + rng.normal(scale=0.1, size=n) > 0.8, 'Y', 'N')
+    return df
+
+
+def test_chunks_stream_every_part(tmp_path):
+    """Test that chunks cover all parts in order and appends add new parts."""
+    export_feature_chunks([make_features(250), make_features(250, 250, 1)], tmp_path)
+    export_feature_chunks([make_features(100, 500, 2)], tmp_path)
+
+    chunks = FeatureChunks(tmp_path, chunk_size=100)
+    keys = np.concatenate([k for _, _, k in chunks])
+
+    assert len(chunks.parts) == 3
+    assert chunks.n_rows == 600
+    assert chunks.feature_names == ['mnr', 'rl']
+    assert keys.tolist() == [f'V{i}' for i in range(600)]
+
+
+def test_train_out_of_core(tmp_path):
+    """Test that out-of-core training balances classes and reports valid metrics."""
+    df = make_features(4000)
+    export_feature_chunks([df.iloc[:2500], df.iloc[2500:]], tmp_path)
+    learner = SemiSupervisedLearner(GaussianNB(), algorithm_name='Naive Bayes')
+
+    metrics = train_out_of_core(
+        learner, FeatureChunks(tmp_path, chunk_size=700), threshold=0.7, iterations=5
+    )
+
+    minority = (df['flagged'] == 'Y').sum()
+    assert abs(metrics['sampled_rows'] - 2 * minority) < 0.2 * minority
+    assert metrics['test_rows'] == metrics['confusion_matrix'].sum()
+    assert 0 < metrics['pseudo_labeled'] <= metrics['test_rows']
+    assert metrics['f1'] > 0.7
+    assert learner.feature_columns_ == ['mnr', 'rl']
+    assert metrics['iterations'] == len(learner.iteration_times_)
+
+
+def test_train_out_of_core_requires_partial_fit(tmp_path):
+    """Test that models without partial_fit are rejected."""
+    export_feature_chunks([make_features(100)], tmp_path)
+    learner = SemiSupervisedLearner(RandomForestClassifier(n_estimators=5))
+
+    with pytest.raises(ValueError, match='partial_fit'):
+        train_out_of_core(learner, FeatureChunks(tmp_path))
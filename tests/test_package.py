@@ -0,0 +1,77 @@
+"""
+Tests for package import behavior.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import src.fake_review_detection as package
+from src.fake_review_detection import data_processor
+from src.fake_review_detection._stopwords import ENGLISH_STOPWORDS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'sklearn', 'nltk', 'matplotlib', 'tqdm')
+
+# Generous bound for a cold import on a loaded CI machine; the import itself
+# takes a few milliseconds (see benchmarks/bench_import.py)
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def _import_in_subprocess(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter and report time and heavy imports."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_package_import_is_light():
+    """Test that importing the package loads no heavy dependency."""
+    result = _import_in_subprocess('src.fake_review_detection')
+    assert result['heavy'] == []
+    assert result['seconds'] < IMPORT_BUDGET_SECONDS
+
+
+def test_data_processor_import_skips_nltk():
+    """Test that NLTK is neither imported nor downloaded at import time."""
+    result = _import_in_subprocess('src.fake_review_detection.data_processor')
+    assert 'nltk' not in result['heavy']
+
+
+def test_lazy_exports():
+    """Test that every public name resolves and unknown names raise."""
+    for name in package.__all__:
+        assert getattr(package, name) is not None
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        package.no_such_name
+
+
+def test_stopwords_fall_back_to_bundled_list(monkeypatch):
+    """Test the bundled stopwords when the NLTK corpus is not installed."""
+    nltk = pytest.importorskip('nltk')
+
+    def missing(resource):
+        raise LookupError(resource)
+
+    monkeypatch.setattr(nltk.data, 'find', missing)
+    monkeypatch.setattr(nltk, 'download', lambda *args, **kwargs: pytest.fail("download"))
+    data_processor.load_stopwords.cache_clear()
+    try:
+        processor = data_processor.DataProcessor()
+        assert processor.stop_words == set(ENGLISH_STOPWORDS)
+        assert processor._clean_text(['The food was NOT great']) == ['food great']
+    finally:
+        data_processor.load_stopwords.cache_clear()
@@ -0,0 +1,93 @@
+"""
+Tests for resampling module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.fake_review_detection.resampling import hash_fraction, resample
+from src.fake_review_detection.utils import under_sample
+
+
+@pytest.fixture
+def reviews():
+    """Create an imbalanced review frame across restaurants."""
+    rng = np.random.default_rng(5)
+    n = 2000
+    df = pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(n)],
+        'restaurantID': rng.choice([f'R{i}' for i in range(8)], size=n),
+        'rating': rng.integers(1, 6, size=n),
+        'flagged': np.where(rng.random(n) < 0.15, 'Y', 'N'),
+    }, index=np.arange(n) * 3)
+    return df
+
+
+def reference_under_sample(df, target_column='flagged', random_state=42):
+    """Original under_sample implementation, kept to check equivalence."""
+    sample_size = len(df[df[target_column] == 'Y'])
+    authentic = df[df[target_column] == 'N'].sample(sample_size, random_state=random_state)
+    fake = df[df[target_column] == 'Y']
+    return pd.concat([authentic, fake]).sample(frac=1, random_state=random_state)
+
+
+@pytest.mark.parametrize('random_state', [0, 42])
+def test_under_sample_matches_reference(reviews, random_state):
+    """Test that under_sample returns exactly the rows and order of the original."""
+    expected = reference_under_sample(reviews, random_state=random_state)
+    pd.testing.assert_frame_equal(under_sample(reviews, random_state=random_state), expected)
+    categorical = reviews.astype({'flagged': 'category', 'restaurantID': 'category'})
+    np.testing.assert_array_equal(
+        under_sample(categorical, random_state=random_state).index, expected.index
+    )
+
+
+def test_under_sample_keeps_only_fake_and_authentic():
+    """Test that under_sample drops other labels, like the original."""
+    df = pd.DataFrame({'flagged': ['Y'] * 2 + ['N'] * 5 + ['X'] * 7, 'value': range(14)})
+    balanced = under_sample(df)
+    assert balanced['flagged'].value_counts().to_dict() == {'Y': 2, 'N': 2}
+    pd.testing.assert_frame_equal(balanced, reference_under_sample(df))
+
+
+def test_under_sample_requires_enough_authentic_reviews():
+    """Test that too few authentic reviews raise instead of leaving an imbalance."""
+    df = pd.DataFrame({'flagged': ['Y'] * 5 + ['N'] * 2 + ['X'] * 7})
+    with pytest.raises(ValueError, match='2 authentic'):
+        under_sample(df)
+
+
+def test_ratio_and_stratify(reviews):
+    """Test non-balanced ratios and balancing within restaurants."""
+    counts = resample(reviews, ratio=2.0)['flagged'].value_counts()
+    assert counts['N'] == 2 * counts['Y']
+
+    stratified = resample(reviews, stratify='restaurantID')
+    per_restaurant = stratified.groupby(['restaurantID', 'flagged']).size().unstack()
+    np.testing.assert_array_equal(per_restaurant['N'], per_restaurant['Y'])
+    assert stratified.index.is_unique
+
+
+def test_hash_sampling_is_stable_as_data_grows(reviews):
+    """Test that adding rows only moves the sampling threshold, never reshuffles."""
+    first = resample(reviews.iloc[:1000], method='hash', shuffle=False)
+    full = resample(reviews, method='hash', shuffle=False)
+
+    old_ids = reviews['reviewID'].iloc[:1000]
+    kept_first = set(first['reviewID'])
+    kept_full = set(full.loc[full['reviewID'].isin(old_ids), 'reviewID'])
+    assert kept_first <= kept_full or kept_full <= kept_first
+    assert len(kept_first ^ kept_full) < 0.1 * len(kept_first)
+    counts = full['flagged'].value_counts()
+    assert abs(counts['N'] - counts['Y']) < 0.25 * counts['Y']
+
+
+def test_hash_fraction_is_uniform():
+    """Test that hash fractions are independent of batch and salt-dependent."""
+    keys = np.array([f'V{i}' for i in range(10000)])
+    fractions = hash_fraction(keys, salt=3)
+
+    np.testing.assert_array_equal(hash_fraction(keys[5000:], salt=3), fractions[5000:])
+    assert ((fractions >= 0) & (fractions < 1)).all()
+    assert abs(fractions.mean() - 0.5) < 0.02
+    assert not np.array_equal(hash_fraction(keys, salt=4), fractions)
@@ -0,0 +1,71 @@
+"""
+Tests for schema module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.fake_review_detection.data_processor import DataProcessor
+from src.fake_review_detection.feature_engineer import FeatureEngineer
+from src.fake_review_detection.schema import MemoryReport, compact_frame, frame_memory
+
+
+@pytest.fixture
+def raw_reviews():
+    """Create raw reviews with repetitive IDs and small integers."""
+    rng = np.random.default_rng(0)
+    words = ['The', 'food', 'was', 'great', 'service', 'slow', 'pasta', 'best', 'town']
+    n = 200
+    return pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(n)],
+        'reviewerID': [f'U{i % 15}' for i in range(n)],
+        'restaurantID': [f'R{i % 7}' for i in range(n)],
+        'date': [f'\n2012-01-0{i % 3 + 1}' for i in range(n)],
+        'rating': rng.integers(1, 6, size=n),
+        'reviewUsefulCount': rng.integers(0, 100000, size=n),
+        'reviewContent': [' '.join(rng.choice(words, size=8)) for _ in range(n)],
+        'flagged': rng.choice(['Y', 'N'], size=n),
+        'restaurantRating': rng.choice([3.0, 3.5, 4.0], size=n),
+        'score': rng.random(n),
+    })
+
+
+def test_compact_frame_dtypes(raw_reviews):
+    """Test the chosen compact dtypes and that values are unchanged."""
+    compact = compact_frame(raw_reviews)
+
+    for column in ('reviewerID', 'restaurantID', 'date', 'flagged'):
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype)
+    assert not isinstance(compact['reviewID'].dtype, pd.CategoricalDtype)
+    assert not isinstance(compact['reviewContent'].dtype, pd.CategoricalDtype)
+    assert compact['rating'].dtype == np.int16
+    assert compact['reviewUsefulCount'].dtype == np.int32
+    assert compact['restaurantRating'].dtype == np.float32
+    assert compact['score'].dtype == np.float64
+    assert compact_frame(raw_reviews, float32=True)['score'].dtype == np.float32
+
+    pd.testing.assert_frame_equal(
+        compact.astype(object), raw_reviews.astype(object), check_dtype=False
+    )
+    assert frame_memory(compact) < frame_memory(raw_reviews)
+
+
+def test_compact_pipeline_matches_default(raw_reviews):
+    """Test that cleaning and features give the same values on compact frames."""
+    report = MemoryReport()
+    processor = DataProcessor()
+
+    expected = FeatureEngineer().create_features(processor.clean(raw_reviews))
+    df = report.record('load', compact_frame(raw_reviews))
+    df = report.record('clean', processor.clean(df))
+    # Cleaning keeps the compact dtypes of its input
+    assert isinstance(df['date'].dtype, pd.CategoricalDtype)
+    assert df['rating'].dtype == np.int16
+    df = report.record('features', compact_frame(FeatureEngineer().create_features(df)))
+
+    pd.testing.assert_frame_equal(
+        df.astype(object), expected.astype(object), check_dtype=False
+    )
+    table = report.to_frame()
+    assert list(table['stage']) == ['load', 'clean', 'features']
+    assert (table['memory_mb'] > 0).all()
@@ -0,0 +1,111 @@
+"""
+Tests for scoring module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from src.fake_review_detection.data_processor import DataProcessor
+from src.fake_review_detection.feature_engineer import FeatureEngineer
+from src.fake_review_detection.feature_store import FeatureStore
+from src.fake_review_detection.models import SemiSupervisedLearner
+from src.fake_review_detection.scoring import ScoringModel, save_model
+
+
+@pytest.fixture
+def raw_reviews():
+    """Create raw reviews for a handful of reviewers."""
+    rng = np.random.default_rng(0)
+    words = ['The', 'food', 'was', 'great', 'service', 'slow', 'pasta', 'best', 'town']
+    n = 80
+    return pd.DataFrame({
+        'reviewID': [f'V{i}' for i in range(n)],
+        'reviewerID': [f'U{i % 12}' for i in range(n)],
+        'restaurantID': [f'R{i % 5}' for i in range(n)],
+        'date': [f'\n2012-01-0{i % 3 + 1}' for i in range(n)],
+        'rating': rng.integers(1, 6, size=n),
+        'reviewUsefulCount': rng.integers(0, 10, size=n),
+        'reviewContent': [' '.join(rng.choice(words, size=8)) for _ in range(n)],
+        'flagged': rng.choice(['Y', 'N'], size=n),
+        'restaurantRating': [3.5] * n,
+    })
+
+
+@pytest.fixture
+def trained(raw_reviews, tmp_path):
+    """Train a small model and save it."""
+    engineer = FeatureEngineer()
+    df = engineer.create_features(DataProcessor().clean(raw_reviews))
+    learner = SemiSupervisedLearner(
+        RandomForestClassifier(n_estimators=10, random_state=0), algorithm_name='RF'
+    )
+    learner.train(df, threshold=0.7, iterations=2)
+    path = save_model(learner, engineer, tmp_path / 'model.pkl')
+    return learner, engineer, df, path
+
+
+def test_score_matches_training_features(trained, raw_reviews):
+    """Test that scoring a batch reproduces the trained model's probabilities."""
+    learner, engineer, df, path = trained
+    model = ScoringModel.load(path)
+
+    probabilities = model.score(raw_reviews)
+    expected = learner.model.predict_proba(
+        df[learner.feature_columns_].to_numpy(dtype=float)
+    )[:, 1]
+    np.testing.assert_allclose(probabilities, expected)
+
+
+def test_score_records_with_store(trained, raw_reviews, tmp_path):
+    """Test scoring single records against reviewer history in a store."""
+    learner, engineer, _, path = trained
+    store_path = tmp_path / 'store.db'
+    with FeatureStore(store_path, vectorizer=engineer.vectorizer) as store:
+        store.update(DataProcessor().clean(raw_reviews.iloc[:60]))
+
+    model = ScoringModel.load(path, store_path=store_path)
+    records = raw_reviews.iloc[60:62].to_dict('records')
+    probabilities = model.score(records)
+
+    assert probabilities.shape == (2,)
+    assert ((probabilities >= 0) & (probabilities <= 1)).all()
+    assert model.store.update(DataProcessor().clean(raw_reviews.iloc[60:62])) == 2
+
+
+def test_compiled_score_matches(trained, raw_reviews):
+    """Test that the compiled forest scores like the persisted estimator."""
+    _, _, _, path = trained
+    expected = ScoringModel.load(path).score(raw_reviews)
+    model = ScoringModel.load(path, compiled=True)
+
+    assert type(model.estimator).__name__ == 'CompiledForest'
+    np.testing.assert_allclose(model.score(raw_reviews), expected, atol=1e-6)
+
+
+def test_score_many_featurizes_groups_separately(trained, raw_reviews):
+    """Test that a group's scores do not depend on the groups scored with it."""
+    _, _, _, path = trained
+    model = ScoringModel.load(path)
+    alone = raw_reviews.iloc[[0]]
+    same_reviewer = raw_reviews.iloc[[12, 24]]
+
+    grouped = model.score_many([alone, same_reviewer, raw_reviews.iloc[[5]]])
+
+    assert len(grouped) == 3
+    np.testing.assert_allclose(grouped[0], model.score(alone))
+    np.testing.assert_allclose(grouped[1], model.score(same_reviewer))
+    assert [len(g) for g in grouped] == [1, 2, 1]
+
+
+def test_score_duplicate_index(trained, raw_reviews):
+    """Test that scores are matched to rows by position, not index label."""
+    _, _, _, path = trained
+    model = ScoringModel.load(path)
+    expected = model.score(raw_reviews)
+    duplicated = raw_reviews.set_axis([0] * len(raw_reviews))
+
+    np.testing.assert_allclose(model.score(duplicated), expected)
+    grouped = model.score_many([duplicated.iloc[:3], duplicated.iloc[3:]])
+    np.testing.assert_allclose(grouped[0], model.score(raw_reviews.iloc[:3]))
+    np.testing.assert_allclose(grouped[1], model.score(raw_reviews.iloc[3:]))
@@ -0,0 +1,153 @@
+"""
+Tests for server module.
+"""
+
+import asyncio
+import json
+from src.fake_review_detection.server import MicroBatcher, ScoringServer
+
+
+def _length_scorer(calls):
+    """Score each record by its text length, recording batch sizes."""
+    def score(requests):
+        calls.append(sum(len(records) for records in requests))
+        return [[float(len(r['reviewContent'])) for r in records] for records in requests]
+    return score
+
+
+def _submit_all(score_fn, requests, **kwargs):
+    """Submit requests concurrently; return each result or exception."""
+    async def run():
+        batcher = MicroBatcher(score_fn, **kwargs)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(records) for records in requests), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(run())
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Test that concurrent submissions share one model call."""
+    calls = []
+    results = _submit_all(
+        _length_scorer(calls),
+        [[{'reviewContent': 'x' * i}] for i in range(1, 6)],
+        max_batch_size=8, max_wait=0.05
+    )
+
+    assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert calls == [5]
+
+
+def test_micro_batcher_isolates_failed_requests():
+    """Test that a bad record only fails the request that sent it."""
+    calls = []
+    results = _submit_all(
+        _length_scorer(calls),
+        [[{'reviewContent': 'ab'}], [{'rating': 5}], [{'reviewContent': 'abc'}] * 2],
+        max_batch_size=8, max_wait=0.05
+    )
+
+    assert results[0] == [2.0]
+    assert isinstance(results[1], KeyError)
+    assert results[2] == [3.0, 3.0]
+    # The failed batch of four reviews is retried one request at a time
+    assert calls == [4, 1, 1, 2]
+
+
+def test_micro_batcher_fails_short_results():
+    """Test that requests left without a score fail instead of hanging."""
+    def short(requests):
+        return [[1.0] * len(records) for records in requests][:-1]
+
+    results = _submit_all(
+        short, [[{'reviewContent': 'a'}], [{'reviewContent': 'b'}] * 2],
+        max_batch_size=8, max_wait=0.05
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_server_scores_and_reports_metrics():
+    """Test the HTTP endpoints over a keep-alive connection."""
+    calls = []
+
+    async def request(reader, writer, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: test\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b'\r\n':
+            name, _, value = line.decode().partition(':')
+            headers[name.lower()] = value.strip()
+        return status, json.loads(await reader.readexactly(int(headers['content-length'])))
+
+    async def run():
+        server = ScoringServer(_length_scorer(calls), port=0, max_batch_size=4, max_wait=0.01)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            single = await request(reader, writer, 'POST', '/score', {'reviewContent': 'abc'})
+            many = await request(reader, writer, 'POST', '/score',
+                                 {'reviews': [{'reviewContent': 'a'}] * 6})
+            bad = await request(reader, writer, 'POST', '/score', [1, 2])
+            metrics = await request(reader, writer, 'GET', '/metrics')
+            writer.close()
+            return single, many, bad, metrics
+        finally:
+            await server.stop()
+
+    single, many, bad, metrics = asyncio.run(run())
+
+    assert single == (200, {'probabilities': [3.0]})
+    assert many == (200, {'probabilities': [1.0] * 6})
+    assert bad[0] == 400
+    # A request is never split, even when it exceeds max_batch_size
+    assert calls == [1, 6]
+    assert metrics[1]['requests'] == 3
+    assert metrics[1]['errors'] == 1
+    assert metrics[1]['reviews'] == 7
+    assert metrics[1]['batches'] == 2
+    assert metrics[1]['max_batch_size'] == 6
+
+
+def test_server_rejects_malformed_and_oversized_requests():
+    """Test that bad requests get 400 or 413 instead of a dropped connection."""
+    async def send(server, raw):
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), json.loads(body)
+
+    async def run():
+        server = ScoringServer(_length_scorer([]), port=0, max_body_bytes=16)
+        await server.start()
+        try:
+            return [
+                await send(server, raw) for raw in (
+                    b'POST /score HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n',
+                    b'POST /score HTTP/1.1\r\nContent-Length: ten\r\n\r\n',
+                    b'POST /score HTTP/1.1\r\nContent-Length: -5\r\n\r\n',
+                    b'GARBAGE\r\n\r\n',
+                    b'GET /health HTTP/1.1\r\nno colon here\r\n\r\n',
+                )
+            ], server.metrics.snapshot()
+        finally:
+            await server.stop()
+
+    responses, metrics = asyncio.run(run())
+
+    assert [status for status, _ in responses] == [413, 400, 400, 400, 400]
+    assert 'exceeds 16 bytes' in responses[0][1]['error']
+    assert metrics['errors'] == 5
@@ -0,0 +1,60 @@
+"""
+Tests for sweep module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from src.fake_review_detection.sweep import parameter_candidates, run_sweep
+
+
+@pytest.fixture
+def labeled_features():
+    """Create a noisy, roughly separable feature frame."""
+    rng = np.random.default_rng(3)
+    n = 300
+    df = pd.DataFrame({
+        'mnr': rng.random(n),
+        'rl': rng.integers(1, 200, size=n),
+        'reviewID': [f'V{i}' for i in range(n)],
+    })
+    df['flagged'] = np.where(df['mnr'] + rng.normal(scale=0.3, size=n) > 0.5, 'Y', 'N')
+    return df
+
+
+def test_sweep_resumes_from_cached_trials(labeled_features, tmp_path):
+    """Test that a rerun reuses every finished trial."""
+    space = {'threshold': [0.6, 0.9], 'model__max_depth': [2, 4]}
+    estimator = RandomForestClassifier(n_estimators=5, random_state=0)
+
+    first = run_sweep(labeled_features, estimator, space, cache_dir=tmp_path,
+                      n_jobs=2, iterations=2)
+    assert len(first) == 4
+    assert not first['cached'].any()
+    assert first['f1'].is_monotonic_decreasing
+    assert len(list(tmp_path.glob('*/trials/*.json'))) == 4
+
+    second = run_sweep(labeled_features, estimator, space, cache_dir=tmp_path,
+                       n_jobs=2, iterations=2)
+    assert second['cached'].all()
+    pd.testing.assert_frame_equal(
+        first.drop(columns='cached'), second.drop(columns='cached')
+    )
+
+    # Changing the data invalidates the cache
+    changed = labeled_features.assign(rl=labeled_features['rl'] + 1)
+    third = run_sweep(changed, estimator, space, cache_dir=tmp_path, n_jobs=1, iterations=2)
+    assert not third['cached'].any()
+
+
+def test_random_search(labeled_features, tmp_path):
+    """Test random search over semi-supervised parameters."""
+    space = {'threshold': [0.55, 0.6, 0.7, 0.8, 0.9], 'iterations': [1, 2, 3]}
+    assert len(parameter_candidates(space, n_iter=4)) == 4
+
+    results = run_sweep(labeled_features, GaussianNB(), space, n_iter=4,
+                        cache_dir=tmp_path, n_jobs=1)
+    assert len(results) == 4
+    assert set(results.columns) >= {'threshold', 'iterations', 'f1', 'train_seconds'}